@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+    Benchmark of the on-disk response cache lookup
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Measure the latency of hits and misses of SQLiteCache with and
+    without the bloom filter::
+
+      $ python benchmarks/bench_cache.py --entries 1000000 10000000
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import timeit
+
+from goolabs.cache import SQLiteCache
+
+VALUE = '{"word_list":[[["日本語","名詞","ニホンゴ"]]]}'
+
+
+def key(i):
+    return 'morph:{0:040x}'.format(i)
+
+
+def fill(path, entries, chunk=100000):
+    cache = SQLiteCache(path, bloom_capacity=entries)
+    for start in range(0, entries, chunk):
+        cache.set_many((key(i), (None, VALUE))
+                       for i in range(start, min(start + chunk, entries)))
+    return cache
+
+
+def measure(cache, keys, repeat):
+    timer = timeit.Timer(lambda: [cache.get(k) for k in keys])
+    best = min(timer.repeat(repeat=repeat, number=1))
+    return best / len(keys) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--entries', type=int, nargs='+',
+                        default=[1000000, 10000000])
+    parser.add_argument('--lookups', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print('{0:>10} {1:>8} {2:>12} {3:>12}'.format(
+        'entries', 'bloom', 'hit (us)', 'miss (us)'))
+    for entries in args.entries:
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, 'cache.sqlite3')
+            fill(path, entries)
+            hits = [key(random.randrange(entries))
+                    for _ in range(args.lookups)]
+            misses = [key(entries + i) for i in range(args.lookups)]
+            for capacity in (entries, None):
+                cache = SQLiteCache(path, bloom_capacity=capacity)
+                print('{0:>10} {1:>8} {2:>12.2f} {3:>12.2f}'.format(
+                    entries, 'on' if capacity else 'off',
+                    measure(cache, hits, args.repeat),
+                    measure(cache, misses, args.repeat)))
+        finally:
+            shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
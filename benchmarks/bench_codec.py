@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+    Benchmark of the JSON codecs
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Measure decoding, encoding and pretty printing of morph and keyword
+    responses with each installed codec::
+
+      $ python benchmarks/bench_codec.py --words 10000
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import argparse
+import timeit
+
+from goolabs.codec import CODECS, PREFERRED, JSONCodec
+
+WORDS = [
+    [u'日本語', u'名詞', u'ニホンゴ'],
+    [u'を', u'格助詞', u'ヲ'],
+    [u'分析', u'名詞', u'ブンセキ'],
+    [u'し', u'動詞活用語尾', u'シ'],
+    [u'ます', u'動詞接尾辞', u'マス'],
+    [u'。', u'句点', u'＄'],
+]
+
+
+def morph_response(words):
+    sentence = len(WORDS)
+    return {
+        'word_list': [
+            [list(WORDS[j % sentence]) for j in range(i, i + sentence)]
+            for i in range(0, words, sentence)
+        ],
+        'request_id': u'labs.goo.ne.jp\t1419262824\t0',
+    }
+
+
+def keyword_response(words):
+    return {
+        'keywords': [{u'キーワード{0}'.format(i): round(1 / (i + 1), 4)}
+                     for i in range(words)],
+        'request_id': u'labs.goo.ne.jp\t1457928295\t0',
+    }
+
+
+def installed_codecs():
+    codecs = []
+    for name in PREFERRED:
+        try:
+            codecs.append(CODECS[name]())
+        except ImportError:
+            continue
+    return codecs
+
+
+def measure(func, repeat, number):
+    timer = timeit.Timer(func)
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--words', type=int, nargs='+',
+                        default=[100, 10000])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--number', type=int, default=20)
+    args = parser.parse_args()
+
+    print('{0:>8} {1:>8} {2:>7} {3:>12} {4:>12} {5:>12}'.format(
+        'api', 'words', 'codec', 'loads (ms)', 'dumps (ms)', 'pretty (ms)'))
+    for api, make in (('morph', morph_response),
+                      ('keyword', keyword_response)):
+        for words in args.words:
+            data = make(words)
+            body = JSONCodec().dumpb(data)
+            for codec in installed_codecs():
+                print('{0:>8} {1:>8} {2:>7} {3:>12.3f} {4:>12.3f} '
+                      '{5:>12.3f}'.format(
+                          api, words, codec.name,
+                          measure(lambda: codec.loads(body),
+                                  args.repeat, args.number),
+                          measure(lambda: codec.dumpb(data),
+                                  args.repeat, args.number),
+                          measure(lambda: codec.dumps_pretty(data),
+                                  args.repeat, args.number)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+    Benchmark of the command line output
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Measure the throughput of rendering a morph result with one
+    ``click.echo`` per word and with :func:`goolabs.commands.echo_rows`::
+
+      $ python benchmarks/bench_output.py --words 10000 100000
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import argparse
+import os
+import sys
+import timeit
+
+import click
+
+from goolabs.commands import echo_rows
+
+WORDS = [
+    [u'日本語', u'名詞', u'ニホンゴ'],
+    [u'を', u'格助詞', u'ヲ'],
+    [u'分析', u'名詞', u'ブンセキ'],
+    [u'し', u'動詞活用語尾', u'シ'],
+    [u'ます', u'動詞接尾辞', u'マス'],
+    [u'。', u'句点', u'＄'],
+]
+
+
+def word_list(words):
+    sentence = len(WORDS)
+    return [[list(WORDS[j % sentence]) for j in range(i, i + sentence)]
+            for i in range(0, words, sentence)]
+
+
+def echo_each(ret):
+    for words in ret:
+        for word in words:
+            click.echo(','.join(word))
+
+
+def echo_blocks(ret):
+    echo_rows(','.join(word) for words in ret for word in words)
+
+
+def measure(func, ret, repeat):
+    stdout = sys.stdout
+    with open(os.devnull, 'w') as devnull:
+        sys.stdout = devnull
+        try:
+            return min(timeit.Timer(lambda: func(ret)).repeat(
+                repeat=repeat, number=1))
+        finally:
+            sys.stdout = stdout
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--words', type=int, nargs='+',
+                        default=[10000, 100000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print('{0:>8} {1:>16} {2:>16} {3:>8}'.format(
+        'words', 'each (rows/s)', 'blocks (rows/s)', 'speedup'))
+    for words in args.words:
+        ret = word_list(words)
+        rows = sum(len(w) for w in ret)
+        each = measure(echo_each, ret, args.repeat)
+        blocks = measure(echo_blocks, ret, args.repeat)
+        print('{0:>8} {1:>16,.0f} {2:>16,.0f} {3:>7.1f}x'.format(
+            rows, rows / each, rows / blocks, each / blocks))
+
+
+if __name__ == '__main__':
+    main()
@@ -7,6 +7,24 @@
     :copyright: tell-k. All Rights Reserved.
 """
 from __future__ import division, print_function, absolute_import  # NOQA
-from goolabs.client import GoolabsAPI  # NOQA
+
+import sys
 
 __version__ = '0.4.0'
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        # type: (str) -> Any
+        # GoolabsAPI (and requests) is imported on first use (PEP 562),
+        # so "goolabs --help" starts fast.
+        if name == 'GoolabsAPI':
+            from goolabs.client import GoolabsAPI  # NOQA
+            globals()['GoolabsAPI'] = GoolabsAPI
+            return GoolabsAPI
+        raise AttributeError(
+            "module 'goolabs' has no attribute '{0}'".format(name))
+else:  # pragma: no cover
+    from goolabs.client import GoolabsAPI  # NOQA
+
+if 0:
+    from typing import Any  # NOQA
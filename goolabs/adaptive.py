@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+    Adaptive concurrency limit for Goo labs API calls
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import threading
+import time
+
+import requests
+
+from goolabs.deadline import DeadlineExceeded
+
+if 0:
+    from typing import Any, Callable, Dict, Optional  # NOQA
+
+
+class AdaptiveLimit(object):
+    """ Concurrency limit controlled by AIMD
+    (additive increase, multiplicative decrease).
+
+    The limit grows by one after about ``limit`` healthy calls, and is
+    multiplied by ``backoff`` on an overload: a 429 or 503 response, a
+    timeout, or a latency spike. A call is a spike when it takes
+    ``latency_factor`` times the average latency or more, or
+    ``latency_threshold`` seconds or more. Calls started before the last
+    decrease do not decrease the limit again.
+    """
+
+    OVERLOAD_STATUSES = (429, 503)
+
+    def __init__(self, initial=4, min_limit=1, max_limit=64, backoff=0.5,
+                 latency_factor=2.0, latency_threshold=None, smoothing=0.1):
+        # type: (int, int, int, float, Optional[float], Optional[float], float) -> None  # NOQA
+        self.min_limit = min_limit  # type: int
+        self.max_limit = max_limit  # type: int
+        self.backoff = backoff  # type: float
+        self.latency_factor = latency_factor  # type: Optional[float]
+        self.latency_threshold = latency_threshold  # type: Optional[float]
+        self.smoothing = smoothing  # type: float
+        self._limit = float(max(min(initial, max_limit), min_limit))
+        self._latency = None  # type: Optional[float]
+        self._decreased_at = 0.0  # type: float
+        self._decreases = 0  # type: int
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # type: () -> Dict[str,Any]
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        # type: (Dict[str,Any]) -> None
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self):
+        # type: () -> int
+        """ The current number of calls allowed at once. """
+        return int(self._limit)
+
+    def call(self, func, *args):
+        # type: (Callable, *Any) -> Any
+        """ Call ``func(*args)`` and record its latency and error. """
+        started = time.time()
+        try:
+            ret = func(*args)
+        except Exception as e:
+            self.record(started, time.time() - started, e)
+            raise
+        self.record(started, time.time() - started)
+        return ret
+
+    def is_overload(self, error):
+        # type: (Exception) -> bool
+        if isinstance(error, DeadlineExceeded):
+            return False
+        if isinstance(error, requests.HTTPError):
+            response = error.response
+            return (response is not None and
+                    response.status_code in self.OVERLOAD_STATUSES)
+        return isinstance(error, requests.Timeout)
+
+    def record(self, started, latency, error=None):
+        # type: (float, float, Optional[Exception]) -> None
+        """ Adjust the limit by the outcome of a call started at
+        ``started``.
+        """
+        with self._lock:
+            if error is not None and not self.is_overload(error):
+                # Other errors say nothing about the load.
+                return
+            overloaded = error is not None or self._is_spike(latency)
+            if error is None:
+                if self._latency is None:
+                    self._latency = latency
+                else:
+                    self._latency += self.smoothing * (latency - self._latency)
+
+            if not overloaded:
+                self._limit = min(self._limit + 1 / self._limit,
+                                  self.max_limit)
+            elif started >= self._decreased_at:
+                self._limit = max(self._limit * self.backoff, self.min_limit)
+                self._decreased_at = time.time()
+                self._decreases += 1
+
+    def stats(self):
+        # type: () -> Dict[str,Any]
+        with self._lock:
+            return {'limit': int(self._limit), 'decreases': self._decreases,
+                    'latency': self._latency}
+
+    def _is_spike(self, latency):
+        # type: (float) -> bool
+        if (self.latency_threshold is not None and
+                latency >= self.latency_threshold):
+            return True
+        return (self.latency_factor is not None and
+                self._latency is not None and
+                latency >= self._latency * self.latency_factor)
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+    asyncio API Client for Goo labs API
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Requires Python 3.5+ and aiohttp (``pip install goolabs[async]``).
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import asyncio
+import copy
+
+import aiohttp
+
+from goolabs.client import GoolabsAPI, build_payload
+from goolabs.codec import JSONCodec, get_codec
+from goolabs.singleflight import flight_key
+
+if 0:
+    from typing import Callable, Any, Dict, Optional, Union  # NOQA
+
+
+class AsyncSingleFlight(object):
+    """ Share one execution among the tasks awaiting the same key. """
+
+    def __init__(self):
+        # type: () -> None
+        self.calls = 0  # type: int
+        self.collapsed = 0  # type: int
+        self._calls = {}  # type: Dict[str,asyncio.Future]
+
+    async def do(self, key, func, *args):
+        # type: (str, Callable, *Any) -> Any
+        """ Await ``func(*args)``, or wait for the running call of ``key``.
+
+        Waiting tasks get a copy of the result or the same exception.
+        If the running task is cancelled, one of them runs the call again.
+        """
+        self.calls += 1
+        while True:
+            future = self._calls.get(key)
+            if future is None:
+                break
+            try:
+                result = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if future.cancelled():
+                    # The leader was cancelled, not this task.
+                    continue
+                raise
+            except BaseException:
+                self.collapsed += 1
+                raise
+            self.collapsed += 1
+            return copy.deepcopy(result)
+
+        future = asyncio.get_event_loop().create_future()
+        # Mark the exception as retrieved even if nobody is waiting.
+        future.add_done_callback(
+            lambda f: f.cancelled() or f.exception())
+        self._calls[key] = future
+        try:
+            result = await func(*args)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(copy.deepcopy(result))
+            return result
+        finally:
+            del self._calls[key]
+
+    def stats(self):
+        # type: () -> Dict[str,int]
+        return {'calls': self.calls, 'collapsed': self.collapsed}
+
+
+class AsyncGoolabsAPI(object):
+
+    BASE_API_URL = GoolabsAPI.BASE_API_URL
+    API_NAMES = GoolabsAPI.API_NAMES
+
+    def __init__(self, app_id, concurrency=100, limit=100, timeout=30,
+                 headers=None, single_flight=False, codec=None):
+        # type: (str, int, int, float, Optional[Dict[str,str]], bool, Union[None,str,JSONCodec]) -> None  # NOQA
+        self._app_id = app_id  # type: str
+        self._concurrency = concurrency  # type: int
+        self._limit = limit  # type: int
+        self._timeout = timeout  # type: float
+        self._headers = dict(headers or {})  # type: Dict[str,str]
+        self._headers.update({'content-type': 'application/json'})
+        self._session = None  # type: Optional[aiohttp.ClientSession]
+        self._semaphore = None  # type: Optional[asyncio.Semaphore]
+        self._flights = AsyncSingleFlight() if single_flight else None  # type: Optional[AsyncSingleFlight]  # NOQA
+        if not isinstance(codec, JSONCodec):
+            codec = get_codec(codec)
+        self._codec = codec  # type: JSONCodec
+
+    def __getattr__(self, func):
+        # type: (str) -> Callable
+        if func not in self.API_NAMES:
+            raise AttributeError(
+                'Cannot access or call this attribute "{0}"'.format(func))
+
+        async def inner_func(**kwargs):
+            # type: (**Any) -> Dict[str,Any]
+            payload = build_payload(self._app_id, kwargs)
+            if self._flights is None:
+                return await self._request(func, payload)
+            return await self._flights.do(flight_key(func, payload),
+                                          self._request, func, payload)
+        return inner_func
+
+    async def _request(self, func, payload):
+        # type: (str, Dict[str,Any]) -> Dict[str,Any]
+        session = self._get_session()
+        async with self._get_semaphore():
+            async with session.post(
+                    self.BASE_API_URL.format(func),
+                    data=self._codec.dumpb(payload)) as response:
+                response.raise_for_status()
+                return self._codec.loads(await response.read())
+
+    def stats(self):
+        # type: () -> Dict[str,Dict[str,int]]
+        """ Return all the counters of this client. """
+        stats = {}  # type: Dict[str,Dict[str,int]]
+        if self._flights is not None:
+            stats['single_flight'] = self._flights.stats()
+        return stats
+
+    async def __aenter__(self):
+        # type: () -> AsyncGoolabsAPI
+        return self
+
+    async def __aexit__(self, *exc_info):
+        # type: (*Any) -> None
+        await self.close()
+
+    async def close(self):
+        # type: () -> None
+        """ Close the shared connection pool. """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self):
+        # type: () -> aiohttp.ClientSession
+        # Created lazily so that the session is bound to the running loop.
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self._limit),
+                headers=self._headers,
+                timeout=aiohttp.ClientTimeout(total=self._timeout),
+            )
+        return self._session
+
+    def _get_semaphore(self):
+        # type: () -> asyncio.Semaphore
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._concurrency)
+        return self._semaphore
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""
+    Circuit breaker for Goo labs API endpoints
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import collections
+import threading
+import time
+
+import requests
+
+from goolabs.deadline import DeadlineExceeded
+
+if 0:
+    from typing import Any, Callable, Deque, Dict, List, Optional, Tuple  # NOQA
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(requests.RequestException):
+    """ Raised without sending a request while the circuit is open. """
+
+    def __init__(self, name, retry_after):
+        # type: (unicode, float) -> None
+        super(CircuitOpenError, self).__init__(
+            'Circuit of "{0}" is open.'.format(name))
+        self.name = name  # type: unicode
+        self.retry_after = retry_after  # type: float
+
+
+class _Circuit(object):
+
+    def __init__(self, window):
+        # type: (int) -> None
+        self.state = CLOSED  # type: str
+        self.results = collections.deque(maxlen=window)  # type: Deque[Tuple[bool,bool]]  # NOQA
+        self.opened_at = 0.0  # type: float
+        self.trials = 0  # type: int
+        self.successes = 0  # type: int
+
+
+class CircuitBreaker(object):
+    """ Per-endpoint circuit breaker.
+
+    Each endpoint (API name) has its own circuit. It opens when, among the
+    last ``window`` calls (at least ``min_calls``), the rate of failures
+    reaches ``failure_rate``, or the rate of calls which took
+    ``slow_call_duration`` seconds or more reaches ``slow_call_rate``.
+    While open, calls fail fast with :class:`CircuitOpenError`. After
+    ``reset_timeout`` seconds, ``half_open_calls`` trial calls are let
+    through; the circuit closes if they all succeed, or opens again.
+
+    ``on_state_change(name, old_state, new_state)`` is called on every
+    transition.
+    """
+
+    def __init__(self, failure_rate=0.5, slow_call_duration=None,
+                 slow_call_rate=0.5, window=20, min_calls=10,
+                 reset_timeout=30, half_open_calls=1, on_state_change=None):
+        # type: (float, Optional[float], float, int, int, float, int, Optional[Callable[[unicode,str,str],Any]]) -> None  # NOQA
+        self.failure_rate = failure_rate  # type: float
+        self.slow_call_duration = slow_call_duration  # type: Optional[float]
+        self.slow_call_rate = slow_call_rate  # type: float
+        self.window = window  # type: int
+        self.min_calls = min(min_calls, window)  # type: int
+        self.reset_timeout = reset_timeout  # type: float
+        self.half_open_calls = half_open_calls  # type: int
+        self.on_state_change = on_state_change
+        self._lock = threading.Lock()
+        self._circuits = {}  # type: Dict[unicode,_Circuit]
+        self._counts = {'opened': 0, 'rejected': 0}  # type: Dict[str,int]
+
+    def __getstate__(self):
+        # type: () -> Dict[str,Any]
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        # type: (Dict[str,Any]) -> None
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def call(self, name, func, *args):
+        # type: (unicode, Callable, *Any) -> Any
+        """ Call ``func(*args)`` through the circuit of ``name``. """
+        self.before(name)
+        started = time.time()
+        try:
+            ret = func(*args)
+        except Exception as e:
+            if isinstance(e, DeadlineExceeded):
+                self.cancel(name)
+            else:
+                self.record(name, time.time() - started, self.is_failure(e))
+            raise
+        self.record(name, time.time() - started)
+        return ret
+
+    def is_failure(self, error):
+        # type: (Exception) -> bool
+        """ Client errors (4xx) and deadlines of callers do not mean the
+        endpoint is sick.
+        """
+        if isinstance(error, DeadlineExceeded):
+            return False
+        if isinstance(error, requests.HTTPError):
+            response = error.response
+            return response is None or response.status_code >= 500
+        return isinstance(error, requests.RequestException)
+
+    def state(self, name):
+        # type: (unicode) -> str
+        with self._lock:
+            circuit = self._circuits.get(name)
+            return CLOSED if circuit is None else circuit.state
+
+    def before(self, name):
+        # type: (unicode) -> None
+        """ Raise :class:`CircuitOpenError` unless a call may be sent. """
+        transitions = []  # type: List[Tuple[unicode,str,str]]
+        try:
+            with self._lock:
+                circuit = self._get_circuit(name)
+                if circuit.state == OPEN:
+                    elapsed = time.time() - circuit.opened_at
+                    if elapsed < self.reset_timeout:
+                        self._reject(name, self.reset_timeout - elapsed)
+                    self._transit(name, circuit, HALF_OPEN, transitions)
+                if circuit.state == HALF_OPEN:
+                    if circuit.trials >= self.half_open_calls:
+                        self._reject(name, 0)
+                    circuit.trials += 1
+        finally:
+            self._notify(transitions)
+
+    def record(self, name, duration, failed=False):
+        # type: (unicode, float, bool) -> None
+        """ Record the outcome of a call which was let through. """
+        slow = (self.slow_call_duration is not None and
+                duration >= self.slow_call_duration)
+        transitions = []  # type: List[Tuple[unicode,str,str]]
+        with self._lock:
+            circuit = self._get_circuit(name)
+            if circuit.state == HALF_OPEN:
+                if failed or slow:
+                    self._transit(name, circuit, OPEN, transitions)
+                else:
+                    circuit.successes += 1
+                    if circuit.successes >= self.half_open_calls:
+                        self._transit(name, circuit, CLOSED, transitions)
+            elif circuit.state == CLOSED:
+                circuit.results.append((failed, slow))
+                if self._should_open(circuit):
+                    self._transit(name, circuit, OPEN, transitions)
+        self._notify(transitions)
+
+    def cancel(self, name):
+        # type: (unicode) -> None
+        """ Give back the trial of a call which was let through but says
+        nothing about the endpoint, like one stopped by the deadline of
+        the caller.
+        """
+        with self._lock:
+            circuit = self._get_circuit(name)
+            if circuit.state == HALF_OPEN and circuit.trials > 0:
+                circuit.trials -= 1
+
+    def stats(self):
+        # type: () -> Dict[str,Any]
+        with self._lock:
+            stats = dict(self._counts)  # type: Dict[str,Any]
+            stats['states'] = dict(
+                (name, circuit.state)
+                for name, circuit in self._circuits.items())
+        return stats
+
+    def _get_circuit(self, name):
+        # type: (unicode) -> _Circuit
+        circuit = self._circuits.get(name)
+        if circuit is None:
+            circuit = self._circuits[name] = _Circuit(self.window)
+        return circuit
+
+    def _should_open(self, circuit):
+        # type: (_Circuit) -> bool
+        total = len(circuit.results)
+        if total < self.min_calls:
+            return False
+        failures = sum(1 for failed, _ in circuit.results if failed)
+        if failures / total >= self.failure_rate:
+            return True
+        if self.slow_call_duration is None:
+            return False
+        slows = sum(1 for _, slow in circuit.results if slow)
+        return slows / total >= self.slow_call_rate
+
+    def _reject(self, name, retry_after):
+        # type: (unicode, float) -> None
+        self._counts['rejected'] += 1
+        raise CircuitOpenError(name, retry_after)
+
+    def _transit(self, name, circuit, state, transitions):
+        # type: (unicode, _Circuit, str, List[Tuple[unicode,str,str]]) -> None  # NOQA
+        transitions.append((name, circuit.state, state))
+        circuit.state = state
+        circuit.trials = circuit.successes = 0
+        circuit.results.clear()
+        if state == OPEN:
+            circuit.opened_at = time.time()
+            self._counts['opened'] += 1
+
+    def _notify(self, transitions):
+        # type: (List[Tuple[unicode,str,str]]) -> None
+        # Called outside the lock, hooks may use this breaker.
+        if self.on_state_change is None:
+            return
+        for transition in transitions:
+            self.on_state_change(*transition)
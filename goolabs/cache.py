@@ -0,0 +1,527 @@
+# -*- coding: utf-8 -*-
+"""
+    Response cache for Goo labs API
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import collections
+import contextlib
+import gzip
+import hashlib
+import json
+import math
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+import time
+import unicodedata
+
+import six
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+from goolabs.codec import get_codec
+
+if 0:
+    from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple  # NOQA
+
+_indexbytes = six.indexbytes
+_unpack_hash = struct.Struct('<QQ').unpack
+
+# Payload keys which do not change the analysis result.
+IGNORED_KEYS = ('app_id', 'request_id')
+
+
+def normalize(value):
+    # type: (Any) -> Any
+    """ NFKC-normalize all the text in a payload value. """
+    if isinstance(value, six.text_type):
+        return unicodedata.normalize('NFKC', value)
+    if isinstance(value, six.binary_type):
+        return normalize(value.decode('utf-8'))
+    if isinstance(value, (list, tuple)):
+        return [normalize(v) for v in value]
+    if isinstance(value, dict):
+        return dict((k, normalize(v)) for k, v in value.items())
+    return value
+
+
+def cache_key(func, payload):
+    # type: (str, Dict[str,Any]) -> str
+    """ Make a cache key from the API name and the request payload. """
+    data = dict((k, normalize(v)) for k, v in payload.items()
+                if k not in IGNORED_KEYS)
+    # Always the json module, so keys do not change with the codec.
+    dumped = json.dumps(data, sort_keys=True, ensure_ascii=False)
+    digest = hashlib.sha1(dumped.encode('utf-8')).hexdigest()
+    return '{0}:{1}'.format(func, digest)
+
+
+class LRUCache(object):
+    """ Size-bounded in-memory store. """
+
+    def __init__(self, maxsize=1024):
+        # type: (int) -> None
+        self.maxsize = maxsize  # type: int
+        self.evictions = 0  # type: int
+        self._lock = threading.Lock()
+        self._data = collections.OrderedDict()  # type: collections.OrderedDict  # NOQA
+
+    def __getstate__(self):
+        # type: () -> Dict[str,Any]
+        return {'maxsize': self.maxsize}
+
+    def __setstate__(self, state):
+        # type: (Dict[str,Any]) -> None
+        self.__init__(**state)
+
+    def __len__(self):
+        # type: () -> int
+        return len(self._data)
+
+    def get(self, key):
+        # type: (str) -> Optional[Tuple[Optional[float],str]]
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is not None:
+                self._data[key] = entry
+            return entry
+
+    def set(self, key, entry):
+        # type: (str, Tuple[Optional[float],str]) -> None
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = entry
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        # type: (str) -> None
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class BloomFilter(object):
+    """ Set of keys which answers "surely not included" in memory.
+
+    With ``path``, the bit array is a memory-mapped file which is shared
+    by all the processes using the same file.
+    """
+
+    HEADER = struct.Struct('<4sIQ')  # magic, number of hashes, bits
+    MAGIC = b'GLBF'
+
+    def __init__(self, path=None, capacity=1000000, error_rate=0.01):
+        # type: (Optional[str], int, float) -> None
+        self.path = path  # type: Optional[str]
+        self.capacity = capacity  # type: int
+        self.error_rate = error_rate  # type: float
+        self.created = False  # type: bool
+        self._lock = threading.Lock()
+        self._fd = None  # type: Optional[int]
+
+        bits = int(math.ceil(
+            -capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        bits = max(bits + (-bits % 8), 8)
+        hashes = max(int(round(bits / capacity * math.log(2))), 1)
+
+        if path is None:
+            self.bits, self.hashes = bits, hashes
+            self._buf = mmap.mmap(-1, self.HEADER.size + bits // 8)
+            self.created = True
+            return
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        with self._file_lock():
+            if os.fstat(self._fd).st_size == 0:
+                os.write(self._fd, self.HEADER.pack(self.MAGIC, hashes, bits))
+                os.ftruncate(self._fd, self.HEADER.size + bits // 8)
+                self.created = True
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                magic, hashes, bits = self.HEADER.unpack(
+                    os.read(self._fd, self.HEADER.size))
+                if magic != self.MAGIC:
+                    raise ValueError(
+                        '{0} is not a bloom filter file.'.format(path))
+        self.bits, self.hashes = bits, hashes
+        self._buf = mmap.mmap(self._fd, self.HEADER.size + bits // 8)
+
+    def __getstate__(self):
+        # type: () -> Dict[str,Any]
+        return {'path': self.path, 'capacity': self.capacity,
+                'error_rate': self.error_rate}
+
+    def __setstate__(self, state):
+        # type: (Dict[str,Any]) -> None
+        self.__init__(**state)
+
+    def __contains__(self, key):
+        # type: (str) -> bool
+        buf, offset, bits = self._buf, self.HEADER.size, self.bits
+        h1, h2 = self._hash(key)
+        for i in range(self.hashes):
+            index = (h1 + i * h2) % bits
+            if not _indexbytes(buf, offset + (index >> 3)) >> (index & 7) & 1:
+                return False
+        return True
+
+    def add(self, key):
+        # type: (str) -> None
+        buf, offset = self._buf, self.HEADER.size
+        with self._lock, self._file_lock():
+            for index in self._indexes(key):
+                pos = offset + (index >> 3)
+                byte = _indexbytes(buf, pos) | (1 << (index & 7))
+                buf[pos:pos + 1] = six.int2byte(byte)
+
+    def close(self):
+        # type: () -> None
+        self._buf.close()
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _indexes(self, key):
+        # type: (str) -> Iterator[int]
+        h1, h2 = self._hash(key)
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.bits
+
+    def _hash(self, key):
+        # type: (str) -> Tuple[int,int]
+        return _unpack_hash(hashlib.md5(key.encode('utf-8')).digest())
+
+    @contextlib.contextmanager
+    def _file_lock(self):
+        # type: () -> Iterator[None]
+        if self._fd is None or fcntl is None:
+            yield
+            return
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+
+class SQLiteCache(object):
+    """ Persistent store which can be shared by multiple processes.
+
+    Each thread (and each process) uses its own connection to the
+    database in WAL mode. The primary key index is read through
+    memory-mapped I/O (``mmap_size`` bytes).
+
+    Unless ``bloom_capacity`` is None, a :class:`BloomFilter` file
+    (``<path>.bloom``) answers most lookups of missing keys without
+    touching the database. Size it to the expected number of entries.
+    """
+
+    def __init__(self, path, timeout=30, mmap_size=256 * 1024 * 1024,
+                 bloom_capacity=1000000, bloom_error_rate=0.01):
+        # type: (str, float, int, Optional[int], float) -> None
+        self.path = path  # type: str
+        self.timeout = timeout  # type: float
+        self.mmap_size = mmap_size  # type: int
+        self.bloom_capacity = bloom_capacity  # type: Optional[int]
+        self.bloom_error_rate = bloom_error_rate  # type: float
+        self.bloom_negatives = 0  # type: int
+        self._local = threading.local()
+        self._connect().execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            ' key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL)'
+        )
+
+        self.bloom = None  # type: Optional[BloomFilter]
+        if bloom_capacity:
+            self.bloom = BloomFilter(path + '.bloom', bloom_capacity,
+                                     bloom_error_rate)
+            if self.bloom.created:
+                for key in self.keys():
+                    self.bloom.add(key)
+
+    def __getstate__(self):
+        # type: () -> Dict[str,Any]
+        return {'path': self.path, 'timeout': self.timeout,
+                'mmap_size': self.mmap_size,
+                'bloom_capacity': self.bloom_capacity,
+                'bloom_error_rate': self.bloom_error_rate}
+
+    def __setstate__(self, state):
+        # type: (Dict[str,Any]) -> None
+        self.__init__(**state)
+
+    def __len__(self):
+        # type: () -> int
+        return self._connect().execute(
+            'SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    def keys(self):
+        # type: () -> Iterator[str]
+        for row in self._connect().execute('SELECT key FROM responses'):
+            yield row[0]
+
+    def get(self, key):
+        # type: (str) -> Optional[Tuple[Optional[float],str]]
+        if self.bloom is not None and key not in self.bloom:
+            self.bloom_negatives += 1
+            return None
+        row = self._connect().execute(
+            'SELECT expires, value FROM responses WHERE key = ?', (key,)
+        ).fetchone()
+        return tuple(row) if row is not None else None
+
+    def set(self, key, entry):
+        # type: (str, Tuple[Optional[float],str]) -> None
+        self.set_many([(key, entry)])
+
+    def items(self, now=None):
+        # type: (Optional[float]) -> Iterator[Tuple[str,Tuple[Optional[float],str]]]  # NOQA
+        """ Iterate over the entries not expired at ``now``. """
+        rows = self._connect().execute(
+            'SELECT key, expires, value FROM responses'
+            ' WHERE expires IS NULL OR expires > ?',
+            (now if now is not None else time.time(),))
+        for key, expires, value in rows:
+            yield key, (expires, value)
+
+    def set_many(self, items, replace=True):
+        # type: (Iterable[Tuple[str,Tuple[Optional[float],str]]], bool) -> int
+        """ Store many entries in one transaction.
+
+        Existing entries are kept unless ``replace`` is true.
+        Returns the number of stored entries.
+        """
+        items = list(items)
+        conn = self._connect()
+        with conn:
+            cursor = conn.executemany(
+                'INSERT OR {0} INTO responses (key, value, expires)'
+                ' VALUES (?, ?, ?)'.format('REPLACE' if replace else 'IGNORE'),
+                [(key, value, expires) for key, (expires, value) in items])
+        if self.bloom is not None:
+            for key, _ in items:
+                self.bloom.add(key)
+        return cursor.rowcount
+
+    def delete(self, key, expired_at=None):
+        # type: (str, Optional[float]) -> None
+        """ Delete the entry. With ``expired_at``, only if it has been
+        expired at that time (another process may have refreshed it).
+        """
+        conn = self._connect()
+        with conn:
+            if expired_at is None:
+                conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+            else:
+                conn.execute('DELETE FROM responses WHERE key = ?'
+                             ' AND expires <= ?', (key, expired_at))
+
+    def _connect(self):
+        # type: () -> sqlite3.Connection
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA mmap_size={0:d}'.format(self.mmap_size))
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+
+class CachedResponse(dict):
+    """ Response returned from :class:`ResponseCache`.
+
+    ``stale`` is true when the entry has been expired.
+    """
+
+    stale = False  # type: bool
+
+
+class ResponseCache(object):
+    """ Cache of API responses.
+
+    A size-bounded in-memory LRU is placed in front of an optional SQLite
+    file (``path``). ``ttl`` is the default lifetime in seconds
+    (``None`` means forever) and ``ttls`` overrides it per API name.
+    A TTL of ``0`` disables caching for the API.
+    ``bloom_capacity`` is passed to :class:`SQLiteCache`.
+
+    With ``stale_while_revalidate``, an expired entry is returned at once
+    and the client refreshes it in the background. With
+    ``stale_if_error``, an expired entry is returned when the API call
+    fails. Expired entries are kept for ``max_stale`` seconds
+    (``None`` means forever) in these modes.
+    """
+
+    def __init__(self, path=None, maxsize=1024, ttl=None, ttls=None,
+                 bloom_capacity=1000000, stale_while_revalidate=False,
+                 stale_if_error=False, max_stale=None):
+        # type: (Optional[str], int, Optional[float], Optional[Dict[str,Optional[float]]], Optional[int], bool, bool, Optional[float]) -> None  # NOQA
+        self.memory = LRUCache(maxsize)  # type: LRUCache
+        self.disk = None  # type: Optional[SQLiteCache]
+        if path:
+            self.disk = SQLiteCache(path, bloom_capacity=bloom_capacity)
+        self.ttl = ttl  # type: Optional[float]
+        self.ttls = dict(ttls or {})  # type: Dict[str,Optional[float]]
+        self.stale_while_revalidate = stale_while_revalidate  # type: bool
+        self.stale_if_error = stale_if_error  # type: bool
+        self.max_stale = max_stale  # type: Optional[float]
+        self._counts = collections.Counter()  # type: collections.Counter
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # type: () -> Dict[str,Any]
+        state = self.__dict__.copy()
+        del state['_counts'], state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        # type: (Dict[str,Any]) -> None
+        self.__dict__.update(state)
+        self._counts = collections.Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def serve_stale(self):
+        # type: () -> bool
+        return self.stale_while_revalidate or self.stale_if_error
+
+    def get_ttl(self, func):
+        # type: (str) -> Optional[float]
+        return self.ttls.get(func, self.ttl)
+
+    def get(self, func, payload):
+        # type: (str, Dict[str,Any]) -> Optional[CachedResponse]
+        """ Return the cached response, or None.
+
+        An expired entry is returned with ``stale`` flag if
+        :attr:`serve_stale` is true.
+        """
+        if self.get_ttl(func) == 0:
+            return None
+        key = cache_key(func, payload)
+        now = time.time()
+
+        expired = None
+        entry = self.memory.get(key)
+        if entry is not None:
+            if not self._expired(entry, now):
+                self.count('memory_hits')
+                return CachedResponse(get_codec().loads(entry[1]))
+            expired = entry
+
+        if self.disk is not None:
+            entry = self.disk.get(key)
+            if entry is not None:
+                if not self._expired(entry, now):
+                    self.memory.set(key, entry)
+                    self.count('disk_hits')
+                    return CachedResponse(get_codec().loads(entry[1]))
+                if expired is None or entry[0] > expired[0]:
+                    expired = entry
+
+        if expired is not None:
+            if self.serve_stale and (self.max_stale is None or
+                                     expired[0] + self.max_stale > now):
+                self.count('stale_hits')
+                ret = CachedResponse(get_codec().loads(expired[1]))
+                ret.stale = True
+                return ret
+            self.memory.delete(key)
+            if self.disk is not None:
+                self.disk.delete(key, expired_at=self._purge_before(now))
+            self.count('expirations')
+        self.count('misses')
+        return None
+
+    def set(self, func, payload, response):
+        # type: (str, Dict[str,Any], Dict[str,Any]) -> None
+        ttl = self.get_ttl(func)
+        if ttl == 0:
+            return
+        expires = time.time() + ttl if ttl is not None else None
+        entry = (expires, get_codec().dumps(response))
+        key = cache_key(func, payload)
+        self.memory.set(key, entry)
+        if self.disk is not None:
+            self.disk.set(key, entry)
+        self.count('sets')
+
+    def stats(self):
+        # type: () -> Dict[str,int]
+        with self._lock:
+            stats = dict((name, self._counts[name]) for name in (
+                'memory_hits', 'disk_hits', 'stale_hits', 'misses', 'sets',
+                'expirations', 'revalidations', 'revalidation_errors'))
+        stats['hits'] = stats['memory_hits'] + stats['disk_hits']
+        stats['evictions'] = self.memory.evictions
+        stats['memory_size'] = len(self.memory)
+        if self.disk is not None:
+            stats['bloom_negatives'] = self.disk.bloom_negatives
+        return stats
+
+    def count(self, name):
+        # type: (str) -> None
+        """ Increment a counter of :meth:`stats`. """
+        with self._lock:
+            self._counts[name] += 1
+
+    def _purge_before(self, now):
+        # type: (float) -> float
+        if self.serve_stale:
+            return now - self.max_stale
+        return now
+
+    def _expired(self, entry, now):
+        # type: (Tuple[Optional[float],str], float) -> bool
+        return entry[0] is not None and entry[0] <= now
+
+
+def dump_snapshot(store, path):
+    # type: (SQLiteCache, str) -> int
+    """ Export the live entries of ``store`` to a gzipped NDJSON file.
+
+    Returns the number of exported entries.
+    """
+    count = 0
+    with gzip.open(path, 'wb') as f:
+        for key, (expires, value) in store.items():
+            f.write(get_codec().dumpb([key, expires, value]) + b'\n')
+            count += 1
+    return count
+
+
+def load_snapshot(store, path, replace=False, chunk=10000):
+    # type: (SQLiteCache, str, bool, int) -> int
+    """ Import a snapshot made by :func:`dump_snapshot` into ``store``.
+
+    Entries already in ``store`` are kept unless ``replace`` is true.
+    Expired entries are skipped. Returns the number of imported entries.
+    """
+    count = 0
+    now = time.time()
+    items = []  # type: List[Tuple[str,Tuple[Optional[float],str]]]
+    with gzip.open(path, 'rb') as f:
+        for line in f:
+            key, expires, value = get_codec().loads(line)
+            if expires is not None and expires <= now:
+                continue
+            items.append((key, (expires, value)))
+            if len(items) >= chunk:
+                count += store.set_many(items, replace=replace)
+                items = []
+    if items:
+        count += store.set_many(items, replace=replace)
+    return count
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+    Chunking of long text for Goo labs API
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import re
+
+if 0:
+    from typing import Any, Dict, List  # NOQA
+
+# API name -> the key of the result to merge.
+CHUNKED_APIS = {
+    'morph': 'word_list',
+    'entity': 'ne_list',
+    'chrono': 'datetime_list',
+    'hiragana': 'converted',
+}  # type: Dict[str,str]
+
+_SENTENCE_RE = re.compile(u'[^。！？\n]*(?:[。！？]+|\n|$)')
+
+
+def split_text(text, size):
+    # type: (unicode, int) -> List[unicode]
+    """ Split ``text`` into chunks of at most ``size`` characters.
+
+    Chunks end at a sentence boundary (。！？ or a newline) if possible.
+    A sentence longer than ``size`` is split at ``size`` characters.
+    Joining the chunks gives back ``text``.
+    """
+    if size < 1:
+        raise ValueError('size must be 1 or more.')
+    chunks = []  # type: List[unicode]
+    current = u''
+    for sentence in _SENTENCE_RE.findall(text):
+        if len(current) + len(sentence) <= size:
+            current += sentence
+            continue
+        if current:
+            chunks.append(current)
+        while len(sentence) > size:
+            chunks.append(sentence[:size])
+            sentence = sentence[size:]
+        current = sentence
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def merge_results(func, results):
+    # type: (str, List[Dict[unicode,Any]]) -> Dict[unicode,Any]
+    """ Merge the results of the chunks of a text in order, as if the
+    whole text was sent at once.
+    """
+    key = CHUNKED_APIS[func]
+    ret = dict(results[0])
+    merged = [r[key] for r in results]
+    if isinstance(ret[key], list):
+        ret[key] = [item for items in merged for item in items]
+    else:
+        ret[key] = u''.join(merged)
+    return ret
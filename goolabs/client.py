@@ -8,11 +8,43 @@
 """
 from __future__ import division, print_function, absolute_import  # NOQA
 
-import json
+import itertools
+import os
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
+from requests.adapters import HTTPAdapter
+from six.moves import queue
+
+from goolabs import executor
+from goolabs import packing
+from goolabs.cache import cache_key
+from goolabs.chunking import CHUNKED_APIS, merge_results, split_text
+from goolabs.codec import JSONCodec, get_codec
+from goolabs.deadline import DeadlineExceeded, remaining
+from goolabs.keypool import KeyPool
+from goolabs.singleflight import SingleFlight, flight_key
 
 if 0:
-    from typing import List, Callable, Any, Dict  # NOQA
+    from typing import List, Callable, Any, Dict, Optional, Iterable, Iterator, Set, Union  # NOQA
+    from goolabs.adaptive import AdaptiveLimit  # NOQA
+    from goolabs.breaker import CircuitBreaker  # NOQA
+    from goolabs.cache import ResponseCache  # NOQA
+    from goolabs.hedge import HedgePolicy  # NOQA
+    from goolabs.ratelimit import RateLimiter  # NOQA
+    from goolabs.retry import RetryPolicy  # NOQA
+    from goolabs.scheduler import PriorityScheduler  # NOQA
+
+
+def build_payload(app_id, params):
+    # type: (unicode, Dict[unicode,Any]) -> Dict[unicode,Any]
+    """ Make request payload from the keyword arguments of an API call. """
+    payload = dict([(k, v) for k, v in params.items() if v])  # type: Dict[unicode,Any]  # NOQA
+    payload.update({'app_id': app_id})
+    return payload
 
 
 class GoolabsAPI(object):
@@ -21,30 +53,603 @@ class GoolabsAPI(object):
     API_NAMES = ['morph', 'similarity', 'hiragana',
                  'entity', 'shortsum', 'keyword', 'chrono']  # type: List[str]
 
-    def __init__(self, app_id, **kwargs):
-        # type: (unicode, **Any) -> None
-        self._app_id = app_id  # type: unicode
+    def __init__(self, app_id, pool_connections=1, pool_maxsize=10,
+                 pool_block=False, pool_idle_timeout=None, cache=None,
+                 single_flight=False, rate_limit=None, retry=None,
+                 breaker=None, adaptive=None, scheduler=None, hedge=None,
+                 codec=None, **kwargs):
+        # type: (Union[unicode,KeyPool], int, int, bool, Optional[float], Optional[ResponseCache], bool, Optional[RateLimiter], Optional[RetryPolicy], Optional[CircuitBreaker], Optional[AdaptiveLimit], Optional[PriorityScheduler], Optional[HedgePolicy], Union[None,str,JSONCodec], **Any) -> None  # NOQA
+        # app_id is chosen from the pool for each request.
+        self._keys = app_id if isinstance(app_id, KeyPool) else None  # type: Optional[KeyPool]  # NOQA
+        self._app_id = None if self._keys is not None else app_id  # type: Optional[unicode]  # NOQA
+        self._cache = cache  # type: Optional[ResponseCache]
+        self._single_flight = single_flight  # type: bool
+        self._rate_limit = rate_limit  # type: Optional[RateLimiter]
+        self._retry = retry  # type: Optional[RetryPolicy]
+        self._breaker = breaker  # type: Optional[CircuitBreaker]
+        self._adaptive = adaptive  # type: Optional[AdaptiveLimit]
+        self._scheduler = scheduler  # type: Optional[PriorityScheduler]
+        self._hedge = hedge  # type: Optional[HedgePolicy]
+        if not isinstance(codec, JSONCodec):
+            codec = get_codec(codec)
+        self._codec = codec  # type: JSONCodec
         self._req_args = {'timeout': 30, 'headers': {}}  # type: Dict[str,Any]
         self._req_args.update(kwargs)
         self._req_args['headers'].update({'content-type': 'application/json'})
 
+        self._pool_connections = pool_connections  # type: int
+        self._pool_maxsize = pool_maxsize  # type: int
+        self._pool_block = pool_block  # type: bool
+        self._pool_idle_timeout = pool_idle_timeout  # type: Optional[float]
+        self._init_connection_state()
+
+    def _init_connection_state(self, local=None):
+        # type: (Optional[threading.local]) -> None
+        # Connection state is per process, it is rebuilt after unpickling
+        # and in a forked child process.
+        self._pid = os.getpid()  # type: int
+        self._pool_lock = threading.Lock()
+        self._local = threading.local() if local is None else local
+        self._session = None  # type: Optional[requests.Session]
+        self._last_used = None  # type: Optional[float]
+        self._pool_counts = {
+            'requests': 0, 'connections': 0, 'evictions': 0,
+        }  # type: Dict[str,int]
+        self._revalidating = set()  # type: Set[str]
+        self._refresher = None  # type: Optional[ThreadPoolExecutor]
+        self._hedger = None  # type: Optional[ThreadPoolExecutor]
+        self._flights = SingleFlight() if self._single_flight else None  # type: Optional[SingleFlight]  # NOQA
+
+    _PROCESS_STATE = ('_pid', '_pool_lock', '_local', '_session',
+                      '_last_used', '_pool_counts', '_revalidating',
+                      '_refresher', '_hedger', '_flights')
+
+    def __getstate__(self):
+        # type: () -> Dict[str,Any]
+        state = self.__dict__.copy()
+        for key in self._PROCESS_STATE:
+            state.pop(key, None)
+        return state
+
+    def __setstate__(self, state):
+        # type: (Dict[str,Any]) -> None
+        self.__dict__.update(state)
+        self._init_connection_state()
+
     def __getattr__(self, func):
         # type: (unicode) -> Callable
         if func not in self.API_NAMES:
             raise AttributeError(
                 'Cannot access or call this attribute "{0}"'.format(func))
 
-        req_url = self.BASE_API_URL.format(func)  # type: unicode
-
         def inner_func(**kwargs):
-            # type: (**Any) -> Dict[unicode,Any]
-            payload = dict([(k, v) for k, v in kwargs.items() if v])  # type: Dict[unicode,Any]  # NOQA
-            payload.update({'app_id': self._app_id})
-            self.response = requests.post(
-                req_url,
-                data=json.dumps(payload),
-                **self._req_args
-            )  # type: requests.Response
-            self.response.raise_for_status()
-            return self.response.json()
+            # type: (**Any) -> Union[Dict[unicode,Any],bytes]
+            raw = kwargs.pop('raw', False)
+            chunk_size = kwargs.pop('chunk_size', None)
+            priority = kwargs.pop('priority', None)
+            deadline = kwargs.pop('deadline', None)
+            if deadline is not None:
+                deadline += time.time()
+                if self._get_deadline() is not None:
+                    deadline = min(deadline, self._get_deadline())
+            if (chunk_size and func in CHUNKED_APIS and
+                    len(kwargs.get('sentence') or u'') > chunk_size):
+                ret = self._call_chunked(func, kwargs, chunk_size, priority,
+                                         deadline)
+                return self._codec.dumpb(ret) if raw else ret
+
+            payload = build_payload(self._app_id, kwargs)
+            # The body is not decoded, so the cache and single-flight
+            # which share decoded results are skipped.
+            call = self._request if raw else self._call
+            if priority is None and deadline is None and not raw:
+                return call(func, payload)
+
+            # Call options are passed down through the thread.
+            local = self._local
+            previous = (self._get_priority(), self._get_deadline(),
+                        self._is_raw())
+            if priority is not None:
+                local.priority = priority
+            if deadline is not None:
+                local.deadline = deadline
+            local.raw = raw
+            try:
+                return call(func, payload)
+            finally:
+                local.priority, local.deadline, local.raw = previous
         return inner_func
+
+    def _call_chunked(self, func, kwargs, chunk_size, priority=None,
+                      deadline=None):
+        # type: (unicode, Dict[unicode,Any], int, Optional[str], Optional[float]) -> Dict[unicode,Any]  # NOQA
+        """ Send the chunks of a long sentence in parallel and merge the
+        results. ``self.response`` is not set.
+
+        All the chunks share ``deadline`` (a :func:`time.time` value).
+        """
+        chunks = split_text(kwargs['sentence'], chunk_size)
+        if priority is not None:
+            kwargs = dict(kwargs, priority=priority)
+        payloads = [dict(kwargs, sentence=chunk) for chunk in chunks]
+        results = list(self.imap(func, payloads,
+                                 workers=min(len(chunks), self._pool_maxsize),
+                                 deadline=remaining(deadline)))
+        if len(results) < len(chunks):
+            # imap stopped at the deadline.
+            raise DeadlineExceeded('Deadline exceeded.')
+        return merge_results(func, results)
+
+    def _get_priority(self):
+        # type: () -> Optional[str]
+        return getattr(self._local, 'priority', None)
+
+    def _get_deadline(self):
+        # type: () -> Optional[float]
+        return getattr(self._local, 'deadline', None)
+
+    def _is_raw(self):
+        # type: () -> bool
+        return getattr(self._local, 'raw', False)
+
+    def _call(self, func, payload):
+        # type: (unicode, Dict[unicode,Any]) -> Dict[unicode,Any]
+        cache = self._cache
+        if cache is None:
+            return self._fetch(func, payload)
+
+        cached = cache.get(func, payload)
+        if cached is not None:
+            # request_id is not a part of the cache key.
+            if 'request_id' in payload:
+                cached['request_id'] = payload['request_id']
+            if not cached.stale:
+                return cached
+            if cache.stale_while_revalidate:
+                self._revalidate(func, payload)
+                return cached
+
+        try:
+            ret = self._fetch(func, payload)
+        except requests.RequestException:
+            if cached is None:
+                raise
+            # stale_if_error
+            return cached
+        cache.set(func, payload, ret)
+        return ret
+
+    def _fetch(self, func, payload):
+        # type: (unicode, Dict[unicode,Any]) -> Dict[unicode,Any]
+        if self._flights is None:
+            return self._request(func, payload)
+        return self._flights.do(flight_key(func, payload),
+                                self._request, func, payload,
+                                deadline=self._get_deadline())
+
+    def _revalidate(self, func, payload):
+        # type: (unicode, Dict[unicode,Any]) -> None
+        """ Refresh the cached response in the background. """
+        key = cache_key(func, payload)
+        with self._pool_lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+            if self._refresher is None:
+                self._refresher = ThreadPoolExecutor(max_workers=2)
+            refresher = self._refresher
+        refresher.submit(self._refresh, key, func, payload)
+
+    def _refresh(self, key, func, payload):
+        # type: (str, unicode, Dict[unicode,Any]) -> None
+        try:
+            ret = self._request(func, payload)
+        except requests.RequestException:
+            # keep serving the stale response.
+            self._cache.count('revalidation_errors')
+        else:
+            self._cache.set(func, payload, ret)
+            self._cache.count('revalidations')
+        finally:
+            with self._pool_lock:
+                self._revalidating.discard(key)
+
+    def _request(self, func, payload):
+        # type: (unicode, Dict[unicode,Any]) -> Dict[unicode,Any]
+        if self._retry is None:
+            return self._send(func, payload)
+        return self._retry.call(self._send, func, payload,
+                                deadline=self._get_deadline())
+
+    def _send(self, func, payload):
+        # type: (unicode, Dict[unicode,Any]) -> Dict[unicode,Any]
+        if self._scheduler is None:
+            return self._post(func, payload)
+        with self._scheduler.slot(self._get_priority(),
+                                  self._get_deadline()):
+            return self._post(func, payload)
+
+    def _post(self, func, payload):
+        # type: (unicode, Dict[unicode,Any]) -> Dict[unicode,Any]
+        keys = self._keys
+        if keys is None:
+            return self._post_as(self._app_id, func, payload)
+        app_id = keys.acquire()
+        try:
+            ret = self._post_as(app_id, func, dict(payload, app_id=app_id))
+        except Exception as e:
+            keys.release(app_id, e)
+            raise
+        keys.release(app_id)
+        return ret
+
+    def _post_as(self, app_id, func, payload):
+        # type: (unicode, unicode, Dict[unicode,Any]) -> Dict[unicode,Any]
+        # Wait for the rate limit first, a trial call of a half-open
+        # circuit must not be lost to a deadline while waiting.
+        if self._rate_limit is not None:
+            self._rate_limit.acquire(app_id, func, self._get_deadline())
+        if self._breaker is not None:
+            self._breaker.before(func)
+        started = time.time()
+        try:
+            ret = self._http_post(func, payload)
+        except Exception as e:
+            self._record(func, started, e)
+            raise
+        self._record(func, started)
+        return ret
+
+    def _record(self, func, started, error=None):
+        # type: (unicode, float, Optional[Exception]) -> None
+        # Only the HTTP round trip is measured, not the time queued.
+        latency = time.time() - started
+        if self._breaker is not None:
+            if isinstance(error, DeadlineExceeded):
+                # The deadline of the caller, not the health of the API.
+                self._breaker.cancel(func)
+            else:
+                failed = (error is not None and
+                          self._breaker.is_failure(error))
+                self._breaker.record(func, latency, failed)
+        if self._adaptive is not None:
+            self._adaptive.record(started, latency, error)
+
+    def _http_post(self, func, payload):
+        # type: (unicode, Dict[unicode,Any]) -> Dict[unicode,Any]
+        if self._hedge is None:
+            self.response = self._send_http(func, payload,
+                                            self._get_deadline())
+        else:
+            self.response = self._send_hedged(func, payload)
+        self.response.raise_for_status()
+        if self._is_raw():
+            return self.response.content
+        return self._codec.loads(self.response.content)
+
+    def _send_http(self, func, payload, deadline=None):
+        # type: (unicode, Dict[unicode,Any], Optional[float]) -> requests.Response  # NOQA
+        req_args = self._req_args
+        left = remaining(deadline)
+        if left is not None:
+            # Do not wait for the response beyond the deadline.
+            timeout = req_args.get('timeout')
+            if timeout is None:
+                timeout = left
+            elif isinstance(timeout, tuple):
+                timeout = tuple(min(t or left, left) for t in timeout)
+            else:
+                timeout = min(timeout, left)
+            req_args = dict(req_args, timeout=timeout)
+        try:
+            return self._get_session().post(
+                self.BASE_API_URL.format(func),
+                data=self._codec.dumpb(payload),
+                **req_args
+            )
+        except requests.Timeout:
+            remaining(deadline)
+            raise
+
+    def _send_hedged(self, func, payload):
+        # type: (unicode, Dict[unicode,Any]) -> requests.Response
+        """ Send the request, and a hedge request if it is slow.
+
+        The first successful response wins, the loser is abandoned. The
+        request is sent by a thread of its own, so that queueing in the
+        hedge pool never counts as its latency.
+        """
+        hedge = self._hedge
+        deadline = self._get_deadline()
+        delay = hedge.delay(func)
+        left = remaining(deadline)
+        started = time.time()
+        if delay is None or (left is not None and left <= delay):
+            # No hedge can be sent before the deadline.
+            response = self._send_http(func, payload, deadline)
+            hedge.record(func, time.time() - started)
+            return response
+        with self._pool_lock:
+            if self._hedger is None:
+                self._hedger = ThreadPoolExecutor(
+                    max_workers=self._pool_maxsize * 2)
+            hedger = self._hedger
+
+        outcomes = queue.Queue()  # type: queue.Queue
+        finished = threading.Event()
+        primary = threading.Thread(
+            target=_put_outcome,
+            args=(outcomes, False, self._send_http, func, payload, deadline))
+        primary.daemon = True
+        primary.start()
+        hedger.submit(_put_outcome, outcomes, True, self._send_delayed_hedge,
+                      func, payload, deadline, started, delay, finished)
+
+        error = None  # type: Optional[BaseException]
+        try:
+            for _ in range(2):
+                try:
+                    is_hedge, response, e = outcomes.get(
+                        timeout=remaining(deadline))
+                except queue.Empty:
+                    raise DeadlineExceeded('Deadline exceeded.')
+                if not is_hedge:
+                    # A hedge is sent only while the request is running.
+                    finished.set()
+                if response is not None:
+                    if is_hedge:
+                        hedge.count('wins')
+                    hedge.record(func, time.time() - started)
+                    return response
+                if e is not None and (error is None or not is_hedge):
+                    error = e
+        finally:
+            finished.set()
+        raise error  # type: ignore
+
+    def _send_delayed_hedge(self, func, payload, deadline, started, delay,
+                            finished):
+        # type: (unicode, Dict[unicode,Any], Optional[float], float, float, threading.Event) -> Optional[requests.Response]  # NOQA
+        # Returns None if the request finished before the delay. The
+        # delay counts from the start of the request, not of this task.
+        if finished.wait(max(started + delay - time.time(), 0)):
+            return None
+        remaining(deadline)
+        if not self._hedge.try_hedge():
+            return None
+        return self._send_hedge(func, payload, deadline)
+
+    def _send_hedge(self, func, payload, deadline=None):
+        # type: (unicode, Dict[unicode,Any], Optional[float]) -> requests.Response  # NOQA
+        # A hedge uses the quota too.
+        if self._rate_limit is not None:
+            self._rate_limit.acquire(payload['app_id'], func, deadline)
+        return self._send_http(func, payload, deadline)
+
+    @property
+    def response(self):
+        # type: () -> requests.Response
+        """ The last HTTP response received by the current thread. """
+        return self._local.response
+
+    @response.setter
+    def response(self, response):
+        # type: (requests.Response) -> None
+        self._local.response = response
+
+    def imap(self, func, payloads, workers=4, window=None, ordered=True,
+             deadline=None, pack=None, pack_fallback=True, on_error=None):
+        # type: (unicode, Iterable[Dict[unicode,Any]], int, Optional[int], bool, Optional[float], Optional[int], bool, Optional[Callable]) -> Iterator[Any]  # NOQA
+        """ Call API ``func`` with each payload in parallel threads.
+
+        Results are yielded lazily. At most ``window`` payloads
+        (default: ``workers * 2``) are in flight or buffered at once, so
+        ``payloads`` can be a large generator. Set ``pool_maxsize`` to
+        ``workers`` or more to reuse all the connections.
+
+        If the client has an ``adaptive`` limit, the number of parallel
+        calls follows it and ``workers`` is ignored.
+
+        With ``deadline`` seconds, each call stops at the deadline and
+        the iteration stops with the results finished by then.
+
+        With ``pack``, up to ``pack`` consecutive sentences of morph or
+        hiragana are sent in one call and its result is split back per
+        sentence. If it can not be split, the sentences are sent one by
+        one, or :class:`goolabs.packing.PackingError` is raised when
+        ``pack_fallback`` is false.
+
+        With ``on_error``, a failed call yields
+        ``on_error(payload, error)`` in place of its result and the
+        iteration goes on.
+        """
+        api_func = getattr(self, func)
+        if deadline is not None:
+            deadline += time.time()
+
+        def fetch(payload):
+            # type: (Dict[unicode,Any]) -> Dict[unicode,Any]
+            if deadline is not None:
+                payload = dict(payload, deadline=deadline - time.time())
+            return api_func(**payload)
+
+        def call(payload):
+            # type: (Dict[unicode,Any]) -> Any
+            try:
+                return fetch(payload)
+            except Exception as e:
+                if on_error is None:
+                    raise
+                return on_error(payload, e)
+
+        if not pack:
+            return executor.imap(call, payloads, workers=workers,
+                                 window=window, ordered=ordered,
+                                 limiter=self._adaptive, deadline=deadline)
+
+        def call_pack(group):
+            # type: (List[Dict[unicode,Any]]) -> List[Any]
+            if len(group) > 1:
+                try:
+                    return packing.unpack(func, fetch(packing.pack(group)),
+                                          group)
+                except Exception as e:
+                    if pack_fallback and isinstance(e, packing.PackingError):
+                        pass
+                    elif on_error is None:
+                        raise
+                    else:
+                        return [on_error(payload, e) for payload in group]
+            return [call(payload) for payload in group]
+
+        results = executor.imap(call_pack,
+                                packing.iter_packs(func, payloads, pack),
+                                workers=workers, window=window,
+                                ordered=ordered, limiter=self._adaptive,
+                                deadline=deadline)
+        return itertools.chain.from_iterable(results)
+
+    def process_imap(self, func, payloads, workers=None, window=None,
+                     ordered=True, postprocess=None):
+        # type: (unicode, Iterable[Dict[unicode,Any]], Optional[int], Optional[int], bool, Optional[Callable]) -> Iterator[Any]  # NOQA
+        """ Call API ``func`` with each payload in worker processes.
+
+        Each worker process gets a copy of this client with its own
+        connection pool. ``postprocess`` (a picklable function) is applied
+        to each result in the worker before it is sent back.
+        See :func:`goolabs.executor.process_imap`.
+        """
+        getattr(self, func)
+        return executor.process_imap(self, func, payloads, workers=workers,
+                                     window=window, ordered=ordered,
+                                     postprocess=postprocess)
+
+    def __enter__(self):
+        # type: () -> GoolabsAPI
+        return self
+
+    def __exit__(self, *exc_info):
+        # type: (*Any) -> None
+        self.close()
+
+    def close(self):
+        # type: () -> None
+        """ Close all pooled connections.
+
+        The client stays usable, a new pool is created on the next call.
+        """
+        with self._pool_lock:
+            self._discard_session()
+            for name in ('_refresher', '_hedger'):
+                pool = getattr(self, name)
+                if pool is not None:
+                    pool.shutdown(wait=False)
+                    setattr(self, name, None)
+
+    def stats(self):
+        # type: () -> Dict[str,Dict[str,int]]
+        """ Return all the counters of this client. """
+        stats = {'pool': self.pool_stats()}
+        if self._cache is not None:
+            stats['cache'] = self._cache.stats()
+        if self._flights is not None:
+            stats['single_flight'] = self._flights.stats()
+        if self._rate_limit is not None:
+            stats['rate_limit'] = self._rate_limit.stats()
+        if self._retry is not None:
+            stats['retry'] = self._retry.stats()
+        if self._breaker is not None:
+            stats['breaker'] = self._breaker.stats()
+        if self._adaptive is not None:
+            stats['concurrency'] = self._adaptive.stats()
+        if self._scheduler is not None:
+            stats['scheduler'] = self._scheduler.stats()
+        if self._hedge is not None:
+            stats['hedge'] = self._hedge.stats()
+        if self._keys is not None:
+            stats['keys'] = self._keys.stats()
+        return stats
+
+    def pool_stats(self):
+        # type: () -> Dict[str,int]
+        """ Return connection pool counters.
+
+        ``hits`` is the number of requests which were sent over an already
+        opened (kept-alive) connection.
+        """
+        with self._pool_lock:
+            stats = dict(self._pool_counts)
+            for pool in self._iter_pools():
+                stats['requests'] += pool.num_requests
+                stats['connections'] += pool.num_connections
+        stats['hits'] = max(stats['requests'] - stats['connections'], 0)
+        return stats
+
+    def _get_session(self):
+        # type: () -> requests.Session
+        if self._pid != os.getpid():
+            # Never share pooled sockets with the parent process. The call
+            # options of the running call are kept.
+            self._init_connection_state(local=self._local)
+        now = time.time()
+        with self._pool_lock:
+            if (self._session is not None and
+                    self._pool_idle_timeout is not None and
+                    self._last_used is not None and
+                    now - self._last_used > self._pool_idle_timeout):
+                # Keep-alive connections idle for a long time are likely
+                # closed by the server already, so drop them all at once.
+                self._discard_session()
+                self._pool_counts['evictions'] += 1
+            if self._session is None:
+                self._session = self._make_session()
+            self._last_used = now
+            return self._session
+
+    def _make_session(self):
+        # type: () -> requests.Session
+        adapter = HTTPAdapter(
+            pool_connections=self._pool_connections,
+            pool_maxsize=self._pool_maxsize,
+            pool_block=self._pool_block,
+        )
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def _discard_session(self):
+        # type: () -> None
+        if self._session is None:
+            return
+        for pool in self._iter_pools():
+            self._pool_counts['requests'] += pool.num_requests
+            self._pool_counts['connections'] += pool.num_connections
+        self._session.close()
+        self._session = None
+
+    def _iter_pools(self):
+        # type: () -> List[Any]
+        if self._session is None:
+            return []
+        pools = []
+        for adapter in set(self._session.adapters.values()):
+            manager = getattr(adapter, 'poolmanager', None)
+            if manager is None:
+                continue
+            for key in manager.pools.keys():
+                pool = manager.pools.get(key)
+                if pool is not None:
+                    pools.append(pool)
+        return pools
+
+
+def _put_outcome(outcomes, is_hedge, send, *args):
+    # type: (queue.Queue, bool, Callable, *Any) -> None
+    """ Put (is_hedge, response, error) of ``send(*args)`` to
+    ``outcomes``. The response is None if nothing was sent.
+    """
+    try:
+        outcomes.put((is_hedge, send(*args), None))
+    except Exception as e:
+        outcomes.put((is_hedge, None, e))
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+    JSON codecs for Goo labs API
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    orjson or ujson is used if installed, otherwise the json module.
+    Set ``GOOLABS_JSON_CODEC`` to ``orjson``, ``ujson`` or ``json`` to
+    choose one.
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import json
+import os
+
+import six
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover
+    ujson = None  # type: ignore
+
+if 0:
+    from typing import Any, Dict, List, Optional, Union  # NOQA
+
+
+class JSONCodec(object):
+    """ The json module of the standard library.
+
+    :meth:`dumps` makes compact text without escaping non-ASCII
+    characters, :meth:`dumps_pretty` indents it by 2 spaces.
+    """
+
+    name = 'json'  # type: str
+
+    def dumps(self, obj):
+        # type: (Any) -> unicode
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+    def dumps_pretty(self, obj):
+        # type: (Any) -> unicode
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
+    def dumpb(self, obj):
+        # type: (Any) -> bytes
+        """ Same as :meth:`dumps`, encoded by UTF-8. """
+        return self.dumps(obj).encode('utf-8')
+
+    def loads(self, data):
+        # type: (Union[bytes,unicode]) -> Any
+        if isinstance(data, six.binary_type):
+            data = data.decode('utf-8')
+        return json.loads(data)
+
+
+class UJSONCodec(JSONCodec):
+
+    name = 'ujson'
+
+    def __init__(self):
+        # type: () -> None
+        if ujson is None:
+            raise ImportError('ujson is not installed.')
+
+    def dumps(self, obj):
+        # type: (Any) -> unicode
+        return ujson.dumps(obj, ensure_ascii=False,
+                           escape_forward_slashes=False)
+
+    def dumps_pretty(self, obj):
+        # type: (Any) -> unicode
+        return ujson.dumps(obj, ensure_ascii=False, indent=2,
+                           escape_forward_slashes=False)
+
+    def loads(self, data):
+        # type: (Union[bytes,unicode]) -> Any
+        return ujson.loads(data)
+
+
+class ORJSONCodec(JSONCodec):
+
+    name = 'orjson'
+
+    def __init__(self):
+        # type: () -> None
+        if orjson is None:
+            raise ImportError('orjson is not installed.')
+
+    def dumps(self, obj):
+        # type: (Any) -> unicode
+        return orjson.dumps(obj).decode('utf-8')
+
+    def dumps_pretty(self, obj):
+        # type: (Any) -> unicode
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+
+    def dumpb(self, obj):
+        # type: (Any) -> bytes
+        return orjson.dumps(obj)
+
+    def loads(self, data):
+        # type: (Union[bytes,unicode]) -> Any
+        return orjson.loads(data)
+
+
+CODECS = {
+    'orjson': ORJSONCodec,
+    'ujson': UJSONCodec,
+    'json': JSONCodec,
+}
+
+# In the order of preference.
+PREFERRED = ['orjson', 'ujson', 'json']  # type: List[str]
+
+_default = None  # type: Optional[JSONCodec]
+
+
+def get_codec(name=None):
+    # type: (Optional[str]) -> JSONCodec
+    """ Return the codec of ``name``, or the default codec. """
+    global _default
+    if name is not None:
+        if name not in CODECS:
+            raise ValueError('Unknown codec "{0}".'.format(name))
+        return CODECS[name]()
+    if _default is None:
+        name = os.environ.get('GOOLABS_JSON_CODEC')
+        _default = get_codec(name) if name else _best_codec()
+    return _default
+
+
+def _best_codec():
+    # type: () -> JSONCodec
+    for name in PREFERRED:
+        try:
+            return CODECS[name]()
+        except ImportError:
+            continue
+    return JSONCodec()  # pragma: no cover
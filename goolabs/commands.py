@@ -8,24 +8,26 @@
 """
 from __future__ import division, print_function, absolute_import  # NOQA
 
-import json
+import functools
 import locale
+import time
 
 import click
-import six
 
 import goolabs
-from goolabs import GoolabsAPI
 
+# The API client, requests and the codecs are imported by the commands
+# which use them, so "goolabs --help" starts fast.
 
 if 0:
-    from typing import Optional, IO, List, Dict, Any  # NOQA
+    from typing import Optional, IO, List, Dict, Any, Iterable, Iterator, Tuple  # NOQA
     from click.core import Context  # NOQA
+    import goolabs.client  # NOQA
 
 
 def text(s):
     # type: (unicode) -> unicode
-    if isinstance(s, six.binary_type):
+    if isinstance(s, bytes):
         return s.decode(locale.getpreferredencoding())
     return s
 
@@ -82,7 +84,139 @@ def clean_length(length):
 
 def format_json(json_data):
     # type: (Dict[unicode,Any]) -> unicode
-    return json.dumps(json_data, indent=2, ensure_ascii=False)
+    from goolabs.codec import get_codec
+    return get_codec().dumps_pretty(json_data)
+
+
+def format_ndjson(json_data):
+    # type: (Dict[unicode,Any]) -> unicode
+    from goolabs.codec import get_codec
+    return get_codec().dumps(json_data)
+
+
+OUTPUT_BLOCK_SIZE = 65536
+
+
+def echo_rows(rows, block_size=OUTPUT_BLOCK_SIZE):
+    # type: (Iterable[unicode], int) -> None
+    """ Write each row as a line, in blocks of about ``block_size``
+    characters instead of one write per row.
+    """
+    block = []  # type: List[unicode]
+    size = 0
+    for row in rows:
+        block.append(row)
+        size += len(row) + 1
+        if size >= block_size:
+            click.echo(u'\n'.join(block))
+            block = []
+            size = 0
+    if block:
+        click.echo(u'\n'.join(block))
+
+
+def echo_json(ret, raw_flag=False, compact_flag=False):
+    # type: (Any, bool, bool) -> None
+    """ Write the result of an API call. It is the response body as it is
+    with ``raw_flag``.
+    """
+    if raw_flag:
+        click.echo(ret)
+    elif compact_flag:
+        click.echo(format_ndjson(ret))
+    else:
+        click.echo(format_json(ret))
+
+
+def iter_lines(sentence, sentence_file):
+    # type: (unicode, Optional[IO]) -> Iterator[unicode]
+    """ Yield non-empty input lines of SENTENCE, --file or stdin. """
+    if sentence:
+        lines = iter(sentence.splitlines())  # type: Iterable[unicode]
+    else:
+        stream = sentence_file or click.get_binary_stream('stdin')
+        lines = (text(line) for line in stream)
+    for line in lines:
+        line = line.rstrip(u'\r\n')
+        if line:
+            yield line
+
+
+def line_payloads(lines, key, request_id, **params):
+    # type: (Iterable[unicode], str, unicode, **Any) -> Iterator[Dict[str,Any]]  # NOQA
+    """ Make a payload for each line.
+
+    The request_id of each payload gets the line number, so that results
+    can be matched with the input lines.
+    """
+    for number, line in enumerate(lines, 1):
+        payload = dict(params)
+        payload[key] = line
+        if request_id:
+            payload['request_id'] = u'{0}-{1}'.format(request_id, number)
+        else:
+            payload['request_id'] = u'{0}'.format(number)
+        yield payload
+
+
+def iter_jobs(jobs_file):
+    # type: (IO) -> Iterator[Tuple[int,unicode]]
+    """ Yield (line number, line) of non-empty NDJSON job lines. """
+    for number, line in enumerate(jobs_file, 1):
+        line = text(line).strip()
+        if line:
+            yield number, line
+
+
+def run_job(api, job_line, deadline=None):
+    # type: (goolabs.client.GoolabsAPI, Tuple[int,unicode], Optional[float]) -> Dict[str,Any]  # NOQA
+    """ Run a job line like ``{"api": "morph", "params": {...}, "id": 1}``.
+
+    Returns the result tagged with the job id (the line number by default).
+    Errors are returned as ``{"id": ..., "error": ...}``, not raised.
+    The call stops at ``deadline`` (a :func:`time.time` value).
+    """
+    from goolabs.client import GoolabsAPI
+    from goolabs.codec import get_codec
+
+    number, line = job_line
+    ret = {'id': number}  # type: Dict[str,Any]
+    try:
+        job = get_codec().loads(line)
+        if not isinstance(job, dict):
+            raise ValueError('A job must be a JSON object.')
+        ret['id'] = job.get('id', number)
+        ret['api'] = job.get('api')
+        if ret['api'] not in GoolabsAPI.API_NAMES:
+            raise ValueError('Unknown api "{0}".'.format(ret['api']))
+        params = job.get('params') or {}
+        if not isinstance(params, dict):
+            raise ValueError('"params" must be a JSON object.')
+        if deadline is not None:
+            params = dict(params, deadline=deadline - time.time())
+        ret['result'] = getattr(api, ret['api'])(**params)
+    except Exception as e:
+        ret['error'] = u'{0}'.format(e)
+    return ret
+
+
+def echo_lines_results(app_id, func, payloads, concurrency, pack=None):
+    # type: (unicode, str, Iterable[Dict[str,Any]], int, Optional[int]) -> None  # NOQA
+    """ Call the API for each payload and write results as NDJSON.
+
+    A failed call is written as ``{"request_id": ..., "error": ...}``.
+    """
+    from goolabs.client import GoolabsAPI
+    api = GoolabsAPI(app_id, pool_maxsize=concurrency)
+    for ret in api.imap(func, payloads, workers=concurrency, pack=pack,
+                        on_error=error_row):
+        click.echo(format_ndjson(ret))
+
+
+def error_row(payload, error):
+    # type: (Dict[str,Any], Exception) -> Dict[str,Any]
+    return {'request_id': payload.get('request_id'),
+            'error': u'{0}'.format(error)}
 
 
 @click.group()
@@ -103,14 +237,27 @@ def main(ctx):
               type=text, help=u'名刺,動詞活用語尾,句点..etc')
 @click.option('--file', '-f', 'sentence_file', type=click.File('rb'))
 @click.option('--json/--no-json', '-j', 'json_flag', default=False)
+@click.option('--raw', 'raw_flag', is_flag=True,
+              help='Output the response body as it is.')
+@click.option('--compact', 'compact_flag', is_flag=True,
+              help='Output JSON without indentation.')
+@click.option('--lines', 'lines_flag', is_flag=True,
+              help='Request each line and output NDJSON.')
+@click.option('--concurrency', 'concurrency', type=click.INT, default=4,
+              help='Number of parallel requests with --lines.')
+@click.option('--chunk-size', 'chunk_size', type=click.INT,
+              help='Split long text into chunks of this many characters.')
+@click.option('--pack', 'pack', type=click.INT,
+              help='Number of lines per request with --lines.')
 @click.pass_context
-def morph(ctx, app_id, sentence_file, json_flag,
-          sentence, info_filter, pos_filter, request_id):
-    # type: (Context, unicode, Optional[IO], bool, unicode, unicode, unicode, unicode) -> None  # NOQA
+def morph(ctx, app_id, sentence_file, json_flag, raw_flag, compact_flag,
+          lines_flag, concurrency, chunk_size, pack, sentence, info_filter,
+          pos_filter, request_id):
+    # type: (Context, unicode, Optional[IO], bool, bool, bool, bool, int, Optional[int], Optional[int], unicode, unicode, unicode, unicode) -> None  # NOQA
     """ Morphological analysis for Japanese."""
+    from goolabs.client import GoolabsAPI
 
     app_id = clean_app_id(app_id)
-    sentence = clean_sentence(sentence, sentence_file)
 
     if info_filter:
         info_filter = info_filter.replace(',', '|')
@@ -118,21 +265,30 @@ def morph(ctx, app_id, sentence_file, json_flag,
     if pos_filter:
         pos_filter = pos_filter.replace(',', '|')
 
+    if lines_flag:
+        payloads = line_payloads(
+            iter_lines(sentence, sentence_file), 'sentence', request_id,
+            info_filter=info_filter, pos_filter=pos_filter)
+        echo_lines_results(app_id, 'morph', payloads, concurrency, pack)
+        return
+
+    sentence = clean_sentence(sentence, sentence_file)
+
     api = GoolabsAPI(app_id)
     ret = api.morph(
         sentence=sentence,
         info_filter=info_filter,
         pos_filter=pos_filter,
         request_id=request_id,
+        chunk_size=chunk_size,
+        raw=raw_flag,
     )
 
-    if json_flag:
-        click.echo(format_json(api.response.json()))
+    if json_flag or raw_flag or compact_flag:
+        echo_json(ret, raw_flag, compact_flag)
         return
 
-    for words in ret['word_list']:
-        for word in words:
-            click.echo(','.join(word))
+    echo_rows(','.join(word) for words in ret['word_list'] for word in words)
 
 
 @main.command()
@@ -140,21 +296,28 @@ def morph(ctx, app_id, sentence_file, json_flag,
 @click.option('--app-id', '-a', 'app_id', envvar='GOOLABS_APP_ID', type=text)
 @click.option('--request-id', '-r', 'request_id', type=text)
 @click.option('--json/--no-json', '-j', 'json_flag', default=False)
+@click.option('--raw', 'raw_flag', is_flag=True,
+              help='Output the response body as it is.')
+@click.option('--compact', 'compact_flag', is_flag=True,
+              help='Output JSON without indentation.')
 @click.pass_context
-def similarity(ctx, app_id, json_flag, query_pair, request_id):
-    # type: (Context, unicode, bool, List[unicode], unicode) -> None
+def similarity(ctx, app_id, json_flag, raw_flag, compact_flag, query_pair,
+               request_id):
+    # type: (Context, unicode, bool, bool, bool, List[unicode], unicode) -> None  # NOQA
     """ Scoring the similarity of two words. """
+    from goolabs.client import GoolabsAPI
 
     app_id = clean_app_id(app_id)
 
     api = GoolabsAPI(app_id)
     ret = api.similarity(
         query_pair=query_pair,
-        request_id=request_id
+        request_id=request_id,
+        raw=raw_flag,
     )
 
-    if json_flag:
-        click.echo(format_json(api.response.json()))
+    if json_flag or raw_flag or compact_flag:
+        echo_json(ret, raw_flag, compact_flag)
         return
 
     click.echo('{0:.16f}'.format(ret['score']))
@@ -168,24 +331,49 @@ def similarity(ctx, app_id, json_flag, query_pair, request_id):
 @click.option('--request-id', '-r', 'request_id', type=text)
 @click.option('--file', '-f', 'sentence_file', type=click.File('rb'))
 @click.option('--json/--no-json', '-j', 'json_flag', default=False)
+@click.option('--raw', 'raw_flag', is_flag=True,
+              help='Output the response body as it is.')
+@click.option('--compact', 'compact_flag', is_flag=True,
+              help='Output JSON without indentation.')
+@click.option('--lines', 'lines_flag', is_flag=True,
+              help='Request each line and output NDJSON.')
+@click.option('--concurrency', 'concurrency', type=click.INT, default=4,
+              help='Number of parallel requests with --lines.')
+@click.option('--chunk-size', 'chunk_size', type=click.INT,
+              help='Split long text into chunks of this many characters.')
+@click.option('--pack', 'pack', type=click.INT,
+              help='Number of lines per request with --lines.')
 @click.pass_context
-def hiragana(ctx, app_id, sentence_file,
-             json_flag, sentence, output_type, request_id):
-    # type: (Context, unicode, Optional[IO], bool, unicode, unicode, unicode) -> None # NOQA
+def hiragana(ctx, app_id, sentence_file, json_flag, raw_flag, compact_flag,
+             lines_flag, concurrency, chunk_size, pack, sentence, output_type,
+             request_id):
+    # type: (Context, unicode, Optional[IO], bool, bool, bool, bool, int, Optional[int], Optional[int], unicode, unicode, unicode) -> None # NOQA
     """ Convert the Japanese to Hiragana or Katakana. """
+    from goolabs.client import GoolabsAPI
 
     app_id = clean_app_id(app_id)
+
+    if lines_flag:
+        payloads = line_payloads(
+            iter_lines(sentence, sentence_file), 'sentence', request_id,
+            output_type=output_type)
+        echo_lines_results(app_id, 'hiragana', payloads, concurrency,
+                           pack)
+        return
+
     sentence = clean_sentence(sentence, sentence_file)
 
     api = GoolabsAPI(app_id)
     ret = api.hiragana(
         sentence=sentence,
         output_type=output_type,
-        request_id=request_id
+        request_id=request_id,
+        chunk_size=chunk_size,
+        raw=raw_flag,
     )
 
-    if json_flag:
-        click.echo(format_json(api.response.json()))
+    if json_flag or raw_flag or compact_flag:
+        echo_json(ret, raw_flag, compact_flag)
         return
 
     click.echo(ret['converted'])
@@ -199,31 +387,52 @@ def hiragana(ctx, app_id, sentence_file,
 @click.option('--request-id', '-r', 'request_id', type=text)
 @click.option('--file', '-f', 'sentence_file', type=click.File('rb'))
 @click.option('--json/--no-json', '-j', 'json_flag', default=False)
+@click.option('--raw', 'raw_flag', is_flag=True,
+              help='Output the response body as it is.')
+@click.option('--compact', 'compact_flag', is_flag=True,
+              help='Output JSON without indentation.')
+@click.option('--lines', 'lines_flag', is_flag=True,
+              help='Request each line and output NDJSON.')
+@click.option('--concurrency', 'concurrency', type=click.INT, default=4,
+              help='Number of parallel requests with --lines.')
+@click.option('--chunk-size', 'chunk_size', type=click.INT,
+              help='Split long text into chunks of this many characters.')
 @click.pass_context
-def entity(ctx, app_id, sentence_file,
-           json_flag, sentence, class_filter, request_id):
-    # type: (Context, unicode, Optional[IO], bool, unicode, unicode, unicode) -> None # NOQA
+def entity(ctx, app_id, sentence_file, json_flag, raw_flag, compact_flag,
+           lines_flag, concurrency, chunk_size, sentence, class_filter,
+           request_id):
+    # type: (Context, unicode, Optional[IO], bool, bool, bool, bool, int, Optional[int], unicode, unicode, unicode) -> None # NOQA
     """ Extract unique representation from sentence. """
+    from goolabs.client import GoolabsAPI
 
     app_id = clean_app_id(app_id)
-    sentence = clean_sentence(sentence, sentence_file)
 
     if class_filter:
         class_filter = class_filter.replace(',', '|')
 
+    if lines_flag:
+        payloads = line_payloads(
+            iter_lines(sentence, sentence_file), 'sentence', request_id,
+            class_filter=class_filter)
+        echo_lines_results(app_id, 'entity', payloads, concurrency)
+        return
+
+    sentence = clean_sentence(sentence, sentence_file)
+
     api = GoolabsAPI(app_id)
     ret = api.entity(
         sentence=sentence,
         class_filter=class_filter,
-        request_id=request_id
+        request_id=request_id,
+        chunk_size=chunk_size,
+        raw=raw_flag,
     )
 
-    if json_flag:
-        click.echo(format_json(api.response.json()))
+    if json_flag or raw_flag or compact_flag:
+        echo_json(ret, raw_flag, compact_flag)
         return
 
-    for ne in ret['ne_list']:
-        click.echo(','.join(ne))
+    echo_rows(','.join(ne) for ne in ret['ne_list'])
 
 
 @main.command()
@@ -233,11 +442,16 @@ def entity(ctx, app_id, sentence_file,
 @click.option('--request-id', '-r', 'request_id', type=text)
 @click.option('--file', '-f', 'review_file', type=click.File('rb'))
 @click.option('--json/--no-json', '-j', 'json_flag', default=False)
+@click.option('--raw', 'raw_flag', is_flag=True,
+              help='Output the response body as it is.')
+@click.option('--compact', 'compact_flag', is_flag=True,
+              help='Output JSON without indentation.')
 @click.pass_context
 def shortsum(ctx, app_id, review_file,
-             json_flag, review, length, request_id):
-    # type: (Context, unicode, Optional[IO], bool, unicode, unicode, unicode) -> None # NOQA
+             json_flag, raw_flag, compact_flag, review, length, request_id):
+    # type: (Context, unicode, Optional[IO], bool, bool, bool, unicode, unicode, unicode) -> None # NOQA
     """Summarize reviews into a short summary."""
+    from goolabs.client import GoolabsAPI
 
     app_id = clean_app_id(app_id)
     review_list = clean_review(review, review_file)
@@ -248,10 +462,11 @@ def shortsum(ctx, app_id, review_file,
         review_list=review_list,
         length=length_int,
         request_id=request_id,
+        raw=raw_flag,
     )
 
-    if json_flag:
-        click.echo(format_json(api.response.json()))
+    if json_flag or raw_flag or compact_flag:
+        echo_json(ret, raw_flag, compact_flag)
         return
 
     click.echo(ret['summary'])
@@ -266,13 +481,31 @@ def shortsum(ctx, app_id, review_file,
 @click.option('--request-id', '-r', 'request_id', type=text)
 @click.option('--file', '-f', 'body_file', type=click.File('rb'))
 @click.option('--json/--no-json', '-j', 'json_flag', default=False)
+@click.option('--raw', 'raw_flag', is_flag=True,
+              help='Output the response body as it is.')
+@click.option('--compact', 'compact_flag', is_flag=True,
+              help='Output JSON without indentation.')
+@click.option('--lines', 'lines_flag', is_flag=True,
+              help='Request each line and output NDJSON.')
+@click.option('--concurrency', 'concurrency', type=click.INT, default=4,
+              help='Number of parallel requests with --lines.')
 @click.pass_context
-def keyword(ctx, app_id, body_file, json_flag,
-            title, body, max_num, forcus, request_id):
-    # type: (Context, unicode, Optional[IO], bool, unicode, unicode, int, unicode, unicode) -> None # NOQA
+def keyword(ctx, app_id, body_file, json_flag, raw_flag, compact_flag,
+            lines_flag, concurrency, title, body, max_num, forcus,
+            request_id):
+    # type: (Context, unicode, Optional[IO], bool, bool, bool, bool, int, unicode, unicode, int, unicode, unicode) -> None # NOQA
     """Extract "keywords" from an input document. """
+    from goolabs.client import GoolabsAPI
 
     app_id = clean_app_id(app_id)
+
+    if lines_flag:
+        payloads = line_payloads(
+            iter_lines(body, body_file), 'body', request_id,
+            title=title, max_num=max_num, forcus=forcus)
+        echo_lines_results(app_id, 'keyword', payloads, concurrency)
+        return
+
     body = clean_body(body, body_file)
 
     api = GoolabsAPI(app_id)
@@ -282,16 +515,20 @@ def keyword(ctx, app_id, body_file, json_flag,
         max_num=max_num,
         forcus=forcus,
         request_id=request_id,
+        raw=raw_flag,
     )
 
-    if json_flag:
-        click.echo(format_json(api.response.json()))
+    if json_flag or raw_flag or compact_flag:
+        echo_json(ret, raw_flag, compact_flag)
         return
 
-    for k in ret['keywords']:
-        k = dict((key.encode('utf-8'), k[key]) for key in k.keys())
-        for keyword, score in six.iteritems(k):
-            click.echo(u'{0},{1}'.format(text(keyword), score))
+    def keyword_rows():
+        # type: () -> Iterator[unicode]
+        for k in ret['keywords']:
+            k = dict((key.encode('utf-8'), k[key]) for key in k.keys())
+            for keyword, score in k.items():
+                yield u'{0},{1}'.format(text(keyword), score)
+    echo_rows(keyword_rows())
 
 
 @main.command()
@@ -301,13 +538,33 @@ def keyword(ctx, app_id, body_file, json_flag,
 @click.option('--doc-time', '-d', 'doc_time', type=text)
 @click.option('--file', '-f', 'sentence_file', type=click.File('rb'))
 @click.option('--json/--no-json', '-j', 'json_flag', default=False)
+@click.option('--raw', 'raw_flag', is_flag=True,
+              help='Output the response body as it is.')
+@click.option('--compact', 'compact_flag', is_flag=True,
+              help='Output JSON without indentation.')
+@click.option('--lines', 'lines_flag', is_flag=True,
+              help='Request each line and output NDJSON.')
+@click.option('--concurrency', 'concurrency', type=click.INT, default=4,
+              help='Number of parallel requests with --lines.')
+@click.option('--chunk-size', 'chunk_size', type=click.INT,
+              help='Split long text into chunks of this many characters.')
 @click.pass_context
-def chrono(ctx, app_id, sentence_file,
-           json_flag, sentence, doc_time, request_id):
-    # type: (Context, unicode, Optional[IO], bool, unicode, unicode, unicode) -> None  # NOQA
+def chrono(ctx, app_id, sentence_file, json_flag, raw_flag, compact_flag,
+           lines_flag, concurrency, chunk_size, sentence, doc_time,
+           request_id):
+    # type: (Context, unicode, Optional[IO], bool, bool, bool, bool, int, Optional[int], unicode, unicode, unicode) -> None  # NOQA
     """Extract expression expressing date and time and normalize its value """
+    from goolabs.client import GoolabsAPI
 
     app_id = clean_app_id(app_id)
+
+    if lines_flag:
+        payloads = line_payloads(
+            iter_lines(sentence, sentence_file), 'sentence', request_id,
+            doc_time=doc_time)
+        echo_lines_results(app_id, 'chrono', payloads, concurrency)
+        return
+
     sentence = clean_sentence(sentence, sentence_file)
 
     api = GoolabsAPI(app_id)
@@ -315,11 +572,153 @@ def chrono(ctx, app_id, sentence_file,
         sentence=sentence,
         doc_time=doc_time,
         request_id=request_id,
+        chunk_size=chunk_size,
+        raw=raw_flag,
     )
 
-    if json_flag:
-        click.echo(format_json(api.response.json()))
+    if json_flag or raw_flag or compact_flag:
+        echo_json(ret, raw_flag, compact_flag)
         return
 
-    for pair in ret['datetime_list']:
-        click.echo(u'{0}: {1}'.format(text(pair[0]), pair[1]))
+    echo_rows(u'{0}: {1}'.format(text(pair[0]), pair[1])
+              for pair in ret['datetime_list'])
+
+
+@main.command()
+@click.argument('jobs_file', default='-', type=click.File('rb'))
+@click.option('--app-id', '-a', 'app_id', envvar='GOOLABS_APP_ID', type=text)
+@click.option('--concurrency', 'concurrency', type=click.INT, default=4,
+              help='Number of parallel requests.')
+@click.option('--cache', 'cache_path', envvar='GOOLABS_CACHE',
+              type=click.Path(dir_okay=False), help='Response cache file.')
+@click.option('--rate', 'rate', type=click.FLOAT,
+              help='Maximum requests per second.')
+@click.option('--retries', 'retries', type=click.INT, default=0,
+              help='Retry failed requests up to this many times.')
+@click.option('--adaptive', 'adaptive', is_flag=True,
+              help='Adapt parallel requests to the load, up to --concurrency.')
+@click.option('--deadline', 'deadline', type=click.FLOAT,
+              help='Stop after this many seconds with the finished jobs.')
+@click.pass_context
+def batch(ctx, app_id, jobs_file, concurrency, cache_path, rate, retries,
+          adaptive, deadline):
+    # type: (Context, unicode, IO, int, Optional[unicode], Optional[float], int, bool, Optional[float]) -> None  # NOQA
+    """Run NDJSON jobs of any API concurrently."""
+    from goolabs import executor
+    from goolabs.adaptive import AdaptiveLimit
+    from goolabs.cache import ResponseCache
+    from goolabs.client import GoolabsAPI
+    from goolabs.keypool import KeyPool
+    from goolabs.ratelimit import RateLimiter
+    from goolabs.retry import RetryPolicy
+
+    app_id = clean_app_id(app_id)
+    if u',' in app_id:
+        # spread the jobs over the app_ids.
+        app_id = KeyPool(app_id.split(u','), strategy='least_loaded')
+
+    cache = ResponseCache(cache_path) if cache_path else None
+    rate_limit = RateLimiter(rate) if rate else None
+    retry = RetryPolicy(max_attempts=retries + 1) if retries > 0 else None
+    limiter = AdaptiveLimit(max_limit=concurrency) if adaptive else None
+    api = GoolabsAPI(app_id, pool_maxsize=concurrency, cache=cache,
+                     rate_limit=rate_limit, retry=retry, adaptive=limiter)
+    if deadline is not None:
+        deadline += time.time()
+    results = executor.imap(
+        functools.partial(run_job, api, deadline=deadline),
+        iter_jobs(jobs_file),
+        workers=concurrency,
+        ordered=False,
+        limiter=limiter,
+        deadline=deadline,
+    )
+    for ret in results:
+        click.echo(format_ndjson(ret))
+    if deadline is not None and time.time() >= deadline:
+        click.echo(u'Deadline exceeded.', err=True)
+
+
+@main.group('cache')
+def cache_group():
+    # type: () -> None
+    """Export, import or warm up the response cache."""
+
+
+@cache_group.command('export')
+@click.argument('snapshot', type=click.Path(dir_okay=False))
+@click.option('--cache', 'cache_path', envvar='GOOLABS_CACHE', required=True,
+              type=click.Path(exists=True, dir_okay=False),
+              help='Response cache file.')
+def cache_export(snapshot, cache_path):
+    # type: (unicode, unicode) -> None
+    """Export the cache to a gzipped snapshot."""
+    from goolabs.cache import ResponseCache, dump_snapshot
+
+    count = dump_snapshot(ResponseCache(cache_path).disk, snapshot)
+    click.echo(u'Exported {0} entries.'.format(count))
+
+
+@cache_group.command('import')
+@click.argument('snapshot', type=click.Path(exists=True, dir_okay=False))
+@click.option('--cache', 'cache_path', envvar='GOOLABS_CACHE', required=True,
+              type=click.Path(dir_okay=False), help='Response cache file.')
+@click.option('--replace/--merge', 'replace', default=False,
+              help='Overwrite or keep the existing entries.')
+def cache_import(snapshot, cache_path, replace):
+    # type: (unicode, unicode, bool) -> None
+    """Import a snapshot into the cache."""
+    from goolabs.cache import ResponseCache, load_snapshot
+
+    count = load_snapshot(ResponseCache(cache_path).disk, snapshot,
+                          replace=replace)
+    click.echo(u'Imported {0} entries.'.format(count))
+
+
+@cache_group.command('warm')
+@click.argument('api_name', type=click.Choice(
+    ['morph', 'hiragana', 'entity', 'chrono']))
+@click.option('--app-id', '-a', 'app_id', envvar='GOOLABS_APP_ID', type=text)
+@click.option('--cache', 'cache_path', envvar='GOOLABS_CACHE', required=True,
+              type=click.Path(dir_okay=False), help='Response cache file.')
+@click.option('--file', '-f', 'corpus_file', type=click.File('rb'),
+              help='Corpus file. Each line is a sentence.')
+@click.option('--params', 'params', type=text, default=u'{}',
+              help='Other arguments of the API as JSON.')
+@click.option('--ttl', 'ttl', type=click.FLOAT,
+              help='Lifetime of the entries in seconds.')
+@click.option('--concurrency', 'concurrency', type=click.INT, default=4,
+              help='Number of parallel requests.')
+def cache_warm(api_name, app_id, cache_path, corpus_file, params, ttl,
+               concurrency):
+    # type: (unicode, unicode, unicode, Optional[IO], unicode, Optional[float], int) -> None  # NOQA
+    """Call the API for each line of a corpus to fill the cache."""
+    from goolabs.cache import ResponseCache
+    from goolabs.client import GoolabsAPI
+    from goolabs.codec import get_codec
+
+    app_id = clean_app_id(app_id)
+    try:
+        extra = get_codec().loads(params)
+    except ValueError:
+        raise click.UsageError('--params is not a valid JSON object.')
+    if not isinstance(extra, dict):
+        raise click.UsageError('--params is not a valid JSON object.')
+
+    cache = ResponseCache(cache_path, ttl=ttl)
+    api = GoolabsAPI(app_id, pool_maxsize=concurrency, cache=cache)
+    payloads = (dict(extra, sentence=line)
+                for line in iter_lines(None, corpus_file))
+    failed = []  # type: List[Dict[str,Any]]
+
+    def on_error(payload, error):
+        # type: (Dict[str,Any], Exception) -> None
+        failed.append(payload)
+
+    for _ in api.imap(api_name, payloads, workers=concurrency,
+                      ordered=False, on_error=on_error):
+        pass
+
+    stats = cache.stats()
+    click.echo(u'Cached {0} entries ({1} already cached, {2} failed).'.format(
+        stats['sets'], stats['hits'], len(failed)))
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""
+    Deadlines of Goo labs API calls
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import time
+
+import requests
+
+if 0:
+    from typing import Optional  # NOQA
+
+
+class DeadlineExceeded(requests.Timeout):
+    """ Raised when the deadline of a call has passed. """
+
+
+def remaining(deadline):
+    # type: (Optional[float]) -> Optional[float]
+    """ Return the seconds left until ``deadline`` (a :func:`time.time`
+    value), or None if there is no deadline.
+
+    Raises :class:`DeadlineExceeded` if the deadline has passed.
+    """
+    if deadline is None:
+        return None
+    left = deadline - time.time()
+    if left <= 0:
+        raise DeadlineExceeded('Deadline exceeded.')
+    return left
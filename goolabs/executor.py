@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+    Parallel executors for Goo labs API calls
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import multiprocessing
+import time
+
+from concurrent.futures import (
+    ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+)
+
+if 0:
+    from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple  # NOQA
+    from concurrent.futures import Executor, Future  # NOQA
+    from goolabs.adaptive import AdaptiveLimit  # NOQA
+
+
+def imap(func, iterable, workers=4, window=None, ordered=True, limiter=None,
+         deadline=None):
+    # type: (Callable, Iterable, int, Optional[int], bool, Optional[AdaptiveLimit], Optional[float]) -> Iterator  # NOQA
+    """ Lazily map ``func`` over ``iterable`` on a thread pool.
+
+    At most ``window`` items (default: ``workers * 2``) are taken from
+    ``iterable`` and held as running calls or buffered results at once.
+    When ``ordered`` is true, results are yielded in input order,
+    otherwise as soon as each call finishes.
+
+    With a :class:`goolabs.adaptive.AdaptiveLimit`, the pool has
+    ``limiter.max_limit`` threads and at most ``limiter.limit`` calls
+    run at once.
+
+    See :func:`windowed_map` for ``deadline``.
+    """
+    if limiter is not None:
+        workers = limiter.max_limit
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        for result in windowed_map(executor, func, iterable,
+                                   window or workers * 2, ordered,
+                                   limiter, deadline):
+            yield result
+    finally:
+        executor.shutdown(wait=False)
+
+
+def process_imap(api, func, payloads, workers=None, window=None,
+                 ordered=True, postprocess=None):
+    # type: (Any, unicode, Iterable[Dict[unicode,Any]], Optional[int], Optional[int], bool, Optional[Callable]) -> Iterator  # NOQA
+    """ Lazily call ``api.<func>(**payload)`` for each payload on a
+    process pool (Python 3.7+).
+
+    ``api`` is pickled once per worker process, so a
+    :class:`goolabs.client.GoolabsAPI` opens its own connections in each
+    worker. ``postprocess`` is applied to each result in the worker.
+    """
+    workers = workers or multiprocessing.cpu_count()
+    pool = ProcessPoolExecutor(max_workers=workers,
+                               initializer=_init_process_worker,
+                               initargs=(api,))
+    try:
+        tasks = ((func, payload, postprocess) for payload in payloads)
+        for result in windowed_map(pool, _call_process_worker, tasks,
+                                   window or workers * 2, ordered):
+            yield result
+    finally:
+        pool.shutdown(wait=False)
+
+
+_worker_api = None  # type: Any
+
+
+def _init_process_worker(api):
+    # type: (Any) -> None
+    global _worker_api
+    _worker_api = api
+
+
+def _call_process_worker(task):
+    # type: (Tuple[unicode,Dict[unicode,Any],Optional[Callable]]) -> Any
+    func, payload, postprocess = task
+    result = getattr(_worker_api, func)(**payload)
+    if postprocess is not None:
+        result = postprocess(result)
+    return result
+
+
+def windowed_map(executor, func, iterable, window, ordered=True,
+                 limiter=None, deadline=None):
+    # type: (Executor, Callable, Iterable, int, bool, Optional[AdaptiveLimit], Optional[float]) -> Iterator  # NOQA
+    """ Map ``func`` over ``iterable`` with ``executor``, keeping at most
+    ``window`` submitted or buffered items, and at most ``limiter.limit``
+    running items if ``limiter`` is given.
+
+    Exceptions raised by ``func`` are re-raised when their result would
+    have been yielded.
+
+    At ``deadline`` (a :func:`time.time` value), the iteration stops with
+    the results yielded so far, and the calls which have not started are
+    cancelled. When ``ordered`` is true, finished results waiting for an
+    earlier one are dropped.
+    """
+    if window < 1:
+        raise ValueError('window must be greater than 0.')
+
+    iterator = iter(iterable)
+    pending = {}  # type: Dict[Future,int]
+    finished = {}  # type: Dict[int,Future]
+    submitted = 0
+    next_index = 0
+    exhausted = False
+    try:
+        while True:
+            if deadline is not None and time.time() >= deadline:
+                return
+
+            while (not exhausted and
+                   len(pending) + len(finished) < window and
+                   (limiter is None or len(pending) < limiter.limit)):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending[executor.submit(func, item)] = submitted
+                submitted += 1
+
+            if next_index in finished:
+                # reorder buffer
+                yield finished.pop(next_index).result()
+                next_index += 1
+                continue
+
+            if not pending:
+                return
+
+            timeout = None if deadline is None else deadline - time.time()
+            done, _ = wait(list(pending), timeout=timeout,
+                           return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                if ordered:
+                    finished[index] = future
+                else:
+                    yield future.result()
+    finally:
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+    Hedged requests for Goo labs API
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import collections
+import math
+import threading
+
+if 0:
+    from typing import Any, Deque, Dict, Optional  # NOQA
+
+
+class HedgePolicy(object):
+    """ When to send a duplicate (hedge) request of a slow call.
+
+    A hedge is sent when a call of an API has not returned within the
+    ``percentile`` of its last ``window`` latencies. Until ``min_samples``
+    latencies are observed, no hedge is sent. Hedges are at most
+    ``budget`` (e.g. 5%) of the requests.
+    """
+
+    def __init__(self, percentile=95, budget=0.05, window=100,
+                 min_samples=20):
+        # type: (float, float, int, int) -> None
+        self.percentile = percentile  # type: float
+        self.budget = budget  # type: float
+        self.window = window  # type: int
+        self.min_samples = min(min_samples, window)  # type: int
+        self._lock = threading.Lock()
+        self._latencies = {}  # type: Dict[unicode,Deque[float]]
+        self._counts = {'requests': 0, 'hedges': 0, 'wins': 0}  # type: Dict[str,int]  # NOQA
+
+    def __getstate__(self):
+        # type: () -> Dict[str,Any]
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        # type: (Dict[str,Any]) -> None
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def delay(self, name):
+        # type: (unicode) -> Optional[float]
+        """ Count a call of ``name`` and return the seconds after which
+        it should be hedged, or None.
+        """
+        with self._lock:
+            self._counts['requests'] += 1
+            latencies = self._latencies.get(name)
+            if latencies is None or len(latencies) < self.min_samples:
+                return None
+            ordered = sorted(latencies)
+        index = int(math.ceil(self.percentile / 100 * len(ordered))) - 1
+        return ordered[min(max(index, 0), len(ordered) - 1)]
+
+    def record(self, name, latency):
+        # type: (unicode, float) -> None
+        with self._lock:
+            latencies = self._latencies.get(name)
+            if latencies is None:
+                latencies = self._latencies[name] = collections.deque(
+                    maxlen=self.window)
+            latencies.append(latency)
+
+    def try_hedge(self):
+        # type: () -> bool
+        """ Take a hedge from the budget if one is left. """
+        with self._lock:
+            counts = self._counts
+            if counts['hedges'] + 1 > self.budget * counts['requests']:
+                return False
+            counts['hedges'] += 1
+            return True
+
+    def count(self, name):
+        # type: (str) -> None
+        with self._lock:
+            self._counts[name] += 1
+
+    def stats(self):
+        # type: () -> Dict[str,int]
+        with self._lock:
+            return dict(self._counts)
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+    Pool of app_ids for Goo labs API
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import threading
+import time
+
+import requests
+
+from goolabs.retry import parse_retry_after
+
+if 0:
+    from typing import Any, Dict, Iterable, List, Optional  # NOQA
+
+
+class _Key(object):
+
+    def __init__(self, app_id):
+        # type: (unicode) -> None
+        self.app_id = app_id  # type: unicode
+        self.in_flight = 0  # type: int
+        self.requests = 0  # type: int
+        self.quota_errors = 0  # type: int
+        self.ejected_until = 0.0  # type: float
+
+
+class KeyPool(object):
+    """ Spread requests over several app_ids.
+
+    ``strategy`` is ``"round_robin"`` or ``"least_loaded"`` (the key with
+    the fewest requests in flight). A key which gets a quota error (a
+    response with one of ``statuses``) is ejected for ``eject_time``
+    seconds, or as long as its ``Retry-After`` header says. If every key
+    is ejected, the key which comes back first is used.
+    """
+
+    STRATEGIES = ('round_robin', 'least_loaded')
+
+    def __init__(self, app_ids, strategy='round_robin', eject_time=60,
+                 statuses=(429,)):
+        # type: (Iterable[unicode], str, float, Iterable[int]) -> None
+        app_ids = list(app_ids)
+        if not app_ids:
+            raise ValueError('app_ids must not be empty.')
+        if strategy not in self.STRATEGIES:
+            raise ValueError('Unknown strategy "{0}".'.format(strategy))
+        self.app_ids = app_ids  # type: List[unicode]
+        self.strategy = strategy  # type: str
+        self.eject_time = eject_time  # type: float
+        self.statuses = frozenset(statuses)
+        self._init_state()
+
+    def _init_state(self):
+        # type: () -> None
+        self._lock = threading.Lock()
+        self._keys = [_Key(app_id) for app_id in self.app_ids]  # type: List[_Key]  # NOQA
+        self._next = 0  # type: int
+        self._ejections = 0  # type: int
+
+    def __getstate__(self):
+        # type: () -> Dict[str,Any]
+        return {'app_ids': self.app_ids, 'strategy': self.strategy,
+                'eject_time': self.eject_time, 'statuses': self.statuses}
+
+    def __setstate__(self, state):
+        # type: (Dict[str,Any]) -> None
+        self.__init__(**state)
+
+    def __len__(self):
+        # type: () -> int
+        return len(self.app_ids)
+
+    def acquire(self):
+        # type: () -> unicode
+        """ Choose an app_id for a request. Call :meth:`release` after
+        the request.
+        """
+        now = time.time()
+        with self._lock:
+            keys = self._keys
+            available = [k for k in keys if k.ejected_until <= now]
+            if not available:
+                key = min(keys, key=lambda k: k.ejected_until)
+            elif self.strategy == 'least_loaded':
+                key = min(available, key=lambda k: (k.in_flight, k.requests))
+            else:
+                count = len(keys)
+                for i in range(count):
+                    key = keys[(self._next + i) % count]
+                    if key.ejected_until <= now:
+                        break
+                self._next = (keys.index(key) + 1) % count
+            key.in_flight += 1
+            key.requests += 1
+            return key.app_id
+
+    def release(self, app_id, error=None):
+        # type: (unicode, Optional[Exception]) -> None
+        """ Finish a request of ``app_id``, ejecting it on a quota error. """
+        eject_for = self._eject_time(error)
+        with self._lock:
+            key = self._keys[self.app_ids.index(app_id)]
+            key.in_flight -= 1
+            if eject_for is not None:
+                key.quota_errors += 1
+                key.ejected_until = time.time() + eject_for
+                self._ejections += 1
+
+    def stats(self):
+        # type: () -> Dict[str,Any]
+        """ Return the counters of the keys in the order of ``app_ids``.
+
+        app_ids themselves are not included, as they are credentials.
+        """
+        now = time.time()
+        with self._lock:
+            return {
+                'ejections': self._ejections,
+                'keys': [{
+                    'requests': k.requests,
+                    'in_flight': k.in_flight,
+                    'quota_errors': k.quota_errors,
+                    'ejected': k.ejected_until > now,
+                } for k in self._keys],
+            }
+
+    def _eject_time(self, error):
+        # type: (Optional[Exception]) -> Optional[float]
+        if not isinstance(error, requests.HTTPError):
+            return None
+        response = error.response
+        if response is None or response.status_code not in self.statuses:
+            return None
+        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        return self.eject_time if retry_after is None else retry_after
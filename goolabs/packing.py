@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+    Packing of short sentences into one Goo labs API call
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import itertools
+
+if 0:
+    from typing import Any, Dict, Iterable, Iterator, List  # NOQA
+
+PACKED_APIS = ('morph', 'hiragana')
+
+# A symbol which morph keeps as a word of its own and hiragana leaves
+# as it is. Each packed sentence is put on its own line.
+DELIMITER = u'〓'
+_SEPARATOR = u'\n' + DELIMITER + u'\n'
+
+
+class PackingError(ValueError):
+    """ Raised when a packed result can not be split back per sentence. """
+
+
+def is_packable(func, payload):
+    # type: (str, Dict[unicode,Any]) -> bool
+    """ Return whether ``payload`` can be packed with others.
+
+    morph results are split at the delimiter word, so its form must be
+    in the result and must not be filtered out.
+    """
+    if func not in PACKED_APIS:
+        return False
+    if DELIMITER in (payload.get('sentence') or u''):
+        return False
+    if func == 'morph':
+        info_filter = payload.get('info_filter')
+        if info_filter and 'form' not in info_filter.split('|'):
+            return False
+        if payload.get('pos_filter'):
+            return False
+    return True
+
+
+def _pack_key(payload):
+    # type: (Dict[unicode,Any]) -> List[Any]
+    return sorted((k, v) for k, v in payload.items()
+                  if k not in ('sentence', 'request_id'))
+
+
+def iter_packs(func, payloads, size):
+    # type: (str, Iterable[Dict[unicode,Any]], int) -> Iterator[List[Dict[unicode,Any]]]  # NOQA
+    """ Group consecutive payloads into lists of at most ``size``.
+
+    Payloads in a group share all the parameters but ``sentence`` and
+    ``request_id``. A payload which can not be packed is a group of its
+    own.
+    """
+    if size < 1:
+        raise ValueError('size must be 1 or more.')
+    pack = []  # type: List[Dict[unicode,Any]]
+    for payload in payloads:
+        if not is_packable(func, payload):
+            if pack:
+                yield pack
+                pack = []
+            yield [payload]
+            continue
+        if pack and (len(pack) >= size or
+                     _pack_key(pack[0]) != _pack_key(payload)):
+            yield pack
+            pack = []
+        pack.append(payload)
+    if pack:
+        yield pack
+
+
+def pack(payloads):
+    # type: (List[Dict[unicode,Any]]) -> Dict[unicode,Any]
+    """ Return one payload which has the sentences of ``payloads``. """
+    packed = dict(payloads[0])
+    packed.pop('request_id', None)
+    packed['sentence'] = _SEPARATOR.join(p['sentence'] for p in payloads)
+    return packed
+
+
+def unpack(func, ret, payloads):
+    # type: (str, Dict[unicode,Any], List[Dict[unicode,Any]]) -> List[Dict[unicode,Any]]  # NOQA
+    """ Split the result of a packed call into the results of
+    ``payloads``.
+    """
+    if func == 'morph':
+        parts = _split_words(ret['word_list'])
+        key = 'word_list'
+    else:
+        parts = [part.strip() for part in ret['converted'].split(DELIMITER)]
+        key = 'converted'
+    if len(parts) != len(payloads):
+        raise PackingError('{0} results for {1} sentences.'.format(
+            len(parts), len(payloads)))
+
+    results = []  # type: List[Dict[unicode,Any]]
+    for payload, part in zip(payloads, parts):
+        result = dict(ret)
+        result[key] = part
+        if payload.get('request_id'):
+            result['request_id'] = payload['request_id']
+        results.append(result)
+    return results
+
+
+def _split_words(word_list):
+    # type: (List[List[List[unicode]]]) -> List[List[List[List[unicode]]]]
+    parts = [[]]  # type: List[List[List[List[unicode]]]]
+    for words in word_list:
+        for is_delimiter, group in itertools.groupby(
+                words, lambda word: word[0] == DELIMITER):
+            if is_delimiter:
+                # the delimiters of empty sentences are next to each other.
+                parts.extend([] for _ in group)
+            else:
+                parts[-1].append(list(group))
+    return parts
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+    Client-side rate limiter for Goo labs API
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import contextlib
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+from goolabs.deadline import DeadlineExceeded, remaining
+
+if 0:
+    from typing import Any, Dict, Iterator, List, Optional, Tuple  # NOQA
+
+
+class RateLimiter(object):
+    """ Token buckets limiting requests per app_id and per endpoint.
+
+    ``rate`` is the number of requests per second for each app_id and
+    ``rates`` maps API names to their own rate per app_id. Up to ``burst``
+    requests may be sent at once after an idle period.
+
+    With ``path``, the buckets live in a memory-mapped file locked with
+    ``flock``, so that every process using the same file shares the
+    quota. Otherwise they are shared by the threads of this process.
+    """
+
+    HEADER = struct.Struct('<4sI')  # magic, number of slots
+    SLOT = struct.Struct('<16sdd')  # key digest, tokens, updated at
+    MAGIC = b'GLRL'
+    EMPTY = b'\x00' * 16
+
+    def __init__(self, rate=None, rates=None, burst=1, path=None,
+                 slots=256):
+        # type: (Optional[float], Optional[Dict[str,float]], float, Optional[str], int) -> None  # NOQA
+        if burst < 1:
+            raise ValueError('burst must be 1 or more.')
+        self.rate = rate  # type: Optional[float]
+        self.rates = dict(rates or {})  # type: Dict[str,float]
+        self.burst = burst  # type: float
+        self.path = path  # type: Optional[str]
+        self.slots = slots  # type: int
+        self.acquired = 0  # type: int
+        self.delayed = 0  # type: int
+        self.wait_time = 0.0  # type: float
+        self._lock = threading.Lock()
+        self._fd = None  # type: Optional[int]
+
+        size = self.HEADER.size + self.SLOT.size * slots
+        if path is None:
+            self._buf = mmap.mmap(-1, size)
+            return
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        with self._file_lock():
+            if os.fstat(self._fd).st_size == 0:
+                os.write(self._fd, self.HEADER.pack(self.MAGIC, slots))
+                os.ftruncate(self._fd, size)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                magic, self.slots = self.HEADER.unpack(
+                    os.read(self._fd, self.HEADER.size))
+                if magic != self.MAGIC:
+                    raise ValueError(
+                        '{0} is not a rate limiter file.'.format(path))
+                size = self.HEADER.size + self.SLOT.size * self.slots
+        self._buf = mmap.mmap(self._fd, size)
+
+    def __getstate__(self):
+        # type: () -> Dict[str,Any]
+        return {'rate': self.rate, 'rates': self.rates, 'burst': self.burst,
+                'path': self.path, 'slots': self.slots}
+
+    def __setstate__(self, state):
+        # type: (Dict[str,Any]) -> None
+        self.__init__(**state)
+
+    def acquire(self, app_id, func, deadline=None):
+        # type: (unicode, unicode, Optional[float]) -> float
+        """ Block until a request of ``func`` may be sent.
+
+        Returns the number of seconds waited. Raises
+        :class:`goolabs.deadline.DeadlineExceeded` if the request could not
+        be sent before ``deadline`` (a :func:`time.time` value).
+        """
+        wait = self.reserve(app_id, func, max_wait=remaining(deadline))
+        if wait is None:
+            raise DeadlineExceeded('Deadline exceeded.')
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def reserve(self, app_id, func, max_wait=None):
+        # type: (unicode, unicode, Optional[float]) -> Optional[float]
+        """ Take a token of ``func`` and return the seconds to wait
+        before sending the request.
+
+        If the wait would be longer than ``max_wait``, no token is taken
+        and None is returned.
+        """
+        buckets = []  # type: List[Tuple[unicode,float]]
+        if self.rate:
+            buckets.append((app_id, self.rate))
+        if self.rates.get(func):
+            buckets.append((u'{0}:{1}'.format(app_id, func), self.rates[func]))
+        if not buckets:
+            return 0.0
+
+        now = time.time()
+        with self._lock, self._file_lock():
+            slots = [self._find(key, rate, now) for key, rate in buckets]
+            # A negative balance is a reservation of a future token.
+            wait = max(max((1 - tokens) / rate, 0.0)
+                       for (_, _, tokens), (_, rate) in zip(slots, buckets))
+            if max_wait is not None and wait > max_wait:
+                return None
+            for pos, digest, tokens in slots:
+                self.SLOT.pack_into(self._buf, pos, digest, tokens - 1, now)
+            self.acquired += 1
+            if wait > 0:
+                self.delayed += 1
+                self.wait_time += wait
+        return wait
+
+    def stats(self):
+        # type: () -> Dict[str,Any]
+        with self._lock:
+            return {'acquired': self.acquired, 'delayed': self.delayed,
+                    'wait_time': self.wait_time}
+
+    def close(self):
+        # type: () -> None
+        self._buf.close()
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _find(self, key, rate, now):
+        # type: (unicode, float, float) -> Tuple[int,bytes,float]
+        digest = hashlib.md5(key.encode('utf-8')).digest()
+        start = struct.unpack('<Q', digest[:8])[0] % self.slots
+        for i in range(self.slots):
+            index = (start + i) % self.slots
+            pos = self.HEADER.size + self.SLOT.size * index
+            slot_key, tokens, updated = self.SLOT.unpack_from(self._buf, pos)
+            if slot_key == digest:
+                elapsed = max(now - updated, 0)
+                tokens = min(self.burst, tokens + elapsed * rate)
+                break
+            if slot_key == self.EMPTY:
+                tokens = self.burst
+                break
+        else:
+            raise RuntimeError('The rate limiter has no free slot.')
+        return pos, digest, tokens
+
+    @contextlib.contextmanager
+    def _file_lock(self):
+        # type: () -> Iterator[None]
+        if self._fd is None or fcntl is None:
+            yield
+            return
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+    Retry policy for Goo labs API
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import email.utils
+import random
+import threading
+import time
+
+import requests
+
+from goolabs.deadline import DeadlineExceeded, remaining
+
+if 0:
+    from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Type  # NOQA
+
+
+def parse_retry_after(value, now=None):
+    # type: (Optional[str], Optional[float]) -> Optional[float]
+    """ Return the seconds to wait from a ``Retry-After`` header value,
+    which is either seconds or an HTTP date.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    parsed = email.utils.parsedate_tz(value)
+    if parsed is None:
+        return None
+    now = time.time() if now is None else now
+    return max(email.utils.mktime_tz(parsed) - now, 0.0)
+
+
+class RetryPolicy(object):
+    """ Retry failed requests with exponential backoff and full jitter.
+
+    A request is tried at most ``max_attempts`` times. Before the n-th
+    retry it waits a random time between 0 and
+    ``min(max_backoff, backoff * 2 ** (n - 1))`` seconds, or the time
+    given by the ``Retry-After`` header of the response.
+    """
+
+    STATUSES = (429, 500, 502, 503, 504)
+    EXCEPTIONS = (requests.ConnectionError, requests.Timeout)
+
+    def __init__(self, max_attempts=3, backoff=0.5, max_backoff=30,
+                 statuses=None, exceptions=None, retry_after=True):
+        # type: (int, float, float, Optional[Iterable[int]], Optional[Tuple[Type[Exception],...]], bool) -> None  # NOQA
+        if max_attempts < 1:
+            raise ValueError('max_attempts must be 1 or more.')
+        self.max_attempts = max_attempts  # type: int
+        self.backoff = backoff  # type: float
+        self.max_backoff = max_backoff  # type: float
+        self.statuses = frozenset(self.STATUSES if statuses is None
+                                  else statuses)
+        self.exceptions = (self.EXCEPTIONS if exceptions is None
+                           else tuple(exceptions))
+        self.retry_after = retry_after  # type: bool
+        self._lock = threading.Lock()
+        self._counts = {'retries': 0, 'gave_up': 0}  # type: Dict[str,int]
+        self._backoff_time = 0.0  # type: float
+
+    def __getstate__(self):
+        # type: () -> Dict[str,Any]
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        # type: (Dict[str,Any]) -> None
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def call(self, func, *args, **kwargs):
+        # type: (Callable, *Any, **Any) -> Any
+        """ Call ``func(*args)`` until it succeeds or the error is not
+        retryable or no attempt is left.
+
+        With ``deadline`` (a :func:`time.time` value), it stops retrying
+        with :class:`goolabs.deadline.DeadlineExceeded` instead of waiting
+        beyond the deadline.
+        """
+        deadline = kwargs.pop('deadline', None)
+        attempt = 1
+        while True:
+            try:
+                return func(*args)
+            except Exception as e:
+                if not self.is_retryable(e):
+                    raise
+                if attempt >= self.max_attempts:
+                    self._count('gave_up')
+                    raise
+                delay = self.get_delay(attempt, e)
+                left = remaining(deadline)
+                if left is not None and left <= delay:
+                    self._count('gave_up')
+                    raise DeadlineExceeded('Deadline exceeded.')
+
+            with self._lock:
+                self._counts['retries'] += 1
+                self._backoff_time += delay
+            time.sleep(delay)
+            attempt += 1
+
+    def is_retryable(self, error):
+        # type: (Exception) -> bool
+        if isinstance(error, DeadlineExceeded):
+            return False
+        if isinstance(error, requests.HTTPError):
+            response = error.response
+            return (response is not None and
+                    response.status_code in self.statuses)
+        return isinstance(error, self.exceptions)
+
+    def get_delay(self, attempt, error=None):
+        # type: (int, Optional[Exception]) -> float
+        """ Return the seconds to wait before the next attempt. """
+        response = getattr(error, 'response', None)
+        if self.retry_after and response is not None:
+            delay = parse_retry_after(response.headers.get('Retry-After'))
+            if delay is not None:
+                return delay
+        cap = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        return random.uniform(0, cap)
+
+    def stats(self):
+        # type: () -> Dict[str,Any]
+        with self._lock:
+            stats = dict(self._counts)  # type: Dict[str,Any]
+            stats['backoff_time'] = self._backoff_time
+        return stats
+
+    def _count(self, name):
+        # type: (str) -> None
+        with self._lock:
+            self._counts[name] += 1
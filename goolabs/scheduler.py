@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+    Priority scheduler for Goo labs API calls
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import collections
+import contextlib
+import threading
+import time
+
+from goolabs.deadline import DeadlineExceeded, remaining
+
+if 0:
+    from typing import Any, Deque, Dict, Iterator, Optional, Set  # NOQA
+
+
+class _Class(object):
+
+    def __init__(self, weight):
+        # type: (float) -> None
+        self.weight = weight  # type: float
+        self.queue = collections.deque()  # type: Deque[object]
+        self.virtual_time = 0.0  # type: float
+        self.dispatched = 0  # type: int
+        self.wait_time = 0.0  # type: float
+        self.max_wait = 0.0  # type: float
+
+
+class PriorityScheduler(object):
+    """ Share ``slots`` concurrent requests among priority classes.
+
+    Each class has its own queue. When a slot is free, the queued call of
+    the class with the least weighted service goes first (stride
+    scheduling), so a class with weight 10 is dispatched 10 times as
+    often as a class with weight 1 while both are waiting, and no class
+    starves.
+    """
+
+    WEIGHTS = {'interactive': 10, 'bulk': 1}
+
+    def __init__(self, slots=4, weights=None, default='bulk'):
+        # type: (int, Optional[Dict[str,float]], str) -> None
+        if slots < 1:
+            raise ValueError('slots must be 1 or more.')
+        weights = self.WEIGHTS if weights is None else weights
+        if default not in weights:
+            raise ValueError('Unknown priority "{0}".'.format(default))
+        self.slots = slots  # type: int
+        self.weights = dict(weights)  # type: Dict[str,float]
+        self.default = default  # type: str
+        self._init_state()
+
+    def _init_state(self):
+        # type: () -> None
+        self._cond = threading.Condition()
+        self._classes = dict(
+            (name, _Class(weight)) for name, weight in self.weights.items()
+        )  # type: Dict[str,_Class]
+        self._granted = set()  # type: Set[object]
+        self._running = 0  # type: int
+        self._virtual_time = 0.0  # type: float
+
+    def __getstate__(self):
+        # type: () -> Dict[str,Any]
+        return {'slots': self.slots, 'weights': self.weights,
+                'default': self.default}
+
+    def __setstate__(self, state):
+        # type: (Dict[str,Any]) -> None
+        self.__init__(**state)
+
+    @contextlib.contextmanager
+    def slot(self, priority=None, deadline=None):
+        # type: (Optional[str], Optional[float]) -> Iterator[None]
+        """ Hold a slot while the block runs. """
+        self.acquire(priority, deadline)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def acquire(self, priority=None, deadline=None):
+        # type: (Optional[str], Optional[float]) -> float
+        """ Wait for a slot. Returns the seconds waited.
+
+        Raises :class:`goolabs.deadline.DeadlineExceeded` if no slot is
+        given before ``deadline`` (a :func:`time.time` value).
+        """
+        priority = priority or self.default
+        klass = self._classes.get(priority)
+        if klass is None:
+            raise ValueError('Unknown priority "{0}".'.format(priority))
+
+        started = time.time()
+        ticket = object()
+        with self._cond:
+            if not klass.queue:
+                # An idle class does not save up its share.
+                klass.virtual_time = max(klass.virtual_time,
+                                         self._virtual_time)
+            klass.queue.append(ticket)
+            self._dispatch()
+            while ticket not in self._granted:
+                try:
+                    self._cond.wait(remaining(deadline))
+                except DeadlineExceeded:
+                    klass.queue.remove(ticket)
+                    raise
+            self._granted.discard(ticket)
+
+            waited = time.time() - started
+            klass.wait_time += waited
+            klass.max_wait = max(klass.max_wait, waited)
+        return waited
+
+    def release(self):
+        # type: () -> None
+        with self._cond:
+            self._running -= 1
+            self._dispatch()
+
+    def stats(self):
+        # type: () -> Dict[str,Any]
+        with self._cond:
+            stats = {'running': self._running}  # type: Dict[str,Any]
+            for name, klass in self._classes.items():
+                stats[name] = {
+                    'queued': len(klass.queue),
+                    'dispatched': klass.dispatched,
+                    'wait_time': klass.wait_time,
+                    'max_wait': klass.max_wait,
+                }
+        return stats
+
+    def _dispatch(self):
+        # type: () -> None
+        notify = False
+        while self._running < self.slots:
+            waiting = [k for k in self._classes.values() if k.queue]
+            if not waiting:
+                break
+            klass = min(waiting, key=lambda k: (k.virtual_time, -k.weight))
+            self._virtual_time = klass.virtual_time
+            klass.virtual_time += 1 / klass.weight
+            klass.dispatched += 1
+            self._granted.add(klass.queue.popleft())
+            self._running += 1
+            notify = True
+        if notify:
+            self._cond.notify_all()
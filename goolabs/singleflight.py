@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+    Coalescing of identical in-flight requests
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import copy
+import json
+import threading
+
+from goolabs.deadline import DeadlineExceeded, remaining
+
+if 0:
+    from typing import Any, Callable, Dict, Optional  # NOQA
+
+
+def flight_key(func, payload):
+    # type: (str, Dict[str,Any]) -> str
+    """ Make a key of an API call. Calls with the same key are identical. """
+    data = dict((k, v) for k, v in payload.items() if k != 'app_id')
+    return '{0}:{1}'.format(func, json.dumps(data, sort_keys=True))
+
+
+class _Call(object):
+
+    def __init__(self):
+        # type: () -> None
+        self.event = threading.Event()
+        self.result = None  # type: Any
+        self.error = None  # type: Optional[BaseException]
+        self.waiters = 0  # type: int
+
+
+class SingleFlight(object):
+    """ Share one execution among the threads calling with the same key. """
+
+    def __init__(self):
+        # type: () -> None
+        self.calls = 0  # type: int
+        self.collapsed = 0  # type: int
+        self._lock = threading.Lock()
+        self._calls = {}  # type: Dict[str,_Call]
+
+    def do(self, key, func, *args, **kwargs):
+        # type: (str, Callable, *Any, **Any) -> Any
+        """ Call ``func(*args)``, or wait for the running call of ``key``.
+
+        Waiting callers get a copy of the result or the same exception.
+        If the running call exceeded its own deadline, one of them runs
+        the call again instead. They stop waiting at ``deadline`` (a
+        :func:`time.time` value) with
+        :class:`goolabs.deadline.DeadlineExceeded`.
+        """
+        deadline = kwargs.pop('deadline', None)
+        with self._lock:
+            self.calls += 1
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+                else:
+                    call.waiters += 1
+            if leader:
+                break
+
+            while not call.event.wait(remaining(deadline)):
+                pass
+            if isinstance(call.error, DeadlineExceeded):
+                # The deadline of the leader, not ours. Take over the
+                # call if we still have time.
+                remaining(deadline)
+                continue
+            with self._lock:
+                self.collapsed += 1
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = func(*args)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            if call.waiters:
+                # The leader may modify the result after returning it.
+                call.result = copy.deepcopy(call.result)
+            call.event.set()
+
+    def stats(self):
+        # type: () -> Dict[str,int]
+        with self._lock:
+            return {'calls': self.calls, 'collapsed': self.collapsed}
@@ -38,6 +38,7 @@ requires = [
     'requests',
     'six',
     'click',
+    'futures; python_version < "3"',
 ]
 
 tests_require = [
@@ -52,6 +53,13 @@ if sys.version_info < (2, 7):
 else:
     tests_require.append('mock')
 
+if sys.version_info >= (3, 5):
+    tests_require.append('aioresponses')
+
+extras_require = {
+    'async': ['aiohttp'],
+}
+
 entry_points = {
     'console_scripts': [
         'goolabs=goolabs.commands:main',
@@ -89,6 +97,7 @@ setup(
     keywords=['goolabs', 'web', 'api', 'client'],
     install_requires=requires,
     tests_require=tests_require,
+    extras_require=extras_require,
     cmdclass={'test': PyTest},
     packages=find_packages(exclude=['tests']),
     entry_points=entry_points,
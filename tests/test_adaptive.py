@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+    unittest for AdaptiveLimit
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import pickle
+
+import mock
+import pytest
+import requests
+
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(response=response)
+
+
+class TestAdaptiveLimit(object):
+
+    def _get_target_class(self):
+        from goolabs.adaptive import AdaptiveLimit
+        return AdaptiveLimit
+
+    def _make_one(self, *args, **kwargs):
+        return self._get_target_class()(*args, **kwargs)
+
+    def test_initial(self):
+        assert self._make_one(initial=4).limit == 4
+        assert self._make_one(initial=100, max_limit=8).limit == 8
+        assert self._make_one(initial=0, min_limit=2).limit == 2
+
+    def test_additive_increase(self):
+        limiter = self._make_one(initial=2, max_limit=4)
+        # 2 -> 2.5 -> 2.9 -> 3.24
+        for _ in range(3):
+            limiter.record(0, 0.1)
+        assert limiter.limit == 3
+        for _ in range(3):
+            limiter.record(0, 0.1)
+        assert limiter.limit == 4
+        for _ in range(10):
+            limiter.record(0, 0.1)
+        assert limiter.limit == 4
+
+    @mock.patch('goolabs.adaptive.time.time', return_value=10.0)
+    def test_multiplicative_decrease(self, m):
+        limiter = self._make_one(initial=16)
+        limiter.record(5, 0.1, http_error(429))
+        assert limiter.limit == 8
+        # calls started before the decrease do not decrease it again.
+        limiter.record(5, 0.1, requests.Timeout())
+        assert limiter.limit == 8
+
+        limiter.record(10, 0.1, http_error(503))
+        assert limiter.limit == 4
+        assert limiter.stats()['decreases'] == 2
+
+        m.return_value = 20.0
+        for _ in range(5):
+            limiter.record(20, 0.1, http_error(429))
+        assert limiter.limit == 1
+
+    def test_ignore_other_errors(self):
+        limiter = self._make_one(initial=4)
+        limiter.record(0, 0.1, http_error(400))
+        limiter.record(0, 0.1, ValueError())
+        assert limiter.stats() == {
+            'limit': 4, 'decreases': 0, 'latency': None}
+
+    @mock.patch('goolabs.adaptive.time.time', return_value=10.0)
+    def test_latency_spike(self, m):
+        limiter = self._make_one(initial=8, latency_factor=2.0,
+                                 smoothing=0.5)
+        limiter.record(10, 1.0)
+        limiter.record(10, 1.0)
+        assert limiter.stats()['latency'] == 1.0
+        limiter.record(10, 2.5)
+        assert limiter.limit == 4
+        assert limiter.stats()['latency'] == 1.75
+
+        limiter = self._make_one(initial=8, latency_threshold=3,
+                                 latency_factor=None)
+        limiter.record(10, 3.0)
+        assert limiter.limit == 4
+
+    def test_call(self):
+        limiter = self._make_one(initial=2)
+        with mock.patch.object(limiter, 'record') as record:
+            assert limiter.call(lambda x: x * 2, 2) == 4
+            assert record.call_args[0][2:] == ()
+
+            error = requests.Timeout()
+            with pytest.raises(requests.Timeout):
+                limiter.call(mock.Mock(side_effect=error))
+            assert record.call_args[0][2] is error
+
+    def test_pickle(self):
+        limiter = pickle.loads(pickle.dumps(self._make_one(initial=3)))
+        assert limiter.limit == 3
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+    unittest for AsyncGoolabsAPI
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import pytest
+
+aioresponses = pytest.importorskip('aioresponses')
+
+
+class TestAsyncGoolabsAPI(object):
+
+    def _get_target_class(self):
+        from goolabs.aio import AsyncGoolabsAPI
+        return AsyncGoolabsAPI
+
+    def _make_one(self, *args, **kwargs):
+        return self._get_target_class()(*args, **kwargs)
+
+    def _run(self, api, *coros):
+        import asyncio
+
+        loop = asyncio.new_event_loop()
+        try:
+            tasks = [loop.create_task(coro) for coro in coros]
+            loop.run_until_complete(asyncio.wait(tasks))
+            return [task.result() for task in tasks]
+        finally:
+            loop.run_until_complete(api.close())
+            loop.close()
+
+    def test_morph(self):
+        expected = {
+            'word_list': [[[u'日本語', u'名詞', u'ニホンゴ']]],
+            'request_id': 'morph-req001'
+        }
+        api = self._make_one('dummy')
+        with aioresponses.aioresponses() as m:
+            m.post('https://labs.goo.ne.jp/api/morph', payload=expected)
+            actual, = self._run(api, api.morph(sentence=u'日本語'))
+
+        assert expected == actual
+        (method, url), calls = list(m.requests.items())[0]
+        assert calls[0].kwargs['data'] == (
+            u'{"sentence":"日本語","app_id":"dummy"}'.encode('utf-8'))
+
+    def test_all_apis(self):
+        api = self._make_one('dummy')
+        with aioresponses.aioresponses() as m:
+            for name in api.API_NAMES:
+                m.post('https://labs.goo.ne.jp/api/{0}'.format(name),
+                       payload={'api': name})
+            actual = self._run(
+                api, *[getattr(api, name)() for name in api.API_NAMES])
+
+        assert actual == [{'api': name} for name in api.API_NAMES]
+
+    def test_shared_session(self):
+        api = self._make_one('dummy', concurrency=2)
+        with aioresponses.aioresponses() as m:
+            m.post('https://labs.goo.ne.jp/api/hiragana',
+                   payload={'converted': u'にほんご'}, repeat=True)
+            self._run(api, *[api.hiragana(sentence=u'日本語')
+                             for _ in range(5)])
+            assert len(list(m.requests.values())[0]) == 5
+        assert api._semaphore._value == 2
+        assert api._session is None
+
+    def test_bad_request(self):
+        import aiohttp
+
+        api = self._make_one('dummy')
+        with aioresponses.aioresponses() as m:
+            m.post('https://labs.goo.ne.jp/api/morph', status=400)
+            with pytest.raises(aiohttp.ClientResponseError) as e:
+                self._run(api, api.morph())
+        assert e.value.status == 400
+
+    def test_non_exists_api(self):
+        api = self._make_one('dummy')
+        with pytest.raises(AttributeError) as e:
+            api.non_exists_api()
+
+        emsg = 'Cannot access or call this attribute "non_exists_api"'
+        assert str(e.value) == emsg
+
+    def test_single_flight(self):
+        import asyncio
+
+        api = self._make_one('dummy', single_flight=True)
+        calls = []
+
+        def request(func, payload):
+            calls.append(func)
+            return asyncio.sleep(0.01, result={'ne_list': []})
+        api._request = request
+
+        actual = self._run(api, *[api.entity(sentence=u'a')
+                                  for _ in range(3)])
+
+        assert actual == [{'ne_list': []}] * 3
+        assert calls == ['entity']
+        assert api.stats() == {'single_flight': {'calls': 3, 'collapsed': 2}}
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+    unittest for CircuitBreaker
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import pickle
+
+import mock
+import pytest
+import requests
+
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(response=response)
+
+
+class TestCircuitBreaker(object):
+
+    def _get_target_class(self):
+        from goolabs.breaker import CircuitBreaker
+        return CircuitBreaker
+
+    def _make_one(self, *args, **kwargs):
+        return self._get_target_class()(*args, **kwargs)
+
+    def _fail(self, breaker, name, times=1):
+        for _ in range(times):
+            with pytest.raises(requests.RequestException):
+                breaker.call(name, mock.Mock(side_effect=http_error(502)))
+
+    def test_is_failure(self):
+        breaker = self._make_one()
+        assert breaker.is_failure(http_error(500))
+        assert breaker.is_failure(requests.Timeout())
+        assert breaker.is_failure(requests.HTTPError())
+        assert not breaker.is_failure(http_error(400))
+        assert not breaker.is_failure(ValueError())
+
+    @mock.patch('goolabs.breaker.time.time', return_value=100.0)
+    def test_open_by_failure_rate(self, m):
+        from goolabs.breaker import CircuitOpenError
+
+        hook = mock.Mock()
+        breaker = self._make_one(failure_rate=0.75, window=4, min_calls=4,
+                                 on_state_change=hook)
+        assert breaker.call('shortsum', lambda: 'ok') == 'ok'
+        self._fail(breaker, 'shortsum', 2)
+        assert breaker.state('shortsum') == 'closed'
+        # client errors are not failures.
+        with pytest.raises(requests.HTTPError):
+            breaker.call('shortsum', mock.Mock(side_effect=http_error(400)))
+        self._fail(breaker, 'shortsum')
+        assert breaker.state('shortsum') == 'open'
+        hook.assert_called_once_with('shortsum', 'closed', 'open')
+
+        func = mock.Mock()
+        with pytest.raises(CircuitOpenError) as e:
+            breaker.call('shortsum', func)
+        assert not func.called
+        assert e.value.name == 'shortsum'
+        assert e.value.retry_after == 30
+
+        # other endpoints are not affected.
+        assert breaker.call('morph', lambda: 'ok') == 'ok'
+        assert breaker.stats() == {
+            'opened': 1, 'rejected': 1,
+            'states': {'shortsum': 'open', 'morph': 'closed'}}
+
+    def test_open_by_latency(self):
+        breaker = self._make_one(slow_call_duration=5, slow_call_rate=0.5,
+                                 window=2, min_calls=2)
+        with mock.patch('goolabs.breaker.time.time',
+                        side_effect=[0, 1, 10, 16, 16]):
+            breaker.call('morph', lambda: 'ok')
+            assert breaker.state('morph') == 'closed'
+            breaker.call('morph', lambda: 'ok')
+        assert breaker.state('morph') == 'open'
+
+    @mock.patch('goolabs.breaker.time.time', return_value=100.0)
+    def test_half_open(self, m):
+        from goolabs.breaker import CircuitOpenError
+
+        hook = mock.Mock()
+        breaker = self._make_one(window=1, min_calls=1, reset_timeout=10,
+                                 on_state_change=hook)
+        self._fail(breaker, 'morph')
+        assert breaker.state('morph') == 'open'
+
+        # a failed trial opens the circuit again.
+        m.return_value = 110.0
+        self._fail(breaker, 'morph')
+        assert breaker.state('morph') == 'open'
+
+        m.return_value = 120.0
+        breaker.before('morph')
+        assert breaker.state('morph') == 'half_open'
+        # only one trial at once.
+        with pytest.raises(CircuitOpenError):
+            breaker.before('morph')
+        breaker.record('morph', 0.1)
+        assert breaker.state('morph') == 'closed'
+
+        assert hook.call_args_list == [
+            mock.call('morph', 'closed', 'open'),
+            mock.call('morph', 'open', 'half_open'),
+            mock.call('morph', 'half_open', 'open'),
+            mock.call('morph', 'open', 'half_open'),
+            mock.call('morph', 'half_open', 'closed'),
+        ]
+
+    @mock.patch('goolabs.breaker.time.time', return_value=100.0)
+    def test_deadline_is_not_an_outcome(self, m):
+        from goolabs.deadline import DeadlineExceeded
+
+        def timeout():
+            raise DeadlineExceeded('Deadline exceeded.')
+
+        # not a healthy call in the window.
+        breaker = self._make_one(window=2, min_calls=2)
+        self._fail(breaker, 'morph')
+        for _ in range(3):
+            with pytest.raises(DeadlineExceeded):
+                breaker.call('morph', timeout)
+        self._fail(breaker, 'morph')
+        assert breaker.state('morph') == 'open'
+
+        # a trial stopped by the deadline neither closes the circuit nor
+        # uses up the trial.
+        breaker = self._make_one(window=1, min_calls=1, reset_timeout=10)
+        self._fail(breaker, 'morph')
+        m.return_value = 110.0
+        with pytest.raises(DeadlineExceeded):
+            breaker.call('morph', timeout)
+        assert breaker.state('morph') == 'half_open'
+        assert breaker.call('morph', lambda: 'ok') == 'ok'
+        assert breaker.state('morph') == 'closed'
+
+    def test_pickle(self):
+        breaker = self._make_one(window=1, min_calls=1)
+        self._fail(breaker, 'morph')
+        restored = pickle.loads(pickle.dumps(breaker))
+        assert restored.state('morph') == 'open'
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+    unittest for response cache
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import mock
+
+
+class TestCacheKey(object):
+
+    def _call_fut(self, func, payload):
+        from goolabs.cache import cache_key
+        return cache_key(func, payload)
+
+    def test_normalize(self):
+        key = self._call_fut('morph', {'sentence': u'ＡＢＣ'})
+        assert key.startswith('morph:')
+        assert key == self._call_fut('morph', {'sentence': u'ABC'})
+        assert key != self._call_fut('hiragana', {'sentence': u'ABC'})
+        assert key != self._call_fut('morph', {'sentence': u'ABD'})
+
+    def test_ignored_keys(self):
+        assert self._call_fut('morph', {'sentence': u'a'}) == self._call_fut(
+            'morph', {'sentence': u'a', 'app_id': 'x', 'request_id': 'y'})
+
+    def test_nested(self):
+        assert self._call_fut(
+            'similarity', {'query_pair': [u'ｗｉｎｄｏｗｓ', u'a']}
+        ) == self._call_fut('similarity', {'query_pair': (u'windows', u'a')})
+
+
+class TestLRUCache(object):
+
+    def _make_one(self, *args, **kwargs):
+        from goolabs.cache import LRUCache
+        return LRUCache(*args, **kwargs)
+
+    def test_eviction(self):
+        cache = self._make_one(2)
+        cache.set('a', (None, '1'))
+        cache.set('b', (None, '2'))
+        assert cache.get('a') == (None, '1')
+        cache.set('c', (None, '3'))
+
+        assert cache.get('b') is None
+        assert cache.get('a') == (None, '1')
+        assert cache.get('c') == (None, '3')
+        assert cache.evictions == 1
+
+
+class TestResponseCache(object):
+
+    def _make_one(self, *args, **kwargs):
+        from goolabs.cache import ResponseCache
+        return ResponseCache(*args, **kwargs)
+
+    def test_memory(self):
+        cache = self._make_one()
+        assert cache.get('morph', {'sentence': u'a'}) is None
+        cache.set('morph', {'sentence': u'a'}, {'word_list': []})
+        assert cache.get('morph', {'sentence': u'a'}) == {'word_list': []}
+        assert cache.stats() == {
+            'hits': 1, 'memory_hits': 1, 'disk_hits': 0, 'stale_hits': 0,
+            'misses': 1, 'sets': 1, 'expirations': 0, 'revalidations': 0,
+            'revalidation_errors': 0, 'evictions': 0, 'memory_size': 1,
+        }
+
+    def test_disk_shared(self, tmpdir):
+        path = str(tmpdir.join('cache.sqlite3'))
+        writer = self._make_one(path)
+        writer.set('entity', {'sentence': u'a'}, {'ne_list': [[u'a', 'b']]})
+
+        reader = self._make_one(path)
+        assert reader.get('entity', {'sentence': u'a'}) == {
+            'ne_list': [[u'a', 'b']]}
+        assert reader.get('entity', {'sentence': u'a'}) == {
+            'ne_list': [[u'a', 'b']]}
+        assert reader.stats()['disk_hits'] == 1
+        assert reader.stats()['memory_hits'] == 1
+
+    def test_ttl(self, tmpdir):
+        cache = self._make_one(str(tmpdir.join('cache.sqlite3')),
+                               ttl=10, ttls={'chrono': 0})
+        with mock.patch('goolabs.cache.time.time', return_value=100):
+            cache.set('morph', {'sentence': u'a'}, {'word_list': []})
+            cache.set('chrono', {'sentence': u'a'}, {'datetime_list': []})
+            assert cache.get('chrono', {'sentence': u'a'}) is None
+        with mock.patch('goolabs.cache.time.time', return_value=105):
+            assert cache.get('morph', {'sentence': u'a'}) == {'word_list': []}
+        with mock.patch('goolabs.cache.time.time', return_value=110):
+            assert cache.get('morph', {'sentence': u'a'}) is None
+
+        assert cache.stats()['expirations'] == 1
+        assert len(cache.disk) == 0
+
+    def test_pickle(self, tmpdir):
+        import pickle
+
+        cache = self._make_one(str(tmpdir.join('cache.sqlite3')), maxsize=5)
+        cache.set('morph', {'sentence': u'a'}, {'word_list': []})
+        restored = pickle.loads(pickle.dumps(cache))
+
+        assert restored.memory.maxsize == 5
+        assert restored.get('morph', {'sentence': u'a'}) == {'word_list': []}
+        assert restored.stats()['disk_hits'] == 1
+
+
+class TestBloomFilter(object):
+
+    def _make_one(self, *args, **kwargs):
+        from goolabs.cache import BloomFilter
+        return BloomFilter(*args, **kwargs)
+
+    def test_memory(self):
+        bloom = self._make_one(capacity=1000, error_rate=0.01)
+        keys = ['morph:{0}'.format(i) for i in range(1000)]
+        for key in keys:
+            bloom.add(key)
+
+        assert all(key in bloom for key in keys)
+        false_positives = sum(1 for i in range(1000)
+                              if 'entity:{0}'.format(i) in bloom)
+        assert false_positives < 50
+
+    def test_shared_file(self, tmpdir):
+        path = str(tmpdir.join('cache.bloom'))
+        first = self._make_one(path, capacity=100)
+        second = self._make_one(path, capacity=999)
+        assert first.created and not second.created
+        assert (second.bits, second.hashes) == (first.bits, first.hashes)
+
+        first.add('morph:a')
+        assert 'morph:a' in second
+        assert 'morph:b' not in second
+
+    def test_invalid_file(self, tmpdir):
+        import pytest
+
+        path = tmpdir.join('broken.bloom')
+        path.write(b'x' * 100, mode='wb')
+        with pytest.raises(ValueError):
+            self._make_one(str(path))
+
+
+class TestSQLiteCache(object):
+
+    def _make_one(self, *args, **kwargs):
+        from goolabs.cache import SQLiteCache
+        return SQLiteCache(*args, **kwargs)
+
+    def test_bloom_negatives(self, tmpdir):
+        cache = self._make_one(str(tmpdir.join('cache.sqlite3')))
+        cache.set_many([('morph:a', (None, '{}')), ('morph:b', (None, '[]'))])
+
+        assert cache.get('morph:a') == (None, '{}')
+        assert cache.get('morph:c') is None
+        assert cache.bloom_negatives == 1
+
+    def test_rebuild_bloom(self, tmpdir):
+        path = str(tmpdir.join('cache.sqlite3'))
+        self._make_one(path, bloom_capacity=None).set('morph:a', (None, '{}'))
+
+        cache = self._make_one(path)
+        assert cache.bloom.created
+        assert cache.get('morph:a') == (None, '{}')
+
+    def test_without_bloom(self, tmpdir):
+        cache = self._make_one(str(tmpdir.join('cache.sqlite3')),
+                               bloom_capacity=None)
+        assert cache.bloom is None
+        assert cache.get('morph:a') is None
+        assert not tmpdir.join('cache.sqlite3.bloom').exists()
+
+
+class TestSnapshot(object):
+
+    def _make_store(self, path):
+        from goolabs.cache import SQLiteCache
+        return SQLiteCache(path)
+
+    def test_skip_expired(self, tmpdir):
+        from goolabs.cache import dump_snapshot, load_snapshot
+
+        src = self._make_store(str(tmpdir.join('src.sqlite3')))
+        src.set_many([('morph:a', (None, '{}')), ('morph:b', (50.0, '{}')),
+                      ('morph:c', (200.0, '{}'))])
+        snapshot = str(tmpdir.join('snapshot.gz'))
+        with mock.patch('goolabs.cache.time.time', return_value=100):
+            assert dump_snapshot(src, snapshot) == 2
+
+        dest = self._make_store(str(tmpdir.join('dest.sqlite3')))
+        with mock.patch('goolabs.cache.time.time', return_value=300):
+            assert load_snapshot(dest, snapshot) == 1
+        assert list(dest.keys()) == ['morph:a']
+
+
+class TestStaleResponse(object):
+
+    def _make_one(self, *args, **kwargs):
+        from goolabs.cache import ResponseCache
+        return ResponseCache(*args, **kwargs)
+
+    def test_max_stale(self, tmpdir):
+        cache = self._make_one(str(tmpdir.join('cache.sqlite3')), ttl=10,
+                               stale_if_error=True, max_stale=60)
+        with mock.patch('goolabs.cache.time.time', return_value=100):
+            cache.set('morph', {'sentence': u'a'}, {'word_list': []})
+            assert cache.get('morph', {'sentence': u'a'}).stale is False
+        with mock.patch('goolabs.cache.time.time', return_value=150):
+            ret = cache.get('morph', {'sentence': u'a'})
+            assert ret == {'word_list': []}
+            assert ret.stale is True
+        with mock.patch('goolabs.cache.time.time', return_value=170):
+            assert cache.get('morph', {'sentence': u'a'}) is None
+
+        stats = cache.stats()
+        assert (stats['stale_hits'], stats['expirations']) == (1, 1)
+        assert len(cache.disk) == 0
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+    unittest for chunking
+    ~~~~~~~~~~~~~~~~~~~~~
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import pytest
+
+
+class TestSplitText(object):
+
+    def _call_fut(self, *args, **kwargs):
+        from goolabs.chunking import split_text
+        return split_text(*args, **kwargs)
+
+    def test_sentence_boundaries(self):
+        text = u'今日は晴れ。明日は雨！本当？\n明後日は曇り。'
+        actual = self._call_fut(text, 12)
+        assert actual == [u'今日は晴れ。明日は雨！', u'本当？\n明後日は曇り。']
+        assert u''.join(actual) == text
+
+    def test_short_text(self):
+        assert self._call_fut(u'短い。', 10) == [u'短い。']
+        assert self._call_fut(u'', 10) == []
+
+    def test_long_sentence(self):
+        text = u'あいうえおかきくけこさ。'
+        actual = self._call_fut(text, 5)
+        assert actual == [u'あいうえお', u'かきくけこ', u'さ。']
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            self._call_fut(u'a', 0)
+
+
+class TestMergeResults(object):
+
+    def _call_fut(self, *args, **kwargs):
+        from goolabs.chunking import merge_results
+        return merge_results(*args, **kwargs)
+
+    def test_list(self):
+        results = [
+            {'request_id': 'a', 'ne_list': [[u'太郎', u'PSN']]},
+            {'request_id': 'b', 'ne_list': []},
+            {'request_id': 'c', 'ne_list': [[u'東京', u'LOC']]},
+        ]
+        actual = self._call_fut('entity', results)
+        assert actual == {
+            'request_id': 'a',
+            'ne_list': [[u'太郎', u'PSN'], [u'東京', u'LOC']],
+        }
+        assert results[0]['ne_list'] == [[u'太郎', u'PSN']]
+
+    def test_string(self):
+        results = [
+            {'output_type': 'hiragana', 'converted': u'きょうは '},
+            {'output_type': 'hiragana', 'converted': u'はれ'},
+        ]
+        actual = self._call_fut('hiragana', results)
+        assert actual == {'output_type': 'hiragana',
+                          'converted': u'きょうは はれ'}
@@ -9,7 +9,9 @@
 from __future__ import division, print_function, absolute_import  # NOQA
 import json
 
+import mock
 import pytest
+import requests
 import responses
 
 
@@ -284,3 +286,658 @@ class TestGoolabsAPI(object):
         api = self._make_one('dummy', timeout=60, headers={'dummy': 'dummy'})
         assert api._req_args['timeout'] == 60
         assert 'dummy' in api._req_args['headers']
+
+    @responses.activate
+    def test_session_reused(self):
+        responses.add(
+            responses.POST,
+            'https://labs.goo.ne.jp/api/hiragana',
+            body=json.dumps({'converted': u'にほんご'}),
+            status=200,
+            content_type='application/json'
+        )
+
+        api = self._make_one(self.app_id)
+        api.hiragana(sentence=u'日本語')
+        session = api._session
+        api.hiragana(sentence=u'日本語')
+        assert session is not None
+        assert session is api._session
+
+    def test_pool_options(self):
+        api = self._make_one('dummy', pool_maxsize=32, pool_block=True)
+        adapter = api._get_session().get_adapter('https://labs.goo.ne.jp')
+        assert adapter._pool_maxsize == 32
+        assert adapter._pool_block is True
+        assert 'pool_maxsize' not in api._req_args
+
+    def test_close(self):
+        with self._make_one('dummy') as api:
+            api._get_session()
+            assert api._session is not None
+        assert api._session is None
+
+    def test_pool_stats(self):
+        import mock
+
+        pool = mock.Mock(num_requests=5, num_connections=2)
+        api = self._make_one('dummy')
+        with mock.patch.object(api, '_iter_pools', return_value=[pool]):
+            stats = api.pool_stats()
+        assert stats == {
+            'requests': 5, 'connections': 2, 'hits': 3, 'evictions': 0,
+        }
+
+    def test_idle_eviction(self):
+        import mock
+
+        api = self._make_one('dummy', pool_idle_timeout=10)
+        with mock.patch('goolabs.client.time.time', return_value=100):
+            session = api._get_session()
+        with mock.patch('goolabs.client.time.time', return_value=105):
+            assert session is api._get_session()
+        with mock.patch('goolabs.client.time.time', return_value=120):
+            assert session is not api._get_session()
+        assert api.pool_stats()['evictions'] == 1
+
+    @responses.activate
+    def test_imap(self):
+        def callback(request):
+            payload = json.loads(request.body)
+            return (200, {}, json.dumps({'converted': payload['sentence']}))
+
+        responses.add_callback(
+            responses.POST,
+            'https://labs.goo.ne.jp/api/hiragana',
+            callback=callback,
+            content_type='application/json'
+        )
+
+        api = self._make_one(self.app_id)
+        payloads = ({'sentence': str(i)} for i in range(20))
+        actual = api.imap('hiragana', payloads, workers=4)
+        assert [r['converted'] for r in actual] == [str(i) for i in range(20)]
+
+    @responses.activate
+    def test_chunk_size(self):
+        def callback(request):
+            payload = json.loads(request.body)
+            return (200, {}, json.dumps({
+                'output_type': 'hiragana',
+                'converted': payload['sentence'] + u'|',
+            }))
+
+        responses.add_callback(
+            responses.POST,
+            'https://labs.goo.ne.jp/api/hiragana',
+            callback=callback,
+            content_type='application/json'
+        )
+
+        api = self._make_one(self.app_id)
+        ret = api.hiragana(sentence=u'一。二。三。', chunk_size=4)
+        assert ret == {'output_type': 'hiragana',
+                       'converted': u'一。二。|三。|'}
+        assert len(responses.calls) == 2
+
+        # short text is sent as it is.
+        ret = api.hiragana(sentence=u'一。', chunk_size=4)
+        assert ret['converted'] == u'一。|'
+        assert 'chunk_size' not in json.loads(responses.calls[-1].request.body)
+
+    @mock.patch('goolabs.client.time.time', return_value=100.0)
+    def test_chunk_size_deadline(self, m):
+        from goolabs.deadline import DeadlineExceeded
+
+        api = self._make_one(self.app_id)
+        converted = [{'converted': u'一。'}, {'converted': u'二。'}]
+        with mock.patch.object(api, 'imap',
+                               return_value=iter(converted)) as m:
+            ret = api.hiragana(sentence=u'一。二。', chunk_size=2,
+                               deadline=10, priority='low')
+        assert ret == {'converted': u'一。二。'}
+        # the chunks share one deadline.
+        assert m.call_args[1]['deadline'] == 10.0
+        assert m.call_args[0][1] == [
+            {'sentence': u'一。', 'priority': 'low'},
+            {'sentence': u'二。', 'priority': 'low'},
+        ]
+
+        with mock.patch.object(api, 'imap',
+                               return_value=iter(converted[:1])):
+            with pytest.raises(DeadlineExceeded):
+                api.hiragana(sentence=u'一。二。', chunk_size=2, deadline=10)
+
+    @responses.activate
+    def test_imap_pack(self):
+        def callback(request):
+            payload = json.loads(request.body)
+            return (200, {}, json.dumps({
+                'output_type': 'hiragana',
+                'converted': payload['sentence'].replace(u'日', u'ひ'),
+            }))
+
+        responses.add_callback(
+            responses.POST,
+            'https://labs.goo.ne.jp/api/hiragana',
+            callback=callback,
+            content_type='application/json'
+        )
+
+        api = self._make_one(self.app_id)
+        payloads = [{'sentence': u'日' + str(i)} for i in range(10)]
+        actual = api.imap('hiragana', payloads, pack=4)
+        assert [r['converted'] for r in actual] == [
+            u'ひ' + str(i) for i in range(10)]
+        assert len(responses.calls) == 3
+
+    @responses.activate
+    def test_imap_pack_fallback(self):
+        from goolabs.packing import PackingError
+
+        def callback(request):
+            payload = json.loads(request.body)
+            # the delimiter is lost.
+            return (200, {}, json.dumps({
+                'converted': payload['sentence'].replace(u'〓', u''),
+            }))
+
+        responses.add_callback(
+            responses.POST,
+            'https://labs.goo.ne.jp/api/hiragana',
+            callback=callback,
+            content_type='application/json'
+        )
+
+        api = self._make_one(self.app_id)
+        payloads = [{'sentence': u'a'}, {'sentence': u'b'}]
+        actual = api.imap('hiragana', payloads, pack=2)
+        assert [r['converted'] for r in actual] == [u'a', u'b']
+        assert len(responses.calls) == 3
+
+        with pytest.raises(PackingError):
+            list(api.imap('hiragana', payloads, pack=2, pack_fallback=False))
+
+    @responses.activate
+    def test_imap_on_error(self):
+        url = 'https://labs.goo.ne.jp/api/hiragana'
+        responses.add(responses.POST, url, status=500)
+        responses.add(responses.POST, url, status=200,
+                      body=json.dumps({'converted': u'b'}),
+                      content_type='application/json')
+
+        def on_error(payload, error):
+            return {'sentence': payload['sentence'], 'error': type(error)}
+
+        api = self._make_one(self.app_id)
+        payloads = [{'sentence': u'a'}, {'sentence': u'b'}]
+        actual = list(api.imap('hiragana', payloads, workers=1,
+                               on_error=on_error))
+        assert actual == [
+            {'sentence': u'a', 'error': requests.HTTPError},
+            {'converted': u'b'},
+        ]
+
+        # every sentence of a failed pack gets an error.
+        responses.replace(responses.POST, url, status=500)
+        actual = list(api.imap('hiragana', payloads, pack=2,
+                               on_error=on_error))
+        assert [r['sentence'] for r in actual] == [u'a', u'b']
+
+    def test_imap_non_exists_api(self):
+        api = self._make_one(self.app_id)
+        with pytest.raises(AttributeError):
+            api.imap('non_exists_api', [])
+
+    def test_response_per_thread(self):
+        import threading
+
+        api = self._make_one(self.app_id)
+        api.response = 'main'
+
+        def target():
+            api.response = 'thread'
+        thread = threading.Thread(target=target)
+        thread.start()
+        thread.join()
+        assert api.response == 'main'
+
+    def test_pickle(self):
+        import pickle
+
+        api = self._make_one('dummy', timeout=60, pool_maxsize=4)
+        api._get_session()
+        api.response = 'response'
+
+        restored = pickle.loads(pickle.dumps(api))
+        assert restored._app_id == 'dummy'
+        assert restored._req_args['timeout'] == 60
+        assert restored._pool_maxsize == 4
+        assert restored._session is None
+        with pytest.raises(AttributeError):
+            restored.response
+
+    @responses.activate
+    def test_codec(self):
+        from goolabs.codec import JSONCodec
+
+        responses.add(
+            responses.POST,
+            'https://labs.goo.ne.jp/api/hiragana',
+            body=u'{"converted": "にほんご"}'.encode('utf-8'),
+            content_type='application/json'
+        )
+        codec = JSONCodec()
+        api = self._make_one(self.app_id, codec=codec)
+        with mock.patch.object(codec, 'loads', wraps=codec.loads) as loads:
+            ret = api.hiragana(sentence=u'日本語')
+        assert ret == {'converted': u'にほんご'}
+        assert loads.called
+        assert responses.calls[0].request.body == (
+            u'{"sentence":"日本語","app_id":"%s"}' % self.app_id
+        ).encode('utf-8')
+
+        assert self._make_one(self.app_id, codec='json')._codec.name == 'json'
+
+    @responses.activate
+    def test_raw(self):
+        from goolabs.cache import ResponseCache
+
+        body = u'{"converted": "にほんご"}'.encode('utf-8')
+        responses.add(
+            responses.POST,
+            'https://labs.goo.ne.jp/api/hiragana',
+            body=body,
+            content_type='application/json'
+        )
+        cache = ResponseCache()
+        api = self._make_one(self.app_id, cache=cache)
+        assert api.hiragana(sentence=u'日本語', raw=True) == body
+        # raw calls do not touch the cache.
+        assert cache.stats()['sets'] == 0
+        assert api.hiragana(sentence=u'日本語') == {'converted': u'にほんご'}
+        assert not api._is_raw()
+
+    def test_reset_after_fork(self):
+        import mock
+
+        api = self._make_one('dummy')
+        session = api._get_session()
+        with mock.patch('goolabs.client.os.getpid', return_value=-1):
+            assert session is not api._get_session()
+            assert api._pid == -1
+
+    @responses.activate
+    def test_reset_after_fork_keeps_call_options(self):
+        import mock
+
+        responses.add(responses.POST, 'https://labs.goo.ne.jp/api/hiragana',
+                      body=b'{"converted":"a"}', status=200,
+                      content_type='application/json')
+
+        api = self._make_one('dummy')
+        api._get_session()
+        with mock.patch('goolabs.client.os.getpid', return_value=-1):
+            assert api.hiragana(sentence=u'a', raw=True) == (
+                b'{"converted":"a"}')
+            assert api._pid == -1
+
+    @responses.activate
+    def test_cache(self):
+        from goolabs.cache import ResponseCache
+
+        responses.add(
+            responses.POST,
+            'https://labs.goo.ne.jp/api/hiragana',
+            body=json.dumps({'converted': u'にほんご', 'request_id': 'r1'}),
+            status=200,
+            content_type='application/json'
+        )
+
+        api = self._make_one(self.app_id, cache=ResponseCache())
+        api.hiragana(sentence=u'日本語', request_id='r1')
+        actual = api.hiragana(sentence=u'日本語', request_id='r2')
+
+        assert len(responses.calls) == 1
+        assert actual == {'converted': u'にほんご', 'request_id': 'r2'}
+        assert api._cache.stats()['hits'] == 1
+
+    def _make_stale_cache(self, **kwargs):
+        import mock
+        from goolabs.cache import ResponseCache
+
+        cache = ResponseCache(ttl=10, **kwargs)
+        with mock.patch('goolabs.cache.time.time', return_value=0):
+            cache.set('hiragana', {'sentence': u'日本語'},
+                      {'converted': u'にほんご(stale)'})
+        return cache
+
+    @responses.activate
+    def test_stale_while_revalidate(self):
+        responses.add(
+            responses.POST,
+            'https://labs.goo.ne.jp/api/hiragana',
+            body=json.dumps({'converted': u'にほんご'}),
+            status=200,
+            content_type='application/json'
+        )
+        cache = self._make_stale_cache(stale_while_revalidate=True)
+        api = self._make_one(self.app_id, cache=cache)
+
+        actual = api.hiragana(sentence=u'日本語')
+        assert actual == {'converted': u'にほんご(stale)'}
+        assert actual.stale is True
+
+        api._refresher.shutdown(wait=True)
+        actual = api.hiragana(sentence=u'日本語')
+        assert actual == {'converted': u'にほんご'}
+        assert actual.stale is False
+        assert cache.stats()['revalidations'] == 1
+
+    @responses.activate
+    def test_stale_if_error(self):
+        from requests.exceptions import HTTPError
+
+        responses.add(
+            responses.POST,
+            'https://labs.goo.ne.jp/api/hiragana',
+            status=503,
+        )
+        api = self._make_one(
+            self.app_id, cache=self._make_stale_cache(stale_if_error=True))
+        actual = api.hiragana(sentence=u'日本語')
+        assert actual == {'converted': u'にほんご(stale)'}
+        assert actual.stale is True
+
+        api = self._make_one(self.app_id, cache=self._make_stale_cache())
+        with pytest.raises(HTTPError):
+            api.hiragana(sentence=u'日本語')
+
+    @responses.activate
+    def test_single_flight(self):
+        responses.add(
+            responses.POST,
+            'https://labs.goo.ne.jp/api/entity',
+            body=json.dumps({'ne_list': []}),
+            status=200,
+            content_type='application/json'
+        )
+
+        api = self._make_one(self.app_id, single_flight=True)
+        assert api.entity(sentence=u'a') == {'ne_list': []}
+        assert api.stats()['single_flight'] == {'calls': 1, 'collapsed': 0}
+        assert 'single_flight' not in self._make_one(self.app_id).stats()
+
+    @responses.activate
+    def test_rate_limit(self):
+        from goolabs.ratelimit import RateLimiter
+
+        responses.add(
+            responses.POST,
+            'https://labs.goo.ne.jp/api/entity',
+            body=json.dumps({'ne_list': []}),
+            status=200,
+            content_type='application/json'
+        )
+
+        rate_limit = RateLimiter(rate=1000)
+        api = self._make_one(self.app_id, rate_limit=rate_limit)
+        with mock.patch.object(rate_limit, 'acquire') as m:
+            api.entity(sentence=u'a')
+        m.assert_called_once_with(self.app_id, 'entity', None)
+
+        api.entity(sentence=u'a')
+        assert api.stats()['rate_limit']['acquired'] == 1
+
+    @responses.activate
+    @mock.patch('goolabs.retry.time.sleep')
+    def test_retry(self, sleep):
+        from goolabs.retry import RetryPolicy
+
+        url = 'https://labs.goo.ne.jp/api/entity'
+        responses.add(responses.POST, url, status=503,
+                      headers={'Retry-After': '1'})
+        responses.add(responses.POST, url, body=json.dumps({'ne_list': []}),
+                      status=200, content_type='application/json')
+
+        api = self._make_one(self.app_id, retry=RetryPolicy(max_attempts=2))
+        assert api.entity(sentence=u'a') == {'ne_list': []}
+        assert len(responses.calls) == 2
+        sleep.assert_called_once_with(1)
+        assert api.stats()['retry'] == {
+            'retries': 1, 'gave_up': 0, 'backoff_time': 1}
+
+    @responses.activate
+    def test_breaker(self):
+        from goolabs.breaker import CircuitBreaker, CircuitOpenError
+        from goolabs.cache import ResponseCache
+
+        url = 'https://labs.goo.ne.jp/api/shortsum'
+        responses.add(responses.POST, url, status=503)
+
+        api = self._make_one(
+            self.app_id, breaker=CircuitBreaker(window=1, min_calls=1),
+            cache=ResponseCache(ttl=-1, stale_if_error=True))
+        api._cache.set('shortsum', {'review_list': ['b']}, {'summary': 'b'})
+
+        with pytest.raises(requests.HTTPError):
+            api.shortsum(review_list=['a'])
+        with pytest.raises(CircuitOpenError):
+            api.shortsum(review_list=['a'])
+        assert len(responses.calls) == 1
+
+        # fall back to the cache while the circuit is open.
+        assert api.shortsum(review_list=['b']) == {'summary': 'b'}
+        assert len(responses.calls) == 1
+        assert api.stats()['breaker']['states'] == {'shortsum': 'open'}
+
+    @responses.activate
+    def test_breaker_rate_limit_deadline(self):
+        from goolabs.breaker import CircuitBreaker
+        from goolabs.deadline import DeadlineExceeded
+        from goolabs.ratelimit import RateLimiter
+
+        responses.add(responses.POST, 'https://labs.goo.ne.jp/api/entity',
+                      body=json.dumps({'ne_list': []}), status=200,
+                      content_type='application/json')
+
+        breaker = CircuitBreaker(window=1, min_calls=1, reset_timeout=0)
+        rate_limit = RateLimiter(rate=1000)
+        api = self._make_one(self.app_id, breaker=breaker,
+                             rate_limit=rate_limit)
+        breaker.record('entity', 0, failed=True)
+
+        with mock.patch.object(rate_limit, 'acquire',
+                               side_effect=DeadlineExceeded):
+            with pytest.raises(DeadlineExceeded):
+                api.entity(sentence=u'a')
+        # the trial call was not used up.
+        assert breaker.state('entity') == 'open'
+        assert api.entity(sentence=u'a') == {'ne_list': []}
+        assert breaker.state('entity') == 'closed'
+
+    @responses.activate
+    def test_adaptive(self):
+        from goolabs.adaptive import AdaptiveLimit
+
+        url = 'https://labs.goo.ne.jp/api/entity'
+        responses.add(responses.POST, url, status=429)
+        responses.add(responses.POST, url, body=json.dumps({'ne_list': []}),
+                      status=200, content_type='application/json')
+
+        api = self._make_one(self.app_id,
+                             adaptive=AdaptiveLimit(initial=4, max_limit=4))
+        with pytest.raises(requests.HTTPError):
+            api.entity(sentence=u'a')
+        assert api.entity(sentence=u'a') == {'ne_list': []}
+        stats = api.stats()['concurrency']
+        assert stats['decreases'] == 1
+        assert stats['limit'] == 2
+
+        with mock.patch('goolabs.executor.imap') as m:
+            api.imap('entity', [])
+        assert m.call_args[1]['limiter'] is api._adaptive
+
+    @responses.activate
+    def test_scheduler(self):
+        from goolabs.scheduler import PriorityScheduler
+
+        responses.add(
+            responses.POST,
+            'https://labs.goo.ne.jp/api/hiragana',
+            body=json.dumps({'converted': u'あ'}),
+            status=200,
+            content_type='application/json'
+        )
+
+        scheduler = PriorityScheduler(slots=1)
+        api = self._make_one(self.app_id, scheduler=scheduler)
+        with mock.patch.object(scheduler, 'slot',
+                               wraps=scheduler.slot) as m:
+            api.hiragana(sentence=u'あ', priority='interactive')
+            api.hiragana(sentence=u'い')
+        assert m.call_args_list == [mock.call('interactive', None),
+                                    mock.call(None, None)]
+        # priority is not sent.
+        assert 'priority' not in json.loads(responses.calls[0].request.body)
+
+        stats = api.stats()['scheduler']
+        assert stats['interactive']['dispatched'] == 1
+        assert stats['bulk']['dispatched'] == 1
+
+    def test_hedge(self):
+        import threading
+        import time
+        from goolabs.hedge import HedgePolicy
+
+        def make_response(body):
+            response = requests.Response()
+            response.status_code = 200
+            response._content = json.dumps(body).encode('utf-8')
+            return response
+
+        release = threading.Event()
+        responses_ = [make_response({'ne_list': ['slow']}),
+                      make_response({'ne_list': ['hedge']})]
+
+        def send_http(func, payload, deadline):
+            response = responses_.pop(0)
+            if response.json() == {'ne_list': ['slow']}:
+                release.wait(5)
+            return response
+
+        hedge = HedgePolicy(budget=1, min_samples=1)
+        hedge.record('entity', 0.01)
+        api = self._make_one(self.app_id, hedge=hedge)
+        with mock.patch.object(api, '_send_http', side_effect=send_http):
+            started = time.time()
+            assert api.entity(sentence=u'a') == {'ne_list': ['hedge']}
+            # the call returns before the slow request finishes.
+            assert not release.is_set()
+            assert time.time() - started < 1
+            assert api.response.json() == {'ne_list': ['hedge']}
+        release.set()
+        assert api.stats()['hedge'] == {'requests': 1, 'hedges': 1,
+                                        'wins': 1}
+
+        # a fast call is not hedged.
+        release.clear()
+        responses_[:] = [make_response({'ne_list': ['fast']})]
+        with mock.patch.object(api, '_send_http', side_effect=send_http):
+            assert api.entity(sentence=u'a') == {'ne_list': ['fast']}
+        assert api.stats()['hedge']['hedges'] == 1
+        api.close()
+
+    def test_hedge_primary_error(self):
+        import threading
+        from goolabs.hedge import HedgePolicy
+
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'{"ne_list":["hedge"]}'
+        hedged = threading.Event()
+        sent = []
+
+        def send_http(func, payload, deadline):
+            sent.append(1)
+            if len(sent) == 2:
+                # the hedge, sent after the delay.
+                hedged.set()
+                return response
+            hedged.wait(5)
+            raise requests.ConnectionError('reset')
+
+        hedge = HedgePolicy(budget=1, min_samples=1)
+        hedge.record('entity', 0.01)
+        api = self._make_one(self.app_id, hedge=hedge)
+        with mock.patch.object(api, '_send_http', side_effect=send_http):
+            assert api.entity(sentence=u'a') == {'ne_list': ['hedge']}
+        assert api.stats()['hedge']['wins'] == 1
+
+        # the error is raised if it comes before the hedge is sent.
+        hedged.set()
+        sent[:] = [1, 1]
+        with mock.patch.object(api, '_send_http', side_effect=send_http):
+            with pytest.raises(requests.ConnectionError):
+                api.entity(sentence=u'a')
+        api.close()
+
+    @mock.patch('goolabs.retry.random.uniform', return_value=5)
+    @mock.patch('goolabs.retry.time.sleep')
+    def test_deadline(self, sleep, uniform):
+        from goolabs.deadline import DeadlineExceeded
+        from goolabs.retry import RetryPolicy
+
+        api = self._make_one(self.app_id, retry=RetryPolicy(backoff=10))
+        with mock.patch.object(api, '_get_session') as m:
+            m.return_value.post.side_effect = requests.ConnectionError()
+            with pytest.raises(DeadlineExceeded):
+                api.entity(sentence=u'a', deadline=0.8)
+        assert m.return_value.post.call_count == 1
+        # the request does not wait beyond the deadline.
+        assert m.return_value.post.call_args[1]['timeout'] <= 0.8
+        sent = json.loads(m.return_value.post.call_args[1]['data'])
+        assert 'deadline' not in sent
+        assert not sleep.called
+
+        with mock.patch.object(api, '_get_session') as m:
+            with pytest.raises(DeadlineExceeded):
+                api.entity(sentence=u'a', deadline=0)
+        assert not m.return_value.post.called
+
+    def test_imap_deadline(self):
+        api = self._make_one(self.app_id)
+        with mock.patch('goolabs.executor.imap') as m:
+            api.imap('entity', [{'sentence': u'a'}], deadline=10)
+        deadline = m.call_args[1]['deadline']
+        call = m.call_args[0][0]
+        seen = []
+        with mock.patch.object(api, '_call') as _call:
+            _call.side_effect = lambda *args: seen.append(
+                api._get_deadline())
+            call({'sentence': u'a'})
+        # each call has the deadline of the whole run.
+        assert seen[0] == pytest.approx(deadline, abs=0.1)
+        assert api._get_deadline() is None
+
+    @responses.activate
+    @mock.patch('goolabs.retry.time.sleep')
+    def test_key_pool(self, sleep):
+        from goolabs.keypool import KeyPool
+        from goolabs.retry import RetryPolicy
+
+        url = 'https://labs.goo.ne.jp/api/entity'
+        responses.add(responses.POST, url, status=429)
+        responses.add(responses.POST, url, body=json.dumps({'ne_list': []}),
+                      status=200, content_type='application/json')
+
+        keys = KeyPool(['key1', 'key2'])
+        api = self._make_one(keys, retry=RetryPolicy(max_attempts=2))
+        assert api.entity(sentence=u'a') == {'ne_list': []}
+
+        sent = [json.loads(call.request.body)['app_id']
+                for call in responses.calls]
+        assert sent == ['key1', 'key2']
+        stats = api.stats()['keys']
+        assert stats['ejections'] == 1
+        assert [k['in_flight'] for k in stats['keys']] == [0, 0]
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+    unittest for codec
+    ~~~~~~~~~~~~~~~~~~
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import pickle
+
+import mock
+import pytest
+
+from goolabs import codec
+
+DATA = {
+    'word_list': [[[u'日本語', u'名詞', u'ニホンゴ']]],
+    'score': 0.5,
+    'request_id': u'labs.goo.ne.jp\t1419262824\t0',
+}
+
+AVAILABLE = [name for name in codec.PREFERRED
+             if name == 'json' or getattr(codec, name) is not None]
+
+
+@pytest.mark.parametrize('name', AVAILABLE)
+class TestCodecs(object):
+
+    def _make_one(self, name):
+        return codec.CODECS[name]()
+
+    def test_dumps(self, name):
+        target = self._make_one(name)
+        assert target.dumps(DATA) == (
+            u'{"word_list":[[["日本語","名詞","ニホンゴ"]]],"score":0.5,'
+            u'"request_id":"labs.goo.ne.jp\\t1419262824\\t0"}')
+        assert target.dumpb(DATA) == target.dumps(DATA).encode('utf-8')
+
+    def test_dumps_pretty(self, name):
+        target = self._make_one(name)
+        assert target.dumps_pretty({'a': [1]}) == u'{\n  "a": [\n    1\n  ]\n}'
+
+    def test_loads(self, name):
+        target = self._make_one(name)
+        assert target.loads(target.dumps(DATA)) == DATA
+        assert target.loads(target.dumpb(DATA)) == DATA
+        with pytest.raises(ValueError):
+            target.loads('{')
+
+    def test_pickle(self, name):
+        target = self._make_one(name)
+        assert pickle.loads(pickle.dumps(target)).name == name
+
+
+class TestGetCodec(object):
+
+    def _call_fut(self, *args, **kwargs):
+        return codec.get_codec(*args, **kwargs)
+
+    def setup_method(self, method):
+        codec._default = None
+
+    def teardown_method(self, method):
+        codec._default = None
+
+    def test_name(self):
+        assert self._call_fut('json').name == 'json'
+        with pytest.raises(ValueError):
+            self._call_fut('unknown')
+
+    def test_default(self):
+        actual = self._call_fut()
+        assert actual.name == AVAILABLE[0]
+        assert self._call_fut() is actual
+
+    @mock.patch.dict('os.environ', {'GOOLABS_JSON_CODEC': 'json'})
+    def test_environ(self):
+        assert self._call_fut().name == 'json'
+
+    @mock.patch('goolabs.codec.orjson', None)
+    @mock.patch('goolabs.codec.ujson', None)
+    def test_fallback(self):
+        assert self._call_fut().name == 'json'
+        with pytest.raises(ImportError):
+            self._call_fut('orjson')
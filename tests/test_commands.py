@@ -10,9 +10,29 @@ from __future__ import division, print_function, absolute_import  # NOQA
 
 import mock
 import codecs
+import responses
 from click.testing import CliRunner
 
 
+class consume_imap(object):
+    """ Fake GoolabsAPI.imap which records the payloads. """
+
+    def __init__(self, results):
+        self.results = results
+        self.payloads = []
+
+    def __call__(self, func, payloads, **kwargs):
+        self.payloads.extend(payloads)
+        return iter(self.results)
+
+
+def patch_client():
+    """ Patch GoolabsAPI, keeping the names of the APIs. """
+    from goolabs.client import GoolabsAPI
+    return mock.patch('goolabs.client.GoolabsAPI',
+                      API_NAMES=GoolabsAPI.API_NAMES)
+
+
 class TestTextFunc(object):
 
     def _call_fut(self, string):
@@ -206,6 +226,60 @@ class TestFormatJson(object):
         assert expected == json.loads(self._call_fut(expected))
 
 
+class TestIterLines(object):
+
+    def _call_fut(self, sentence, sentence_file):
+        from goolabs.commands import iter_lines
+        return list(iter_lines(sentence, sentence_file))
+
+    def test_sentence(self):
+        assert [u'a', u'b'] == self._call_fut(u'a\n\nb', None)
+
+    def test_sentence_file(self):
+        import six
+
+        sentence_file = six.BytesIO(b'a\r\nb\n')
+        assert [u'a', u'b'] == self._call_fut(None, sentence_file)
+
+
+class TestLinePayloads(object):
+
+    def _call_fut(self, *args, **kwargs):
+        from goolabs.commands import line_payloads
+        return list(line_payloads(*args, **kwargs))
+
+    def test_request_id(self):
+        assert [
+            {'sentence': u'a', 'request_id': u'1', 'output_type': 'x'},
+            {'sentence': u'b', 'request_id': u'2', 'output_type': 'x'},
+        ] == self._call_fut([u'a', u'b'], 'sentence', None, output_type='x')
+
+        assert [
+            {'sentence': u'a', 'request_id': u'req-1'},
+        ] == self._call_fut([u'a'], 'sentence', u'req')
+
+
+class TestEchoRows(object):
+
+    def _call_fut(self, *args, **kwargs):
+        from goolabs.commands import echo_rows
+        return echo_rows(*args, **kwargs)
+
+    @mock.patch('goolabs.commands.click.echo')
+    def test_blocks(self, echo):
+        self._call_fut((u'row{0}'.format(i) for i in range(5)), block_size=10)
+        assert echo.call_args_list == [
+            mock.call(u'row0\nrow1'),
+            mock.call(u'row2\nrow3'),
+            mock.call(u'row4'),
+        ]
+
+    @mock.patch('goolabs.commands.click.echo')
+    def test_empty(self, echo):
+        self._call_fut([])
+        assert not echo.called
+
+
 class TestMainCommand(object):
 
     def _get_target(self):
@@ -224,6 +298,8 @@ Options:
   --help     Show this message and exit.
 
 Commands:
+  batch       Run NDJSON jobs of any API concurrently.
+  cache       Export, import or warm up the response cache.
   chrono      Extract expression expressing date and time...
   entity      Extract unique representation from sentence.
   hiragana    Convert the Japanese to Hiragana or Katakana.
@@ -264,11 +340,17 @@ Options:
   -p, --pos-filter TEXT   名刺,動詞活用語尾,句点..etc
   -f, --file FILENAME
   -j, --json / --no-json
+  --raw                   Output the response body as it is.
+  --compact               Output JSON without indentation.
+  --lines                 Request each line and output NDJSON.
+  --concurrency INTEGER   Number of parallel requests with --lines.
+  --chunk-size INTEGER    Split long text into chunks of this many characters.
+  --pack INTEGER          Number of lines per request with --lines.
   --help                  Show this message and exit.
 """
         assert expected == result.output
 
-    @mock.patch('goolabs.commands.GoolabsAPI')
+    @mock.patch('goolabs.client.GoolabsAPI')
     def test_minium_argument(self, m):
         api = m.return_value
         api.morph.return_value = {
@@ -288,10 +370,12 @@ Options:
             pos_filter=None,
             info_filter=None,
             request_id=None,
-            sentence=u'日本語'
+            sentence=u'日本語',
+            chunk_size=None,
+            raw=False,
         )
 
-    @mock.patch('goolabs.commands.GoolabsAPI')
+    @mock.patch('goolabs.client.GoolabsAPI')
     def test_full_argument(self, m):
         api = m.return_value
         api.morph.return_value = {
@@ -317,10 +401,12 @@ Options:
             pos_filter=u'名詞|格助詞|句点',
             info_filter='form|pos|read',
             request_id='req001',
-            sentence=u'日本語'
+            sentence=u'日本語',
+            chunk_size=None,
+            raw=False,
         )
 
-    @mock.patch('goolabs.commands.GoolabsAPI')
+    @mock.patch('goolabs.client.GoolabsAPI')
     def test_with_sentence_file(self, m):
         api = m.return_value
         api.morph.return_value = {
@@ -345,13 +431,43 @@ Options:
             pos_filter=None,
             info_filter=None,
             request_id=None,
-            sentence=u'日本語'
+            sentence=u'日本語',
+            chunk_size=None,
+            raw=False,
         )
 
-    @mock.patch('goolabs.commands.GoolabsAPI')
+    @mock.patch('goolabs.client.GoolabsAPI')
+    def test_raw_flag(self, m):
+        api = m.return_value
+        api.morph.return_value = u'{"word_list":[]}'.encode('utf-8')
+
+        runner = CliRunner()
+        result = runner.invoke(self._get_target(), [
+            '--app-id=12345',
+            '--raw',
+            u'日本語'
+        ])
+        assert api.morph.call_args[1]['raw'] is True
+        assert result.output == u'{"word_list":[]}\n'
+
+    @mock.patch('goolabs.client.GoolabsAPI')
+    def test_compact_flag(self, m):
+        api = m.return_value
+        api.morph.return_value = {'word_list': [[[u'日本語', u'名詞']]]}
+
+        runner = CliRunner()
+        result = runner.invoke(self._get_target(), [
+            '--app-id=12345',
+            '--compact',
+            u'日本語'
+        ])
+        assert api.morph.call_args[1]['raw'] is False
+        assert result.output == u'{"word_list":[[["日本語","名詞"]]]}\n'
+
+    @mock.patch('goolabs.client.GoolabsAPI')
     def test_json_flag(self, m):
         api = m.return_value
-        api.response.json.return_value = {'dummy': 'dummydata'}
+        api.morph.return_value = {'dummy': 'dummydata'}
 
         runner = CliRunner()
         result = runner.invoke(self._get_target(), [
@@ -364,13 +480,90 @@ Options:
             pos_filter=None,
             info_filter=None,
             request_id=None,
-            sentence=u'日本語'
+            sentence=u'日本語',
+            chunk_size=None,
+            raw=False,
         )
         assert result.output == u"""{
   "dummy": "dummydata"
 }
 """
 
+    @mock.patch('goolabs.client.GoolabsAPI')
+    def test_lines_flag(self, m):
+        api = m.return_value
+        api.imap.side_effect = consume_imap([
+            {'word_list': [[[u'日本語', u'名詞', u'ニホンゴ']]],
+             'request_id': '1'},
+            {'word_list': [[[u'英語', u'名詞', u'エイゴ']]],
+             'request_id': '2'},
+        ])
+
+        runner = CliRunner()
+        with runner.isolated_filesystem():
+            with codecs.open('sentence.txt', 'w', 'utf-8') as f:
+                f.write(u'日本語\n\n英語\n')
+
+            result = runner.invoke(self._get_target(), [
+                '--app-id=12345',
+                '--info-filter=form,pos,read',
+                '--lines',
+                '--concurrency=8',
+                '--file=sentence.txt',
+            ])
+
+        m.assert_called_with('12345', pool_maxsize=8)
+        assert api.imap.call_args[0][0] == 'morph'
+        from goolabs.commands import error_row
+        assert api.imap.call_args[1] == {
+            'workers': 8, 'pack': None, 'on_error': error_row}
+        assert api.imap.side_effect.payloads == [
+            {'sentence': u'日本語', 'request_id': '1',
+             'info_filter': 'form|pos|read', 'pos_filter': None},
+            {'sentence': u'英語', 'request_id': '2',
+             'info_filter': 'form|pos|read', 'pos_filter': None},
+        ]
+        assert result.output == (
+            u'{"word_list":[[["日本語","名詞","ニホンゴ"]]],"request_id":"1"}\n'
+            u'{"word_list":[[["英語","名詞","エイゴ"]]],"request_id":"2"}\n'
+        )
+
+    @mock.patch('goolabs.client.GoolabsAPI')
+    def test_lines_flag_with_error(self, m):
+        def imap(func, payloads, **kwargs):
+            payloads = list(payloads)
+            yield kwargs['on_error'](payloads[0], ValueError('error'))
+            yield {'word_list': [], 'request_id': '2'}
+
+        m.return_value.imap.side_effect = imap
+        runner = CliRunner()
+        result = runner.invoke(self._get_target(), [
+            '--app-id=12345',
+            '--lines',
+            u'日本語\n英語',
+        ])
+        assert result.exit_code == 0
+        assert result.output == (
+            u'{"request_id":"1","error":"error"}\n'
+            u'{"word_list":[],"request_id":"2"}\n'
+        )
+
+    @mock.patch('goolabs.client.GoolabsAPI')
+    def test_lines_flag_with_pack(self, m):
+        api = m.return_value
+        api.imap.side_effect = consume_imap([{'word_list': []}])
+
+        runner = CliRunner()
+        runner.invoke(self._get_target(), [
+            '--app-id=12345',
+            '--lines',
+            '--pack=50',
+            u'日本語',
+        ])
+        from goolabs.commands import error_row
+        assert api.imap.call_args[1] == {
+            'workers': 4, 'pack': 50, 'on_error': error_row}
+
 
 class TestSimiralityCommand(object):
 
@@ -389,11 +582,13 @@ Options:
   -a, --app-id TEXT
   -r, --request-id TEXT
   -j, --json / --no-json
+  --raw                   Output the response body as it is.
+  --compact               Output JSON without indentation.
   --help                  Show this message and exit.
 """
         assert expected == result.output
 
-    @mock.patch('goolabs.commands.GoolabsAPI')
+    @mock.patch('goolabs.client.GoolabsAPI')
     def test_minimum_argguments(self, m):
         api = m.return_value
         api.similarity.return_value = {
@@ -412,9 +607,10 @@ Options:
         api.similarity.assert_called_with(
             query_pair=(u'ウィンドウズ', 'windows'),
             request_id=None,
+            raw=False,
         )
 
-    @mock.patch('goolabs.commands.GoolabsAPI')
+    @mock.patch('goolabs.client.GoolabsAPI')
     def test_full_argguments(self, m):
         api = m.return_value
         api.similarity.return_value = {
@@ -435,12 +631,13 @@ Options:
         api.similarity.assert_called_with(
             query_pair=(u'ウィンドウズ', 'windows'),
             request_id='req001',
+            raw=False,
         )
 
-    @mock.patch('goolabs.commands.GoolabsAPI')
+    @mock.patch('goolabs.client.GoolabsAPI')
     def test_json_flag(self, m):
         api = m.return_value
-        api.response.json.return_value = {'dummy': 'dummydata'}
+        api.similarity.return_value = {'dummy': 'dummydata'}
 
         runner = CliRunner()
         result = runner.invoke(self._get_target(), [
@@ -453,6 +650,7 @@ Options:
         api.similarity.assert_called_with(
             query_pair=(u'ウィンドウズ', 'windows'),
             request_id=None,
+            raw=False,
         )
         assert result.output == """{
   "dummy": "dummydata"
@@ -479,11 +677,18 @@ Options:
   -r, --request-id TEXT
   -f, --file FILENAME
   -j, --json / --no-json
+  --raw                           Output the response body as it is.
+  --compact                       Output JSON without indentation.
+  --lines                         Request each line and output NDJSON.
+  --concurrency INTEGER           Number of parallel requests with --lines.
+  --chunk-size INTEGER            Split long text into chunks of this many
+                                  characters.
+  --pack INTEGER                  Number of lines per request with --lines.
   --help                          Show this message and exit.
 """
         assert expected == result.output
 
-    @mock.patch('goolabs.commands.GoolabsAPI')
+    @mock.patch('goolabs.client.GoolabsAPI')
     def test_minimum_argments(self, m):
         api = m.return_value
         api.hiragana.return_value = {
@@ -500,9 +705,11 @@ Options:
             sentence=u'日本語',
             output_type='hiragana',
             request_id=None,
+            chunk_size=None,
+            raw=False,
         )
 
-    @mock.patch('goolabs.commands.GoolabsAPI')
+    @mock.patch('goolabs.client.GoolabsAPI')
     def test_full_argments(self, m):
         api = m.return_value
         api.hiragana.return_value = {
@@ -525,9 +732,11 @@ Options:
             sentence=u'日本語',
             output_type='katakana',
             request_id='req001',
+            chunk_size=None,
+            raw=False,
         )
 
-    @mock.patch('goolabs.commands.GoolabsAPI')
+    @mock.patch('goolabs.client.GoolabsAPI')
     def test_with_sentence_file(self, m):
         api = m.return_value
         api.hiragana.return_value = {
@@ -550,12 +759,14 @@ Options:
             sentence=u'日本語',
             output_type='hiragana',
             request_id=None,
+            chunk_size=None,
+            raw=False,
         )
 
-    @mock.patch('goolabs.commands.GoolabsAPI')
+    @mock.patch('goolabs.client.GoolabsAPI')
     def test_json_flag(self, m):
         api = m.return_value
-        api.response.json.return_value = {'dummy': 'dummydata'}
+        api.hiragana.return_value = {'dummy': 'dummydata'}
 
         runner = CliRunner()
         result = runner.invoke(self._get_target(), [
@@ -568,12 +779,54 @@ Options:
             sentence=u'日本語',
             output_type='hiragana',
             request_id=None,
+            chunk_size=None,
+            raw=False,
         )
         assert result.output == """{
   "dummy": "dummydata"
 }
 """
 
+    @mock.patch('goolabs.client.GoolabsAPI')
+    def test_chunk_size(self, m):
+        api = m.return_value
+        api.hiragana.return_value = {'converted': u'にほんご。'}
+
+        runner = CliRunner()
+        result = runner.invoke(self._get_target(), [
+            '--app-id=12345',
+            '--chunk-size=100',
+            '--json',
+            u'日本語。'
+        ])
+        api.hiragana.assert_called_with(
+            sentence=u'日本語。',
+            output_type='hiragana',
+            request_id=None,
+            chunk_size=100,
+            raw=False,
+        )
+        assert u'にほんご。' in result.output
+
+    @mock.patch('goolabs.client.GoolabsAPI')
+    def test_lines_flag_with_stdin(self, m):
+        api = m.return_value
+        api.imap.side_effect = consume_imap([{'converted': u'にほんご'}])
+
+        runner = CliRunner()
+        result = runner.invoke(self._get_target(), [
+            '--app-id=12345',
+            '--request-id=req',
+            '--lines',
+        ], input=u'日本語\n'.encode('utf-8'))
+
+        m.assert_called_with('12345', pool_maxsize=4)
+        assert api.imap.side_effect.payloads == [
+            {'sentence': u'日本語', 'request_id': 'req-1',
+             'output_type': 'hiragana'},
+        ]
+        assert result.output == u'{"converted":"にほんご"}\n'
+
 
 class TestEntityCommand(object):
 
@@ -594,11 +847,16 @@ Options:
   -r, --request-id TEXT
   -f, --file FILENAME
   -j, --json / --no-json
+  --raw                    Output the response body as it is.
+  --compact                Output JSON without indentation.
+  --lines                  Request each line and output NDJSON.
+  --concurrency INTEGER    Number of parallel requests with --lines.
+  --chunk-size INTEGER     Split long text into chunks of this many characters.
   --help                   Show this message and exit.
 """
         assert expected == result.output
 
-    @mock.patch('goolabs.commands.GoolabsAPI')
+    @mock.patch('goolabs.client.GoolabsAPI')
     def test_minimum_arguments(self, m):
         api = m.return_value
         api.entity.return_value = {
@@ -616,9 +874,11 @@ Options:
             sentence=u'鈴木さん',
             class_filter=None,
             request_id=None,
+            chunk_size=None,
+            raw=False,
         )
 
-    @mock.patch('goolabs.commands.GoolabsAPI')
+    @mock.patch('goolabs.client.GoolabsAPI')
     def test_full_arguments(self, m):
         api = m.return_value
         api.entity.return_value = {
@@ -642,9 +902,11 @@ Options:
             sentence=u'鈴木さん',
             class_filter='PSN|LOC',
             request_id='req001',
+            chunk_size=None,
+            raw=False,
         )
 
-    @mock.patch('goolabs.commands.GoolabsAPI')
+    @mock.patch('goolabs.client.GoolabsAPI')
     def test_with_sentence_file(self, m):
         api = m.return_value
         api.entity.return_value = {
@@ -668,12 +930,14 @@ Options:
             sentence=u'鈴木さん',
             class_filter=None,
             request_id=None,
+            chunk_size=None,
+            raw=False,
         )
 
-    @mock.patch('goolabs.commands.GoolabsAPI')
+    @mock.patch('goolabs.client.GoolabsAPI')
     def test_json_flag(self, m):
         api = m.return_value
-        api.response.json.return_value = {'dummy': 'dummydata'}
+        api.entity.return_value = {'dummy': 'dummydata'}
 
         runner = CliRunner()
         result = runner.invoke(self._get_target(), [
@@ -686,6 +950,8 @@ Options:
             sentence=u'鈴木さん',
             class_filter=None,
             request_id=None,
+            chunk_size=None,
+            raw=False,
         )
         assert result.output == """{
   "dummy": "dummydata"
@@ -712,11 +978,13 @@ Options:
   -r, --request-id TEXT
   -f, --file FILENAME
   -j, --json / --no-json
+  --raw                      Output the response body as it is.
+  --compact                  Output JSON without indentation.
   --help                     Show this message and exit.
 """
         assert expected == result.output
 
-    @mock.patch('goolabs.commands.GoolabsAPI')
+    @mock.patch('goolabs.client.GoolabsAPI')
     def test_minimum_arguments(self, m):
         api = m.return_value
         api.shortsum.return_value = {
@@ -735,9 +1003,10 @@ Options:
             review_list=[u'黒の発色が綺麗です'],
             length=None,
             request_id=None,
+            raw=False,
         )
 
-    @mock.patch('goolabs.commands.GoolabsAPI')
+    @mock.patch('goolabs.client.GoolabsAPI')
     def test_full_arguments(self, m):
         api = m.return_value
         api.shortsum.return_value = {
@@ -758,9 +1027,10 @@ Options:
             review_list=[u'黒の発色が綺麗です'],
             length=180,
             request_id='req001',
+            raw=False,
         )
 
-    @mock.patch('goolabs.commands.GoolabsAPI')
+    @mock.patch('goolabs.client.GoolabsAPI')
     def test_with_review_file(self, m):
         api = m.return_value
         api.shortsum.return_value = {
@@ -781,12 +1051,13 @@ Options:
             review_list=[u'黒の発色が綺麗です'],
             length=None,
             request_id=None,
+            raw=False,
         )
 
-    @mock.patch('goolabs.commands.GoolabsAPI')
+    @mock.patch('goolabs.client.GoolabsAPI')
     def test_json_flag(self, m):
         api = m.return_value
-        api.response.json.return_value = {u'dummy': u'dummydata'}
+        api.shortsum.return_value = {u'dummy': u'dummydata'}
 
         runner = CliRunner()
         result = runner.invoke(self._get_target(), [
@@ -799,6 +1070,7 @@ Options:
             review_list=[u'黒の発色が綺麗です'],
             length=None,
             request_id=None,
+            raw=False,
         )
         assert result.output == """{
   "dummy": "dummydata"
@@ -826,11 +1098,15 @@ Options:
   -r, --request-id TEXT
   -f, --file FILENAME
   -j, --json / --no-json
+  --raw                        Output the response body as it is.
+  --compact                    Output JSON without indentation.
+  --lines                      Request each line and output NDJSON.
+  --concurrency INTEGER        Number of parallel requests with --lines.
   --help                       Show this message and exit.
 """
         assert expected == result.output
 
-    @mock.patch('goolabs.commands.GoolabsAPI')
+    @mock.patch('goolabs.client.GoolabsAPI')
     def test_minimum_arguments(self, m):
         api = m.return_value
         api.keyword.return_value = {
@@ -853,9 +1129,10 @@ Options:
             max_num=None,
             forcus=None,
             request_id=None,
+            raw=False,
         )
 
-    @mock.patch('goolabs.commands.GoolabsAPI')
+    @mock.patch('goolabs.client.GoolabsAPI')
     def test_full_arguments(self, m):
         api = m.return_value
         api.keyword.return_value = {
@@ -882,9 +1159,10 @@ Options:
             max_num=2,
             forcus='ORG',
             request_id='req001',
+            raw=False,
         )
 
-    @mock.patch('goolabs.commands.GoolabsAPI')
+    @mock.patch('goolabs.client.GoolabsAPI')
     def test_with_body_file(self, m):
         api = m.return_value
         api.keyword.return_value = {
@@ -915,12 +1193,13 @@ Options:
             max_num=None,
             forcus=None,
             request_id=None,
+            raw=False,
         )
 
-    @mock.patch('goolabs.commands.GoolabsAPI')
+    @mock.patch('goolabs.client.GoolabsAPI')
     def test_json_flag(self, m):
         api = m.return_value
-        api.response.json.return_value = {'dummy': 'dummydata'}
+        api.keyword.return_value = {'dummy': 'dummydata'}
 
         runner = CliRunner()
         result = runner.invoke(
@@ -934,12 +1213,33 @@ Options:
             max_num=None,
             forcus=None,
             request_id=None,
+            raw=False,
         )
         assert result.output == """{
   "dummy": "dummydata"
 }
 """
 
+    @mock.patch('goolabs.client.GoolabsAPI')
+    def test_lines_flag(self, m):
+        api = m.return_value
+        api.imap.side_effect = consume_imap([{'keywords': [{u'テスト': 0.55}]}])
+
+        runner = CliRunner()
+        result = runner.invoke(self._get_target(), [
+            '--app-id=12345',
+            '--lines',
+            u'タイトル',
+            u'テスト',
+        ])
+
+        assert api.imap.call_args[0][0] == 'keyword'
+        assert api.imap.side_effect.payloads == [
+            {'title': u'タイトル', 'body': u'テスト', 'request_id': '1',
+             'max_num': None, 'forcus': None},
+        ]
+        assert result.output == u'{"keywords":[{"テスト":0.55}]}\n'
+
 
 class TestChronoCommand(object):
 
@@ -960,11 +1260,16 @@ Options:
   -d, --doc-time TEXT
   -f, --file FILENAME
   -j, --json / --no-json
+  --raw                   Output the response body as it is.
+  --compact               Output JSON without indentation.
+  --lines                 Request each line and output NDJSON.
+  --concurrency INTEGER   Number of parallel requests with --lines.
+  --chunk-size INTEGER    Split long text into chunks of this many characters.
   --help                  Show this message and exit.
 """
         assert expected == result.output
 
-    @mock.patch('goolabs.commands.GoolabsAPI')
+    @mock.patch('goolabs.client.GoolabsAPI')
     def test_minimum_arguments(self, m):
         api = m.return_value
         api.chrono.return_value = {
@@ -985,9 +1290,11 @@ Options:
             sentence=u'テスト',
             request_id=None,
             doc_time=None,
+            chunk_size=None,
+            raw=False,
         )
 
-    @mock.patch('goolabs.commands.GoolabsAPI')
+    @mock.patch('goolabs.client.GoolabsAPI')
     def test_full_arguments(self, m):
         api = m.return_value
         api.chrono.return_value = {
@@ -1010,9 +1317,11 @@ Options:
             sentence=u'テスト',
             doc_time='2016-04-01T09:00:00',
             request_id='req001',
+            chunk_size=None,
+            raw=False,
         )
 
-    @mock.patch('goolabs.commands.GoolabsAPI')
+    @mock.patch('goolabs.client.GoolabsAPI')
     def test_with_sentence_file(self, m):
         api = m.return_value
         api.chrono.return_value = {
@@ -1034,12 +1343,14 @@ Options:
             sentence=u'日本語',
             request_id=None,
             doc_time=None,
+            chunk_size=None,
+            raw=False,
         )
 
-    @mock.patch('goolabs.commands.GoolabsAPI')
+    @mock.patch('goolabs.client.GoolabsAPI')
     def test_json_flag(self, m):
         api = m.return_value
-        api.response.json.return_value = {'dummy': 'dummydata'}
+        api.chrono.return_value = {'dummy': 'dummydata'}
 
         runner = CliRunner()
         result = runner.invoke(
@@ -1051,8 +1362,274 @@ Options:
             sentence=u'テスト',
             request_id=None,
             doc_time=None,
+            chunk_size=None,
+            raw=False,
         )
         assert result.output == """{
   "dummy": "dummydata"
 }
 """
+
+
+class TestRunJob(object):
+
+    def _call_fut(self, api, job_line):
+        from goolabs.commands import run_job
+        return run_job(api, job_line)
+
+    def test_normal_case(self):
+        api = mock.Mock()
+        api.entity.return_value = {'ne_list': []}
+
+        actual = self._call_fut(api, (
+            1, u'{"api": "entity", "params": {"sentence": "a"}, "id": "x"}'))
+        assert actual == {'id': 'x', 'api': 'entity',
+                          'result': {'ne_list': []}}
+        api.entity.assert_called_with(sentence='a')
+
+    def test_default_id(self):
+        api = mock.Mock()
+        api.chrono.return_value = {'datetime_list': []}
+
+        actual = self._call_fut(api, (3, u'{"api": "chrono"}'))
+        assert actual == {'id': 3, 'api': 'chrono',
+                          'result': {'datetime_list': []}}
+
+    def test_errors(self):
+        api = mock.Mock()
+        api.morph.side_effect = ValueError('upstream error')
+
+        assert self._call_fut(api, (1, u'{"api": "morph"}')) == {
+            'id': 1, 'api': 'morph', 'error': 'upstream error'}
+        assert self._call_fut(api, (2, u'{"api": "close"}')) == {
+            'id': 2, 'api': 'close', 'error': 'Unknown api "close".'}
+        assert self._call_fut(api, (3, u'[]')) == {
+            'id': 3, 'error': 'A job must be a JSON object.'}
+        assert 'error' in self._call_fut(api, (4, u'{broken'))
+        assert not api.close.called
+
+
+class TestBatchCommand(object):
+
+    def _get_target(self):
+        from goolabs.commands import batch
+        return batch
+
+    def test_help(self):
+        runner = CliRunner()
+        result = runner.invoke(self._get_target(), ['--help'])
+        expected = u"""Usage: batch [OPTIONS] [JOBS_FILE]
+
+  Run NDJSON jobs of any API concurrently.
+
+Options:
+  -a, --app-id TEXT
+  --concurrency INTEGER  Number of parallel requests.
+  --cache FILE           Response cache file.
+  --rate FLOAT           Maximum requests per second.
+  --retries INTEGER      Retry failed requests up to this many times.
+  --adaptive             Adapt parallel requests to the load, up to
+                         --concurrency.
+  --deadline FLOAT       Stop after this many seconds with the finished jobs.
+  --help                 Show this message and exit.
+"""
+        assert expected == result.output
+
+    @patch_client()
+    def test_jobs_file(self, m):
+        import json
+
+        api = m.return_value
+        api.morph.return_value = {'word_list': []}
+        api.similarity.return_value = {'score': 0.5}
+
+        runner = CliRunner()
+        with runner.isolated_filesystem():
+            with codecs.open('jobs.ndjson', 'w', 'utf-8') as f:
+                f.write(u'{"api": "morph", "params": {"sentence": "a"}}\n')
+                f.write(u'\n')
+                f.write(u'{"api": "similarity", "id": "s",'
+                        u' "params": {"query_pair": ["a", "b"]}}\n')
+
+            result = runner.invoke(self._get_target(), [
+                '--app-id=12345', '--concurrency=2', 'jobs.ndjson'])
+
+        m.assert_called_with('12345', pool_maxsize=2, cache=None,
+                             rate_limit=None, retry=None, adaptive=None)
+        actual = sorted([json.loads(line)
+                         for line in result.output.splitlines()],
+                        key=lambda r: str(r['id']))
+        assert actual == [
+            {'id': 1, 'api': 'morph', 'result': {'word_list': []}},
+            {'id': 's', 'api': 'similarity', 'result': {'score': 0.5}},
+        ]
+
+    @patch_client()
+    def test_stdin(self, m):
+        api = m.return_value
+        api.hiragana.return_value = {'converted': u'あ'}
+
+        runner = CliRunner()
+        result = runner.invoke(self._get_target(), ['--app-id=12345'],
+                               input=b'{"api": "hiragana"}\n')
+        assert result.output == (
+            u'{"id":1,"api":"hiragana","result":{"converted":"あ"}}\n')
+
+    @patch_client()
+    def test_rate(self, m):
+        m.return_value.hiragana.return_value = {'converted': u'あ'}
+
+        runner = CliRunner()
+        runner.invoke(self._get_target(), ['--app-id=12345', '--rate=5'],
+                      input=b'{"api": "hiragana"}\n')
+        rate_limit = m.call_args[1]['rate_limit']
+        assert rate_limit.rate == 5
+
+    @patch_client()
+    def test_retries(self, m):
+        m.return_value.hiragana.return_value = {'converted': u'あ'}
+
+        runner = CliRunner()
+        runner.invoke(self._get_target(), ['--app-id=12345', '--retries=2'],
+                      input=b'{"api": "hiragana"}\n')
+        assert m.call_args[1]['retry'].max_attempts == 3
+
+    @patch_client()
+    def test_app_ids(self, m):
+        runner = CliRunner()
+        runner.invoke(self._get_target(), ['--app-id=key1,key2'], input=b'')
+        keys = m.call_args[0][0]
+        assert keys.app_ids == ['key1', 'key2']
+
+    @mock.patch('goolabs.executor.imap', return_value=[])
+    @patch_client()
+    def test_adaptive(self, m, imap):
+        runner = CliRunner()
+        runner.invoke(self._get_target(), [
+            '--app-id=12345', '--concurrency=16', '--adaptive'], input=b'')
+        limiter = m.call_args[1]['adaptive']
+        assert limiter.max_limit == 16
+        assert imap.call_args[1]['limiter'] is limiter
+
+    @patch_client()
+    def test_deadline(self, m):
+        import threading
+
+        release = threading.Event()
+        api = m.return_value
+        api.hiragana.return_value = {'converted': u'あ'}
+        api.morph.side_effect = lambda **kwargs: release.wait(5)
+
+        runner = CliRunner()
+        result = runner.invoke(self._get_target(), [
+            '--app-id=12345', '--deadline=0.2'],
+            input=b'{"api": "morph"}\n{"api": "hiragana"}\n')
+        release.set()
+        assert result.output.startswith(
+            u'{"id":2,"api":"hiragana","result":{"converted":"あ"}}\n')
+        assert u'"id":1' not in result.output
+        deadline = api.hiragana.call_args[1]['deadline']
+        assert 0 < deadline <= 0.2
+
+
+class TestCacheCommand(object):
+
+    def _get_target(self):
+        from goolabs.commands import cache_group
+        return cache_group
+
+    def _make_cache(self, path):
+        from goolabs.cache import ResponseCache
+        return ResponseCache(path)
+
+    def test_export_import(self):
+        runner = CliRunner()
+        with runner.isolated_filesystem():
+            cache = self._make_cache('src.sqlite3')
+            cache.set('morph', {'sentence': u'a'}, {'word_list': [u'あ']})
+            cache.set('morph', {'sentence': u'b'}, {'word_list': [u'い']})
+
+            result = runner.invoke(self._get_target(), [
+                'export', '--cache=src.sqlite3', 'snapshot.gz'])
+            assert result.output == u'Exported 2 entries.\n'
+
+            dest = self._make_cache('dest.sqlite3')
+            dest.set('morph', {'sentence': u'a'}, {'word_list': [u'local']})
+            result = runner.invoke(self._get_target(), [
+                'import', '--cache=dest.sqlite3', 'snapshot.gz'])
+            assert result.output == u'Imported 1 entries.\n'
+
+            dest = self._make_cache('dest.sqlite3')
+            assert dest.get('morph', {'sentence': u'a'}) == {
+                'word_list': [u'local']}
+            assert dest.get('morph', {'sentence': u'b'}) == {
+                'word_list': [u'い']}
+
+            result = runner.invoke(self._get_target(), [
+                'import', '--replace', '--cache=dest.sqlite3', 'snapshot.gz'])
+            assert result.output == u'Imported 2 entries.\n'
+            assert self._make_cache('dest.sqlite3').get(
+                'morph', {'sentence': u'a'}) == {'word_list': [u'あ']}
+
+    @responses.activate
+    def test_warm(self):
+        import json
+
+        def callback(request):
+            payload = json.loads(request.body)
+            return (200, {}, json.dumps({'ne_list': [payload['sentence']]}))
+
+        responses.add_callback(
+            responses.POST,
+            'https://labs.goo.ne.jp/api/entity',
+            callback=callback,
+            content_type='application/json'
+        )
+
+        runner = CliRunner()
+        with runner.isolated_filesystem():
+            with codecs.open('corpus.txt', 'w', 'utf-8') as f:
+                f.write(u'a\nb\na\n')
+
+            result = runner.invoke(self._get_target(), [
+                'warm', 'entity', '--app-id=12345', '--cache=c.sqlite3',
+                '--file=corpus.txt', '--params={"class_filter": "PSN"}',
+                '--concurrency=1',
+            ])
+            assert result.output == (
+                u'Cached 2 entries (1 already cached, 0 failed).\n')
+
+            cache = self._make_cache('c.sqlite3')
+            assert cache.get('entity', {
+                'sentence': u'b', 'class_filter': 'PSN'}) == {'ne_list': ['b']}
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_warm_with_error(self):
+        url = 'https://labs.goo.ne.jp/api/entity'
+        responses.add(responses.POST, url, status=500)
+        responses.add(responses.POST, url, body='{"ne_list": []}',
+                      status=200, content_type='application/json')
+
+        runner = CliRunner()
+        with runner.isolated_filesystem():
+            with codecs.open('corpus.txt', 'w', 'utf-8') as f:
+                f.write(u'a\nb\nc\n')
+
+            result = runner.invoke(self._get_target(), [
+                'warm', 'entity', '--app-id=12345', '--cache=c.sqlite3',
+                '--file=corpus.txt', '--concurrency=1',
+            ])
+            assert result.exit_code == 0
+            assert result.output == (
+                u'Cached 2 entries (0 already cached, 1 failed).\n')
+            assert self._make_cache('c.sqlite3').get(
+                'entity', {'sentence': u'b'}) == {'ne_list': []}
+
+    def test_warm_invalid_params(self):
+        runner = CliRunner()
+        result = runner.invoke(self._get_target(), [
+            'warm', 'morph', '--app-id=12345', '--cache=c.sqlite3',
+            '--params=[1]'])
+        assert result.exit_code == 2
+        assert '--params is not a valid JSON object.' in result.output
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""
+    unittest for deadlines
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import mock
+import pytest
+import requests
+
+
+class TestRemaining(object):
+
+    def _call_fut(self, deadline):
+        from goolabs.deadline import remaining
+        return remaining(deadline)
+
+    @mock.patch('goolabs.deadline.time.time', return_value=100.0)
+    def test_normal_case(self, m):
+        assert self._call_fut(None) is None
+        assert self._call_fut(100.5) == 0.5
+
+    @mock.patch('goolabs.deadline.time.time', return_value=100.0)
+    def test_exceeded(self, m):
+        from goolabs.deadline import DeadlineExceeded
+
+        with pytest.raises(DeadlineExceeded) as e:
+            self._call_fut(100.0)
+        assert isinstance(e.value, requests.Timeout)
+        assert str(e.value) == 'Deadline exceeded.'
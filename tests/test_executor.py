@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+    unittest for executors
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import threading
+import time
+
+import pytest
+
+
+class TestImap(object):
+
+    def _call_fut(self, *args, **kwargs):
+        from goolabs.executor import imap
+        return imap(*args, **kwargs)
+
+    def test_ordered(self):
+        def func(x):
+            time.sleep(0.001 * (10 - x))
+            return x * 2
+
+        actual = list(self._call_fut(func, range(10), workers=4))
+        assert actual == [x * 2 for x in range(10)]
+
+    def test_unordered(self):
+        actual = list(self._call_fut(lambda x: x, range(10),
+                                     workers=4, ordered=False))
+        assert sorted(actual) == list(range(10))
+
+    def test_window(self):
+        lock = threading.Lock()
+        state = {'taken': 0, 'max_ahead': 0}
+
+        def source():
+            for i in range(20):
+                with lock:
+                    state['taken'] += 1
+                yield i
+
+        results = self._call_fut(lambda x: x, source(), workers=2, window=3)
+        for count, _ in enumerate(results, 1):
+            state['max_ahead'] = max(state['max_ahead'],
+                                     state['taken'] - count)
+        assert state['max_ahead'] <= 3
+
+    def test_limiter(self):
+        from goolabs.adaptive import AdaptiveLimit
+
+        limiter = AdaptiveLimit(initial=2, max_limit=8)
+        lock = threading.Lock()
+        state = {'running': 0, 'max_running': 0}
+
+        def func(x):
+            with lock:
+                state['running'] += 1
+                state['max_running'] = max(state['max_running'],
+                                           state['running'])
+            time.sleep(0.005)
+            with lock:
+                state['running'] -= 1
+            return x
+
+        actual = list(self._call_fut(func, range(10), workers=8,
+                                     limiter=limiter))
+        assert actual == list(range(10))
+        # func does not report to the limiter, the limit stays.
+        assert state['max_running'] == 2
+
+    def test_deadline(self):
+        release = threading.Event()
+
+        def func(x):
+            if x >= 3:
+                release.wait(5)
+            return x
+
+        actual = list(self._call_fut(func, range(10), workers=4,
+                                     ordered=False,
+                                     deadline=time.time() + 0.1))
+        release.set()
+        assert sorted(actual) == [0, 1, 2]
+
+    def test_raise_error(self):
+        def func(x):
+            if x == 3:
+                raise ValueError('error')
+            return x
+
+        results = self._call_fut(func, range(10), workers=2)
+        assert [next(results) for _ in range(3)] == [0, 1, 2]
+        with pytest.raises(ValueError):
+            next(results)
+
+    def test_invalid_window(self):
+        with pytest.raises(ValueError):
+            list(self._call_fut(lambda x: x, range(3), window=-1))
+
+
+class EchoAPI(object):
+
+    def hiragana(self, **payload):
+        import os
+        return {'converted': payload['sentence'], 'pid': os.getpid()}
+
+
+def pick_converted(ret):
+    return ret['converted']
+
+
+class TestProcessImap(object):
+
+    def _call_fut(self, *args, **kwargs):
+        from goolabs.executor import process_imap
+        return process_imap(*args, **kwargs)
+
+    def test_ordered(self):
+        payloads = ({'sentence': str(i)} for i in range(10))
+        actual = list(self._call_fut(EchoAPI(), 'hiragana', payloads,
+                                     workers=2, postprocess=pick_converted))
+        assert actual == [str(i) for i in range(10)]
+
+    def test_run_in_child_process(self):
+        import os
+
+        actual = self._call_fut(EchoAPI(), 'hiragana', [{'sentence': 'a'}],
+                                workers=1)
+        assert next(actual)['pid'] != os.getpid()
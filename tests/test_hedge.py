@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+    unittest for HedgePolicy
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import pickle
+
+
+class TestHedgePolicy(object):
+
+    def _get_target_class(self):
+        from goolabs.hedge import HedgePolicy
+        return HedgePolicy
+
+    def _make_one(self, *args, **kwargs):
+        return self._get_target_class()(*args, **kwargs)
+
+    def test_delay(self):
+        policy = self._make_one(percentile=90, min_samples=10)
+        for i in range(1, 10):
+            policy.record('morph', i / 10)
+        assert policy.delay('morph') is None
+
+        policy.record('morph', 1.0)
+        assert policy.delay('morph') == 0.9
+        assert policy.delay('entity') is None
+        assert policy.stats()['requests'] == 3
+
+    def test_window(self):
+        policy = self._make_one(percentile=50, window=4, min_samples=4)
+        for latency in (9, 9, 9, 9, 1, 1, 1):
+            policy.record('morph', latency)
+        assert policy.delay('morph') == 1
+
+    def test_budget(self):
+        policy = self._make_one(budget=0.1)
+        for _ in range(9):
+            policy.delay('morph')
+        assert not policy.try_hedge()
+        policy.delay('morph')
+        assert policy.try_hedge()
+        assert not policy.try_hedge()
+        policy.count('wins')
+        assert policy.stats() == {'requests': 10, 'hedges': 1, 'wins': 1}
+
+    def test_pickle(self):
+        policy = self._make_one(budget=0.2)
+        policy.record('morph', 1)
+        restored = pickle.loads(pickle.dumps(policy))
+        assert restored.budget == 0.2
+        assert restored.try_hedge() is False
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+    unittest for KeyPool
+    ~~~~~~~~~~~~~~~~~~~~
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import pickle
+
+import mock
+import pytest
+import requests
+
+
+def http_error(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    return requests.HTTPError(response=response)
+
+
+class TestKeyPool(object):
+
+    def _get_target_class(self):
+        from goolabs.keypool import KeyPool
+        return KeyPool
+
+    def _make_one(self, *args, **kwargs):
+        return self._get_target_class()(*args, **kwargs)
+
+    def test_round_robin(self):
+        pool = self._make_one(['a', 'b', 'c'])
+        actual = [pool.acquire() for _ in range(4)]
+        assert actual == ['a', 'b', 'c', 'a']
+        assert len(pool) == 3
+
+    def test_least_loaded(self):
+        pool = self._make_one(['a', 'b'], strategy='least_loaded')
+        assert pool.acquire() == 'a'
+        assert pool.acquire() == 'b'
+        pool.release('b')
+        assert pool.acquire() == 'b'
+        pool.release('a')
+        # "a" has served fewer requests.
+        assert pool.acquire() == 'a'
+
+    @mock.patch('goolabs.keypool.time.time', return_value=100.0)
+    def test_eject(self, m):
+        pool = self._make_one(['a', 'b'], eject_time=10)
+        assert pool.acquire() == 'a'
+        pool.release('a', http_error(429))
+        assert [pool.acquire() for _ in range(2)] == ['b', 'b']
+        # other errors do not eject.
+        pool.release('b', http_error(500))
+        pool.release('b', requests.ConnectionError())
+
+        m.return_value = 110.0
+        assert pool.acquire() == 'a'
+        assert pool.stats() == {
+            'ejections': 1,
+            'keys': [
+                {'requests': 2, 'in_flight': 1, 'quota_errors': 1,
+                 'ejected': False},
+                {'requests': 2, 'in_flight': 0, 'quota_errors': 0,
+                 'ejected': False},
+            ],
+        }
+
+    @mock.patch('goolabs.keypool.time.time', return_value=100.0)
+    def test_eject_retry_after(self, m):
+        pool = self._make_one(['a', 'b'], eject_time=10)
+        pool.release('a', http_error(429, {'Retry-After': '100'}))
+        pool.release('b', http_error(429))
+        # every key is ejected, use the one which comes back first.
+        assert pool.acquire() == 'b'
+        m.return_value = 150.0
+        assert pool.acquire() == 'b'
+        assert pool.stats()['keys'][0]['ejected']
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            self._make_one([])
+        with pytest.raises(ValueError):
+            self._make_one(['a'], strategy='random')
+
+    def test_pickle(self):
+        pool = pickle.loads(pickle.dumps(
+            self._make_one(['a', 'b'], strategy='least_loaded')))
+        assert pool.strategy == 'least_loaded'
+        assert pool.acquire() == 'a'
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+    unittest for packing
+    ~~~~~~~~~~~~~~~~~~~~
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import pytest
+
+
+class TestIsPackable(object):
+
+    def _call_fut(self, *args, **kwargs):
+        from goolabs.packing import is_packable
+        return is_packable(*args, **kwargs)
+
+    def test_it(self):
+        assert self._call_fut('morph', {'sentence': u'日本語'})
+        assert self._call_fut('hiragana', {'sentence': u'日本語'})
+        assert not self._call_fut('entity', {'sentence': u'日本語'})
+        assert not self._call_fut('morph', {'sentence': u'〓'})
+
+    def test_morph_filters(self):
+        assert self._call_fut('morph', {'sentence': u'a',
+                                        'info_filter': 'form|pos'})
+        assert not self._call_fut('morph', {'sentence': u'a',
+                                            'info_filter': 'pos|read'})
+        assert not self._call_fut('morph', {'sentence': u'a',
+                                            'pos_filter': u'名詞'})
+
+
+class TestIterPacks(object):
+
+    def _call_fut(self, *args, **kwargs):
+        from goolabs.packing import iter_packs
+        return list(iter_packs(*args, **kwargs))
+
+    def test_size(self):
+        payloads = [{'sentence': str(i)} for i in range(5)]
+        actual = self._call_fut('hiragana', payloads, 2)
+        assert [len(pack) for pack in actual] == [2, 2, 1]
+
+    def test_parameters(self):
+        payloads = [
+            {'sentence': u'a', 'output_type': 'hiragana', 'request_id': 1},
+            {'sentence': u'b', 'output_type': 'hiragana', 'request_id': 2},
+            {'sentence': u'c', 'output_type': 'katakana'},
+            {'sentence': u'〓', 'output_type': 'katakana'},
+            {'sentence': u'd', 'output_type': 'katakana'},
+        ]
+        actual = self._call_fut('hiragana', payloads, 10)
+        assert actual == [payloads[:2], [payloads[2]], [payloads[3]],
+                          [payloads[4]]]
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            self._call_fut('morph', [], 0)
+
+
+class TestPack(object):
+
+    def _call_fut(self, *args, **kwargs):
+        from goolabs.packing import pack
+        return pack(*args, **kwargs)
+
+    def test_it(self):
+        payloads = [
+            {'sentence': u'今日は。', 'output_type': 'hiragana',
+             'request_id': 'a'},
+            {'sentence': u'晴れ', 'output_type': 'hiragana'},
+        ]
+        assert self._call_fut(payloads) == {
+            'sentence': u'今日は。\n〓\n晴れ',
+            'output_type': 'hiragana',
+        }
+
+
+class TestUnpack(object):
+
+    def _call_fut(self, *args, **kwargs):
+        from goolabs.packing import unpack
+        return unpack(*args, **kwargs)
+
+    def test_morph(self):
+        payloads = [{'sentence': u'今日は。', 'request_id': 'a'},
+                    {'sentence': u''},
+                    {'sentence': u'雨'}]
+        ret = {
+            'word_list': [
+                [[u'今日', u'名詞'], [u'は', u'格助詞'], [u'。', u'句点']],
+                [[u'〓', u'括弧'], [u'〓', u'括弧'], [u'雨', u'名詞']],
+            ],
+            'request_id': 'labs',
+        }
+        actual = self._call_fut('morph', ret, payloads)
+        assert actual == [
+            {'word_list': [[[u'今日', u'名詞'], [u'は', u'格助詞'],
+                            [u'。', u'句点']]],
+             'request_id': 'a'},
+            {'word_list': [], 'request_id': 'labs'},
+            {'word_list': [[[u'雨', u'名詞']]], 'request_id': 'labs'},
+        ]
+
+    def test_hiragana(self):
+        payloads = [{'sentence': u'今日'}, {'sentence': u'雨'}]
+        ret = {'output_type': 'hiragana', 'converted': u'きょう \n〓\n あめ'}
+        actual = self._call_fut('hiragana', ret, payloads)
+        assert actual == [
+            {'output_type': 'hiragana', 'converted': u'きょう'},
+            {'output_type': 'hiragana', 'converted': u'あめ'},
+        ]
+
+    def test_ambiguous(self):
+        from goolabs.packing import PackingError
+        payloads = [{'sentence': u'今日'}, {'sentence': u'雨'}]
+        with pytest.raises(PackingError):
+            self._call_fut('hiragana', {'converted': u'きょう あめ'}, payloads)
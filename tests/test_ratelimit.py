@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+    unittest for RateLimiter
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import pickle
+
+import mock
+import pytest
+
+
+class TestRateLimiter(object):
+
+    def _get_target_class(self):
+        from goolabs.ratelimit import RateLimiter
+        return RateLimiter
+
+    def _make_one(self, *args, **kwargs):
+        return self._get_target_class()(*args, **kwargs)
+
+    @mock.patch('goolabs.ratelimit.time.time', return_value=100.0)
+    def test_reserve(self, m):
+        limiter = self._make_one(rate=2)
+        assert limiter.reserve('app', 'morph') == 0
+        assert limiter.reserve('app', 'morph') == 0.5
+        assert limiter.reserve('app', 'entity') == 1.0
+        # other app_id
+        assert limiter.reserve('other', 'morph') == 0
+
+        m.return_value = 102.0
+        assert limiter.reserve('app', 'morph') == 0
+        assert limiter.stats() == {
+            'acquired': 5, 'delayed': 2, 'wait_time': 1.5}
+
+    @mock.patch('goolabs.ratelimit.time.time', return_value=100.0)
+    def test_burst(self, m):
+        limiter = self._make_one(rate=1, burst=3)
+        assert [limiter.reserve('app', 'morph') for _ in range(4)] == [
+            0, 0, 0, 1.0]
+
+        with pytest.raises(ValueError):
+            self._make_one(rate=1, burst=0.5)
+
+    @mock.patch('goolabs.ratelimit.time.time', return_value=100.0)
+    def test_endpoint_rates(self, m):
+        limiter = self._make_one(rates={'morph': 1})
+        assert limiter.reserve('app', 'morph') == 0
+        assert limiter.reserve('app', 'morph') == 1.0
+        assert limiter.reserve('app', 'entity') == 0
+        assert limiter.reserve('app', 'entity') == 0
+
+        # the slower bucket wins.
+        limiter = self._make_one(rate=4, rates={'morph': 1})
+        limiter.reserve('app', 'morph')
+        assert limiter.reserve('app', 'morph') == 1.0
+        assert limiter.reserve('app', 'entity') == 0.5
+
+    def test_no_limit(self):
+        limiter = self._make_one()
+        assert limiter.reserve('app', 'morph') == 0
+        assert limiter.stats()['acquired'] == 0
+
+    @mock.patch('goolabs.ratelimit.time.sleep')
+    @mock.patch('goolabs.ratelimit.time.time', return_value=100.0)
+    def test_acquire(self, m, sleep):
+        limiter = self._make_one(rate=4)
+        assert limiter.acquire('app', 'morph') == 0
+        assert not sleep.called
+        assert limiter.acquire('app', 'morph') == 0.25
+        sleep.assert_called_once_with(0.25)
+
+    @mock.patch('goolabs.ratelimit.time.sleep')
+    @mock.patch('goolabs.deadline.time.time', return_value=100.0)
+    @mock.patch('goolabs.ratelimit.time.time', return_value=100.0)
+    def test_acquire_deadline(self, m, m2, sleep):
+        from goolabs.deadline import DeadlineExceeded
+
+        limiter = self._make_one(rate=4)
+        limiter.acquire('app', 'morph', deadline=100.1)
+        with pytest.raises(DeadlineExceeded):
+            limiter.acquire('app', 'morph', deadline=100.1)
+        assert not sleep.called
+        # the rejected call took no token.
+        assert limiter.acquire('app', 'morph', deadline=101) == 0.25
+
+    @mock.patch('goolabs.ratelimit.time.sleep')
+    @mock.patch('goolabs.deadline.time.time', return_value=100.0)
+    @mock.patch('goolabs.ratelimit.time.time', return_value=100.0)
+    def test_acquire_deadline_rejections(self, m, m2, sleep):
+        from goolabs.deadline import DeadlineExceeded
+
+        limiter = self._make_one(rate=2)
+        limiter.acquire('app', 'morph')
+        limiter.acquire('app', 'morph')
+        for _ in range(10):
+            with pytest.raises(DeadlineExceeded):
+                limiter.acquire('app', 'morph', deadline=100.3)
+        assert limiter.reserve('app', 'morph') == 1.0
+        assert limiter.stats() == {
+            'acquired': 3, 'delayed': 2, 'wait_time': 1.5}
+
+    @mock.patch('goolabs.ratelimit.time.time', return_value=100.0)
+    def test_reserve_max_wait(self, m):
+        limiter = self._make_one(rate=4, rates={'morph': 1})
+        assert limiter.reserve('app', 'morph', max_wait=0) == 0
+        assert limiter.reserve('app', 'morph', max_wait=0.5) is None
+        # neither bucket was taken.
+        assert limiter.reserve('app', 'entity') == 0.25
+
+    @mock.patch('goolabs.ratelimit.time.time', return_value=100.0)
+    def test_shared_file(self, m, tmpdir):
+        path = str(tmpdir.join('rate'))
+        first = self._make_one(rate=1, path=path)
+        second = self._make_one(rate=1, path=path, slots=8)
+        assert second.slots == 256
+
+        assert first.reserve('app', 'morph') == 0
+        assert second.reserve('app', 'morph') == 1.0
+        assert first.reserve('app', 'morph') == 2.0
+
+        restored = pickle.loads(pickle.dumps(first))
+        assert restored.reserve('app', 'morph') == 3.0
+        for limiter in (first, second, restored):
+            limiter.close()
+
+    def test_invalid_file(self, tmpdir):
+        path = tmpdir.join('rate')
+        path.write(b'x' * 64, mode='wb')
+        with pytest.raises(ValueError):
+            self._make_one(rate=1, path=str(path))
+
+    @mock.patch('goolabs.ratelimit.time.time', return_value=100.0)
+    def test_no_free_slot(self, m):
+        limiter = self._make_one(rate=1, slots=1)
+        limiter.reserve('app', 'morph')
+        with pytest.raises(RuntimeError):
+            limiter.reserve('other', 'morph')
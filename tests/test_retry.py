@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+    unittest for RetryPolicy
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import pickle
+
+import mock
+import pytest
+import requests
+
+
+def http_error(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    return requests.HTTPError(response=response)
+
+
+class TestParseRetryAfter(object):
+
+    def _call_fut(self, value, now=None):
+        from goolabs.retry import parse_retry_after
+        return parse_retry_after(value, now)
+
+    def test_seconds(self):
+        assert self._call_fut('120') == 120
+
+    def test_http_date(self):
+        # 1445412480 = Wed, 21 Oct 2015 07:28:00 GMT
+        now = 1445412480 - 30
+        assert self._call_fut('Wed, 21 Oct 2015 07:28:00 GMT', now) == 30
+        assert self._call_fut('Wed, 21 Oct 2015 07:28:00 GMT', now + 60) == 0
+
+    def test_invalid(self):
+        assert self._call_fut(None) is None
+        assert self._call_fut('soon') is None
+
+
+class TestRetryPolicy(object):
+
+    def _get_target_class(self):
+        from goolabs.retry import RetryPolicy
+        return RetryPolicy
+
+    def _make_one(self, *args, **kwargs):
+        return self._get_target_class()(*args, **kwargs)
+
+    def test_is_retryable(self):
+        policy = self._make_one()
+        assert policy.is_retryable(http_error(503))
+        assert policy.is_retryable(http_error(429))
+        assert not policy.is_retryable(http_error(400))
+        assert not policy.is_retryable(requests.HTTPError())
+        assert policy.is_retryable(requests.ConnectionError())
+        assert policy.is_retryable(requests.Timeout())
+        assert not policy.is_retryable(ValueError())
+
+        policy = self._make_one(statuses=[400], exceptions=[ValueError])
+        assert policy.is_retryable(http_error(400))
+        assert not policy.is_retryable(http_error(503))
+        assert policy.is_retryable(ValueError())
+
+    @mock.patch('goolabs.retry.random.uniform', side_effect=lambda a, b: b)
+    def test_get_delay(self, m):
+        policy = self._make_one(backoff=1, max_backoff=5)
+        assert [policy.get_delay(n) for n in range(1, 6)] == [1, 2, 4, 5, 5]
+        assert policy.get_delay(1, http_error(503, {'Retry-After': '7'})) == 7
+        assert policy.get_delay(2, http_error(503)) == 2
+
+        policy = self._make_one(backoff=1, retry_after=False)
+        assert policy.get_delay(1, http_error(503, {'Retry-After': '7'})) == 1
+
+    @mock.patch('goolabs.retry.time.sleep')
+    @mock.patch('goolabs.retry.random.uniform', side_effect=lambda a, b: b)
+    def test_call(self, m, sleep):
+        policy = self._make_one(max_attempts=3, backoff=1)
+        func = mock.Mock(side_effect=[http_error(502),
+                                      requests.ConnectionError(), 'ok'])
+        assert policy.call(func, 'a') == 'ok'
+        assert func.call_count == 3
+        func.assert_called_with('a')
+        assert sleep.call_args_list == [mock.call(1), mock.call(2)]
+        assert policy.stats() == {
+            'retries': 2, 'gave_up': 0, 'backoff_time': 3}
+
+    @mock.patch('goolabs.retry.time.sleep')
+    def test_give_up(self, sleep):
+        policy = self._make_one(max_attempts=2)
+        func = mock.Mock(side_effect=http_error(503))
+        with pytest.raises(requests.HTTPError):
+            policy.call(func)
+        assert func.call_count == 2
+        assert policy.stats()['gave_up'] == 1
+
+    @mock.patch('goolabs.retry.time.sleep')
+    @mock.patch('goolabs.retry.random.uniform', side_effect=lambda a, b: b)
+    def test_deadline(self, m, sleep):
+        import time
+        from goolabs.deadline import DeadlineExceeded
+
+        policy = self._make_one(max_attempts=5, backoff=1)
+        func = mock.Mock(side_effect=http_error(503))
+        with pytest.raises(DeadlineExceeded):
+            policy.call(func, deadline=time.time() + 0.5)
+        assert func.call_count == 1
+        assert not sleep.called
+        assert not policy.is_retryable(DeadlineExceeded())
+
+    @mock.patch('goolabs.retry.time.sleep')
+    def test_not_retryable(self, sleep):
+        policy = self._make_one()
+        func = mock.Mock(side_effect=http_error(400))
+        with pytest.raises(requests.HTTPError):
+            policy.call(func)
+        assert func.call_count == 1
+        assert not sleep.called
+        assert policy.stats() == {
+            'retries': 0, 'gave_up': 0, 'backoff_time': 0}
+
+    def test_invalid_attempts(self):
+        with pytest.raises(ValueError):
+            self._make_one(max_attempts=0)
+
+    def test_pickle(self):
+        policy = pickle.loads(pickle.dumps(self._make_one(max_attempts=5)))
+        assert policy.max_attempts == 5
+        assert policy.stats()['retries'] == 0
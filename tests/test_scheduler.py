@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+    unittest for PriorityScheduler
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import pickle
+import threading
+import time
+
+import pytest
+
+
+class TestPriorityScheduler(object):
+
+    def _get_target_class(self):
+        from goolabs.scheduler import PriorityScheduler
+        return PriorityScheduler
+
+    def _make_one(self, *args, **kwargs):
+        return self._get_target_class()(*args, **kwargs)
+
+    def _queue(self, scheduler, priorities, order):
+        def target(priority):
+            with scheduler.slot(priority):
+                order.append(priority)
+
+        threads = []
+        for number, priority in enumerate(priorities, 1):
+            thread = threading.Thread(target=target, args=(priority,))
+            thread.start()
+            threads.append(thread)
+            while sum(scheduler.stats()[name]['queued']
+                      for name in scheduler.weights) < number:
+                time.sleep(0.001)
+        return threads
+
+    def test_priority_goes_first(self):
+        scheduler = self._make_one(slots=1)
+        order = []
+        scheduler.acquire()
+        threads = self._queue(
+            scheduler, ['bulk', 'bulk', 'bulk', 'interactive', 'interactive'],
+            order)
+        stats = scheduler.stats()
+        assert stats['running'] == 1
+        assert stats['bulk']['queued'] == 3
+        assert stats['interactive']['queued'] == 2
+
+        scheduler.release()
+        for thread in threads:
+            thread.join()
+        assert order == ['interactive', 'interactive', 'bulk', 'bulk', 'bulk']
+
+        stats = scheduler.stats()
+        assert stats['running'] == 0
+        assert stats['bulk']['dispatched'] == 4
+        assert stats['interactive']['dispatched'] == 2
+        assert stats['bulk']['max_wait'] >= stats['interactive']['max_wait']
+        assert stats['bulk']['wait_time'] > 0
+
+    def test_weighted_fair(self):
+        scheduler = self._make_one(slots=1, weights={'a': 2, 'b': 1},
+                                   default='a')
+        order = []
+        scheduler.acquire('b')
+        threads = self._queue(scheduler, ['b'] * 3 + ['a'] * 4, order)
+        scheduler.release()
+        for thread in threads:
+            thread.join()
+        # "a" is served twice as often, but "b" does not starve.
+        # (the first "b" has already been served.)
+        assert order == ['a', 'a', 'a', 'b', 'a', 'b', 'b']
+
+    def test_free_slots(self):
+        scheduler = self._make_one(slots=2)
+        assert scheduler.acquire('interactive') < 1
+        assert scheduler.acquire() < 1
+        assert scheduler.stats()['running'] == 2
+        scheduler.release()
+        scheduler.release()
+
+    def test_deadline(self):
+        import time
+        from goolabs.deadline import DeadlineExceeded
+
+        scheduler = self._make_one(slots=1)
+        scheduler.acquire()
+        with pytest.raises(DeadlineExceeded):
+            scheduler.acquire('interactive', deadline=time.time() + 0.01)
+        assert scheduler.stats()['interactive']['queued'] == 0
+        scheduler.release()
+        assert scheduler.stats()['running'] == 0
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            self._make_one(slots=0)
+        with pytest.raises(ValueError):
+            self._make_one(weights={'a': 1})
+        with pytest.raises(ValueError):
+            self._make_one().acquire('unknown')
+
+    def test_pickle(self):
+        scheduler = pickle.loads(pickle.dumps(self._make_one(slots=3)))
+        assert scheduler.slots == 3
+        assert scheduler.stats()['running'] == 0
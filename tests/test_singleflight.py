@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+    unittest for single-flight
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import threading
+
+import pytest
+
+
+class TestFlightKey(object):
+
+    def _call_fut(self, func, payload):
+        from goolabs.singleflight import flight_key
+        return flight_key(func, payload)
+
+    def test_normal_case(self):
+        assert self._call_fut('morph', {'sentence': 'a', 'app_id': 'x'}) == \
+            self._call_fut('morph', {'app_id': 'y', 'sentence': 'a'})
+        assert self._call_fut('morph', {'sentence': 'a'}) != \
+            self._call_fut('morph', {'sentence': 'a', 'request_id': 'r'})
+
+
+class TestSingleFlight(object):
+
+    def _make_one(self):
+        from goolabs.singleflight import SingleFlight
+        return SingleFlight()
+
+    def _run_threads(self, flight, func, count):
+        results = []
+        errors = []
+
+        def target():
+            try:
+                results.append(flight.do('key', func))
+            except Exception as e:
+                errors.append(e)
+        threads = [threading.Thread(target=target) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        return threads, results, errors
+
+    def test_collapse(self):
+        flight = self._make_one()
+        release = threading.Event()
+        calls = []
+
+        def func():
+            calls.append(1)
+            release.wait(5)
+            return {'value': 1}
+
+        threads, results, errors = self._run_threads(flight, func, 5)
+        while flight.stats()['calls'] < 5:
+            pass
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == [{'value': 1}] * 5
+        assert len(set(id(r) for r in results)) == 5
+        assert flight.stats() == {'calls': 5, 'collapsed': 4}
+
+    def test_share_exception(self):
+        flight = self._make_one()
+        release = threading.Event()
+
+        def func():
+            release.wait(5)
+            raise ValueError('error')
+
+        threads, results, errors = self._run_threads(flight, func, 3)
+        while flight.stats()['calls'] < 3:
+            pass
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert results == []
+        assert [str(e) for e in errors] == ['error'] * 3
+
+    def test_sequential_calls(self):
+        flight = self._make_one()
+        assert flight.do('key', lambda: 1) == 1
+        assert flight.do('key', lambda: 2) == 2
+        assert flight.stats()['collapsed'] == 0
+
+    def test_deadline(self):
+        import time
+        from goolabs.deadline import DeadlineExceeded
+
+        flight = self._make_one()
+        release = threading.Event()
+        thread = threading.Thread(
+            target=flight.do, args=('key', lambda: release.wait(5)))
+        thread.start()
+        while flight.stats()['calls'] < 1:
+            pass
+        with pytest.raises(DeadlineExceeded):
+            flight.do('key', lambda: None, deadline=time.time() + 0.01)
+        release.set()
+        thread.join()
+
+    def test_take_over_after_leader_deadline(self):
+        from goolabs.deadline import DeadlineExceeded
+
+        flight = self._make_one()
+        release = threading.Event()
+        calls = []
+
+        def func():
+            calls.append(1)
+            if len(calls) == 1:
+                release.wait(5)
+                raise DeadlineExceeded('Deadline exceeded.')
+            return {'value': 2}
+
+        errors = []
+
+        def leader():
+            try:
+                flight.do('key', func)
+            except DeadlineExceeded as e:
+                errors.append(e)
+        thread = threading.Thread(target=leader)
+        thread.start()
+        while flight.stats()['calls'] < 1:
+            pass
+
+        waiter = threading.Thread(
+            target=lambda: calls.append(flight.do('key', func)))
+        waiter.start()
+        while flight.stats()['calls'] < 2:
+            pass
+        release.set()
+        thread.join()
+        waiter.join()
+
+        assert len(errors) == 1
+        # the waiter ran the call again.
+        assert calls == [1, 1, {'value': 2}]
+        assert flight.stats() == {'calls': 2, 'collapsed': 0}
+
+
+class TestAsyncSingleFlight(object):
+
+    def test_collapse(self):
+        pytest.importorskip('aiohttp')
+        import asyncio
+        from goolabs.aio import AsyncSingleFlight
+
+        flight = AsyncSingleFlight()
+        calls = []
+
+        def func():
+            calls.append(1)
+            return asyncio.sleep(0.01, result={'value': 1})
+
+        loop = asyncio.new_event_loop()
+        try:
+            tasks = [loop.create_task(flight.do('key', func))
+                     for _ in range(3)]
+            loop.run_until_complete(asyncio.wait(tasks))
+        finally:
+            loop.close()
+
+        assert [t.result() for t in tasks] == [{'value': 1}] * 3
+        assert len(calls) == 1
+        assert flight.stats() == {'calls': 3, 'collapsed': 2}
+
+    def test_leader_cancelled(self):
+        pytest.importorskip('aiohttp')
+        import asyncio
+        from goolabs.aio import AsyncSingleFlight
+
+        flight = AsyncSingleFlight()
+        calls = []
+
+        def func():
+            calls.append(1)
+            return asyncio.sleep(0.01, result={'value': len(calls)})
+
+        loop = asyncio.new_event_loop()
+        try:
+            leader = loop.create_task(flight.do('key', func))
+            loop.run_until_complete(asyncio.sleep(0))
+            waiters = [loop.create_task(flight.do('key', func))
+                       for _ in range(2)]
+            loop.run_until_complete(asyncio.sleep(0))
+            leader.cancel()
+            loop.run_until_complete(asyncio.wait([leader] + waiters))
+        finally:
+            loop.close()
+
+        assert leader.cancelled()
+        results = [t.result() for t in waiters]
+        # one of the waiters took over the call.
+        assert results == [{'value': 2}] * 2
+        assert len(calls) == 2
+        assert flight.stats() == {'calls': 3, 'collapsed': 1}
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+    unittest for the start up time of the command line tools
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :author: tell-k <ffk2005@gmail.com>
+    :copyright: tell-k. All Rights Reserved.
+"""
+from __future__ import division, print_function, absolute_import  # NOQA
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Cumulative import time of goolabs.commands in microseconds.
+IMPORT_BUDGET = 100000
+
+# Modules which must not be imported until a request is sent.
+HEAVY_MODULES = ('requests', 'urllib3', 'goolabs.client', 'goolabs.cache')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+pytestmark = pytest.mark.skipif(sys.version_info < (3, 7),
+                                reason='-X importtime requires Python 3.7+')
+
+
+def import_times(code):
+    """ Run ``code`` in a new interpreter and return the cumulative import
+    time of each module.
+    """
+    proc = subprocess.Popen(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    _, err = proc.communicate()
+    assert proc.returncode == 0, err
+    times = {}
+    for line in err.decode('utf-8').splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestStartup(object):
+
+    def test_import_budget(self):
+        times = import_times('import goolabs.commands')
+        assert times['goolabs.commands'] <= IMPORT_BUDGET
+
+    @pytest.mark.parametrize('option', ['--help', '--version'])
+    def test_no_heavy_imports(self, option):
+        times = import_times(
+            'import sys\n'
+            'from goolabs.commands import main\n'
+            'try:\n'
+            '    main([{0!r}])\n'
+            'except SystemExit as e:\n'
+            '    sys.exit(e.code)\n'.format(option))
+        assert [m for m in HEAVY_MODULES if m in times] == []
+
+    def test_lazy_client(self):
+        times = import_times(
+            'import goolabs\n'
+            'assert goolabs.GoolabsAPI.__module__ == "goolabs.client"\n')
+        assert 'goolabs.client' in times